@@ -10,6 +10,39 @@ class Settings(BaseSettings):
     
     # NBA Stats API Configuration
     nba_stats_base_url: str = "https://stats.nba.com/stats"
+    nba_api_max_workers: int = 8  # Max concurrent nba_api calls (thread pool size)
+    nba_api_timeout: float = 15.0  # Seconds before an awaiting request gives up on an nba_api call
+    nba_api_requests_per_second: float = 1.5  # Global token bucket refill rate
+    nba_api_burst: int = 4  # Requests allowed back-to-back before throttling kicks in
+    nba_api_max_in_flight: int = 4  # Max concurrent upstream requests
+    stats_cache_max_entries: int = 5000  # Shared in-memory stats cache size (LRU eviction)
+    stats_store_enabled: bool = True  # Persist NBA data to SQLite so restarts start warm
+    stats_store_path: str = "data/stats.db"  # SQLite file for the persistent stats store
+    stats_store_max_age: float = 0  # Seconds stored current-season data is served before refetching (0 = the memory cache TTL of each data type)
+    game_log_incremental_sync: bool = True  # Refresh stored game logs with only the games since the last stored date
+    training_data_dir: str = "data/training"  # Saved ML training datasets (one NPZ file per season)
+    ml_engine: str = "gbr"  # ML training engine: gbr, hist (HistGradientBoosting) or multi_output (one random forest for every stat)
+    ml_training_jobs: int = 0  # Stat models fitted in parallel during ML training (0 = one per CPU)
+    ml_model_dir: str = "models"  # Versioned ML model bundles (current.json names the live one)
+    ml_model_preload: bool = True  # Load the live ML model bundle in the background at startup
+    slate_max_concurrency: int = 8  # Rosters/players fetched in parallel when building the daily slate
+    slate_timeout: float = 90.0  # Seconds before the slate builder returns partial results
+    slate_cache_ttl: int = 600  # Seconds before a cached slate is served stale and rebuilt in the background
+    slate_refresh_interval: int = 1800  # Seconds between scheduled slate rebuilds (plus pre-tip-off runs)
+    slate_baseline_simulations: int = 2000  # Simulations per player for the precomputed prop distributions
+    slate_scheduler_enabled: bool = True  # Precompute today's and tomorrow's slates in the background
+    projection_max_concurrency: int = 4  # Games projected in parallel by simulate-todays-games
+    bet_simulations: int = 2000  # Simulated games behind each bet's hit probability (place-bet / place-parlay)
+    stream_buffer_size: int = 16  # Events buffered for a streaming client before the producer waits
+    stream_heartbeat_interval: float = 15.0  # Seconds of silence before a streaming response sends a keep-alive
+    job_max_workers: int = 2  # Background jobs (simulations, training) running at once
+    job_max_pending: int = 50  # Jobs allowed to wait for a worker before submits are rejected
+    job_result_ttl: float = 3600  # Seconds a finished job and its result are kept
+    simulation_backend: str = "auto"  # Batch simulations: inline, process, or auto (process for large batches)
+    simulation_workers: int = 0  # Simulation worker processes (0 = one per CPU, at most 4)
+    simulation_process_min_draws: int = 500000  # Player-simulations in one call before auto uses the process pool
+    simulation_shard_players: int = 8  # Players per simulation shard
+    simulation_shard_size: int = 25000  # Simulations per shard
     
     # Database Configuration (if needed later)
     database_url: Optional[str] = None
@@ -1,8 +1,16 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from app.routes import players, props, analysis, betting, beginner, simulation, ml_simulation, schedule, daily_props
+from app.routes import players, props, analysis, betting, beginner, simulation, ml_simulation, schedule, daily_props, jobs
 from app.config import settings
 from app.services.cache_warmer import cache_warmer
+from app.services.nba_api_executor import nba_api_executor
+from app.services.rate_limiter import nba_rate_limiter
+from app.services.stats_store import stats_store
+from app.services.player_directory import player_directory
+from app.services.single_flight import single_flight
+from app.services.job_queue import job_queue
+from app.services.simulation_pool import simulation_pool
+from app.services.ml_simulator import ml_game_simulator
 import asyncio
 
 app = FastAPI(
@@ -15,14 +23,40 @@ app = FastAPI(
 # Startup event to warm cache
 @app.on_event("startup")
 async def startup_event():
-    """Warm up cache on server startup for fast initial response"""
+    """Build the player index and start the background slate scheduler"""
     print("🚀 Server starting up...")
-    print("⚡ Cache warming DISABLED - all data loads fresh on-demand for real-time updates")
     
-    # DISABLED: Cache warmer for real-time data
-    # Data will load fresh on each request for most up-to-date information
-    # asyncio.create_task(cache_warmer.warmup_cache())
-    # asyncio.create_task(cache_warmer.refresh_cache_periodically(7200))
+    # Player name index (static data, no network)
+    player_directory.build()
+    print(f"📇 Player directory ready ({player_directory.get_stats()['players']} players)")
+    
+    # Today's and tomorrow's slates are precomputed in the background;
+    # requests never wait for a build (stale-while-revalidate)
+    if settings.slate_scheduler_enabled:
+        cache_warmer.start()
+        print("🗓️  Slate scheduler started")
+    else:
+        print("⚡ Slate scheduler DISABLED - slates build on first request")
+    
+    # Background job workers (heavy simulations, training)
+    job_queue.start()
+    
+    # Simulation worker processes, spawned up front only for the "process" backend
+    simulation_pool.start()
+    
+    # Saved ML models, loaded before the first ML request needs them
+    if settings.ml_model_preload:
+        ml_game_simulator.start_preload()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background workers"""
+    await cache_warmer.stop()
+    await job_queue.stop()
+    simulation_pool.shutdown()
+    nba_api_executor.shutdown()
+    await stats_store.close()
 
 # CORS middleware
 app.add_middleware(
@@ -43,6 +77,7 @@ app.include_router(simulation.router)
 app.include_router(ml_simulation.router)
 app.include_router(schedule.router)
 app.include_router(daily_props.router)
+app.include_router(jobs.router)
 
 @app.get("/")
 async def root():
@@ -76,6 +111,13 @@ async def root():
             "POST /api/simulation/multi-leg-ticket",
             "GET /api/simulation/quick-odds/{player_name}"
         ],
+        "job_endpoints": [
+            "POST /api/jobs - Submit a simulate_games or train_models job",
+            "GET /api/jobs/{job_id} - Job status and progress",
+            "GET /api/jobs/{job_id}/events - Stream job progress (SSE / NDJSON)",
+            "GET /api/jobs/{job_id}/result - Result of a finished job",
+            "DELETE /api/jobs/{job_id} - Cancel a job"
+        ],
         "beginner_endpoints": [
             "GET /api/beginner/players/{player_name}/beginner-analysis",
             "POST /api/beginner/analyze-prop/beginner",
@@ -87,6 +129,16 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/health/upstream")
+async def upstream_health():
+    """nba_api thread pool, rate limiter, request coalescing and simulation pool metrics"""
+    return {
+        "executor": nba_api_executor.get_stats(),
+        "rate_limiter": nba_rate_limiter.get_stats(),
+        "single_flight": single_flight.get_stats(),
+        "simulation_pool": simulation_pool.get_stats()
+    }
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -155,6 +155,7 @@ class Bet(BaseModel):
     actual_result: Optional[float] = None
     game_id: Optional[str] = None
     game_date: Optional[datetime] = None
+    settlement_seed: Optional[int] = None  # Set when the result was simulated
 
 class BetSlip(BaseModel):
     user_id: str
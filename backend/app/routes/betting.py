@@ -6,6 +6,7 @@ from app.models import (
     Leaderboard, BettingStats, Portfolio, BetStatus
 )
 from app.services.paper_betting import paper_betting_service
+from app.services.random_streams import MAX_SEED
 from pydantic import BaseModel
 
 router = APIRouter()
@@ -125,13 +126,15 @@ async def settle_bet(bet_id: str, settle_request: SettleBetRequest):
         raise HTTPException(status_code=500, detail=f"Error settling bet: {str(e)}")
 
 @router.post("/bets/{bet_id}/simulate", response_model=Bet)
-async def simulate_bet_settlement(bet_id: str, win_probability: float = 0.5):
-    """Simulate bet settlement for testing (randomly determine outcome)"""
+async def simulate_bet_settlement(bet_id: str, win_probability: float = 0.5, seed: Optional[int] = None):
+    """Simulate bet settlement for testing (randomly determine outcome; the seed used is returned as settlement_seed)"""
     try:
         if win_probability < 0 or win_probability > 1:
             raise ValueError("Win probability must be between 0 and 1")
+        if seed is not None and not 0 <= seed <= MAX_SEED:
+            raise ValueError(f"Seed must be between 0 and {MAX_SEED}")
         
-        bet = await paper_betting_service.simulate_bet_settlement(bet_id, win_probability)
+        bet = await paper_betting_service.simulate_bet_settlement(bet_id, win_probability, seed)
         return bet
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -5,18 +5,47 @@ Daily Props API - Get popular players with PrizePicks lines and bet with simulat
 from fastapi import APIRouter, HTTPException, Query
 from typing import List, Optional
 from pydantic import BaseModel, validator
-from app.services.popular_players import popular_players_service
 from app.services.paper_betting import PaperBettingService
 from app.services.game_simulator import game_simulator
-from app.services.nba_stats import NBAStatsService
+from app.services.nba_stats import nba_stats_service
 from app.services.cache_warmer import cache_warmer
-from datetime import datetime
+from app.services.stats_cache import stats_cache
+from app.services.stats_store import stats_store
+from app.services.schedule import schedule_service
+from app.services.event_stream import EventStream, StreamFormat, stream_response
+from app.services.simulation_batch import wilson_interval
+from app.services.random_streams import MAX_SEED, make_rng, resolve_seed
+from app.config import settings
+import numpy as np
 
 router = APIRouter(prefix="/api/daily-props", tags=["daily-props"])
 
 # Initialize services
 paper_betting_service = PaperBettingService()
-nba_stats_service = NBAStatsService()
+
+# SimulationBatch column behind each bet prop type
+BET_PROP_STATS = {
+    "points": "points",
+    "rebounds": "rebounds",
+    "assists": "assists",
+    "steals": "steals",
+    "turnovers": "turnovers",
+    "threes": "three_pointers_made",
+    "threes_made": "three_pointers_made",
+    "pra": "pra",
+    "pr": "pr",
+    "pa": "pa",
+}
+
+# Distribution percentiles reported for a simulated bet
+BET_PERCENTILES = (10, 25, 50, 75, 90)
+
+# Probability floor/ceiling used for odds (a 0% or 100% leg has no price)
+MIN_LEG_PROBABILITY = 0.01
+
+# Random streams of a bet's seed: one per distinct player, one for the power play draw
+PLAYER_STREAM = 0
+POWER_PLAY_STREAM = 1
 
 
 # ============================================================================
@@ -189,6 +218,7 @@ class PropBet(BaseModel):
     wager: float
     bet_mode: Optional[str] = "standard"  # standard, power_play
     power_play_multiplier: Optional[float] = 1.0  # 2x, 3x, 5x, 10x
+    seed: Optional[int] = None  # Replay a previous bet (the seed it returned)
     
     @validator('line')
     def validate_line(cls, v):
@@ -197,6 +227,13 @@ class PropBet(BaseModel):
         if decimal_part not in [0.0, 0.5]:
             raise ValueError(f'Line must be a whole number or .5 increment (e.g., 25.0, 25.5, 26.0), got {v}')
         return v
+    
+    @validator('seed')
+    def validate_seed(cls, v):
+        """Seeds are returned by earlier bets (0 to 2^53 - 1)"""
+        if v is not None and not 0 <= v <= MAX_SEED:
+            raise ValueError(f'Seed must be between 0 and {MAX_SEED}, got {v}')
+        return v
 
 
 class MultiPropBet(BaseModel):
@@ -206,6 +243,14 @@ class MultiPropBet(BaseModel):
     total_wager: float  # Single wager for the entire parlay
     bet_mode: Optional[str] = "standard"  # standard, flex, power_play
     power_play_multiplier: Optional[float] = 1.0  # For power play parlays
+    seed: Optional[int] = None  # Replay a previous parlay (the seed it returned)
+    
+    @validator('seed')
+    def validate_seed(cls, v):
+        """Seeds are returned by earlier bets (0 to 2^53 - 1)"""
+        if v is not None and not 0 <= v <= MAX_SEED:
+            raise ValueError(f'Seed must be between 0 and {MAX_SEED}, got {v}')
+        return v
 
 
 class SimulationResult(BaseModel):
@@ -220,7 +265,9 @@ class SimulationResult(BaseModel):
 
 
 @router.get("/today")
-async def get_todays_props():
+async def get_todays_props(
+    stream: Optional[StreamFormat] = Query(None, description="sse or ndjson - send players and per-game progress as they are ready")
+):
     """
     Get popular players with PrizePicks-style prop lines for TODAY'S games
     
@@ -229,29 +276,44 @@ async def get_todays_props():
     - Are ACTIVE (not injured/out)
     - Have played within the last 7 days
     
-    Uses cache warmer for fast response (5-minute TTL)
+    Served from the background slate scheduler (stale-while-revalidate).
+    status is "ready", "stale" (a refresh is running), "building" (the
+    first build did not finish within settings.slate_timeout - players is
+    empty, retry shortly) or "error" (the first build failed - see error).
+    
+    With stream=sse or ndjson, players are sent as events as soon as they
+    are ready - built live, with per-game progress, during the first build.
     
     Returns:
         - List of popular players (LeBron, Curry, Giannis, etc.)
         - Season averages for each stat
         - Suggested betting lines for points, rebounds, assists, combos
         - Opponent and game info
+        - Baseline simulated distribution (over probability, percentiles) per line
     """
+    if stream:
+        return stream_response(lambda events: _stream_slate(events, "today"), stream)
+    
     try:
-        # Use cache warmer for fast response
-        players = await cache_warmer.get_today_players()
+        # Precomputed slate - only waits (up to settings.slate_timeout) for a cold one
+        slate = await cache_warmer.wait_for_slate("today")
         
         return {
-            "date": datetime.now().strftime("%Y-%m-%d"),
-            "count": len(players),
-            "players": players
+            "date": slate["date"],
+            "status": slate["status"],
+            "error": slate["error"],
+            "age_seconds": slate["age_seconds"],
+            "count": len(slate["players"]),
+            "players": slate["players"]
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching today's props: {str(e)}")
 
 
 @router.get("/tomorrow")
-async def get_tomorrows_props():
+async def get_tomorrows_props(
+    stream: Optional[StreamFormat] = Query(None, description="sse or ndjson - send players and per-game progress as they are ready")
+):
     """
     Get popular players with PrizePicks-style prop lines for TOMORROW'S games
     
@@ -260,7 +322,8 @@ async def get_tomorrows_props():
     - Are ACTIVE (not injured/out)
     - Have played within the last 7 days
     
-    Uses cache warmer for fast response (5-minute TTL)
+    Served from the background slate scheduler, see /today for status values
+    and the stream option
     
     Returns:
         - List of popular players
@@ -268,190 +331,236 @@ async def get_tomorrows_props():
         - Suggested betting lines
         - Opponent and game info
     """
+    if stream:
+        return stream_response(lambda events: _stream_slate(events, "tomorrow"), stream)
+    
     try:
-        # Use cache warmer for fast response
-        players = await cache_warmer.get_tomorrow_players()
+        # Precomputed slate - only waits (up to settings.slate_timeout) for a cold one
+        slate = await cache_warmer.wait_for_slate("tomorrow")
         
         return {
-            "date": (datetime.now()).strftime("%Y-%m-%d"),
-            "count": len(players),
-            "players": players
+            "date": slate["date"],
+            "status": slate["status"],
+            "error": slate["error"],
+            "age_seconds": slate["age_seconds"],
+            "count": len(slate["players"]),
+            "players": slate["players"]
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching tomorrow's props: {str(e)}")
 
 
+async def _stream_slate(events: EventStream, day: str):
+    """
+    Stream a day's slate: "player" events, then a "done" event
+    
+    A cached slate is sent straight away. While the first build is still
+    running, the stream follows that build (shared by every client)
+    instead: after each game's "player" events come a "game" event
+    (status, skipped players) and a "progress" event with completed /
+    total games.
+    """
+    slate = cache_warmer.get_slate(day)
+    summary = {"date": slate["date"], "status": slate["status"], "age_seconds": slate["age_seconds"]}
+    progress = cache_warmer.build_progress(day) if slate["status"] == "building" else None
+    
+    if progress is None:
+        for player in slate["players"]:
+            await events.emit("player", player)
+        await events.emit("done", {**summary, "count": len(slate["players"])})
+        return
+    
+    games = await (schedule_service.get_todays_games() if day == "today" else schedule_service.get_tomorrows_games())
+    count = 0
+    completed_games = 0
+    async for game_result in progress.follow():
+        for player in game_result["players"]:
+            await events.emit("player", player)
+            count += 1
+        
+        completed_games += 1
+        await events.emit("game", {key: value for key, value in game_result.items() if key != "players"})
+        await events.emit("progress", {"completed_games": completed_games, "total_games": len(games)})
+    
+    await events.emit("done", {**summary, "status": "live", "count": count})
+
+
 @router.post("/simulate-bet")
 async def simulate_single_bet(bet: PropBet):
     """
     Simulate a single prop bet using the game simulator (public endpoint)
     
     Returns:
-    - Simulation results (30 runs)
-    - Win/loss determination
-    - Probability of hitting
+    - Win/loss determination (settled on one simulated game)
+    - Probability of hitting over settings.bet_simulations games, with a
+      95% confidence interval and distribution percentiles
     - Projected stats
+    - The seed (send it back to replay the same simulation)
     """
-    return await _simulate_bet_leg(bet)
+    seed = resolve_seed(bet.seed)
+    return {**await _simulate_bet_leg(bet, seed), "seed": seed}
 
 
-async def _simulate_bet_leg(bet):
+async def _simulate_bet_leg(bet, seed: int):
+    """Internal function to simulate one bet leg (works with both PropBet and PropBetLeg)"""
+    return (await _simulate_bet_legs([bet], seed))[0]
+
+
+async def _simulate_bet_legs(bets, seed: int) -> List[dict]:
     """
-    Internal function to simulate a bet leg (works with both PropBet and PropBetLeg)
-    
-    Returns:
-    - Simulation results (30 runs)
-    - Win/loss determination
-    - Probability of hitting
+    Internal function to simulate bet legs (PropBet or PropBetLeg), in order
+    
+    Player data for all legs is fetched concurrently and only once per
+    distinct player, and each player is simulated once: legs on the same
+    player read their props from the same batch, so they are settled on the
+    same simulated game. Player i (in order of first appearance) draws from
+    stream (PLAYER_STREAM, i) of seed, so the same seed and legs replay the
+    same outcome.
+    
+    Returns per leg:
+    - Win/loss determination (settled on one simulated game)
+    - Probability of hitting over settings.bet_simulations games, with a
+      95% confidence interval and distribution percentiles
     - Projected stats
     """
     try:
-        # Validate inputs
-        if not bet.player_name:
-            raise HTTPException(status_code=400, detail="Player name is required")
-        if not bet.prop_type:
-            raise HTTPException(status_code=400, detail="Prop type is required")
-        if bet.line is None:
-            raise HTTPException(status_code=400, detail="Line is required")
-        if not bet.pick:
-            raise HTTPException(status_code=400, detail="Pick (OVER/UNDER) is required")
-        
-        # Find player
-        player_info = await nba_stats_service.get_player_info(bet.player_name)
-        if not player_info:
-            raise HTTPException(status_code=404, detail=f"Player not found: {bet.player_name}")
-        
-        # Get player stats
-        season_avg = await nba_stats_service.get_player_season_averages(player_info.player_id)
-        if not season_avg:
-            raise HTTPException(status_code=404, detail=f"Stats not found for {bet.player_name}")
-        
-        recent_games = await nba_stats_service.get_player_game_log(player_info.player_id, last_n_games=5)
-        
-        # Run simulation
-        simulation_result = game_simulator.simulate_player_game(
-            player_info=player_info,
-            season_averages=season_avg,
-            recent_games=recent_games,
-            opponent="Unknown",  # Could enhance this
-            is_home=True
-        )
-        
-        # Get the stat value based on prop type
-        prop_map = {
-            "points": "points",
-            "rebounds": "rebounds",
-            "assists": "assists",
-            "steals": "steals",
-            "turnovers": "turnovers",
-            "threes": "three_pointers_made",
-            "threes_made": "three_pointers_made",
-            "pra": None,  # Need to calculate (Points + Rebounds + Assists)
-            "pr": None,   # Need to calculate (Points + Rebounds)
-            "pa": None    # Need to calculate (Points + Assists)
-        }
+        # Validate inputs before fetching anything
+        for bet in bets:
+            if not bet.player_name:
+                raise HTTPException(status_code=400, detail="Player name is required")
+            if not bet.prop_type:
+                raise HTTPException(status_code=400, detail="Prop type is required")
+            if bet.line is None:
+                raise HTTPException(status_code=400, detail="Line is required")
+            if not bet.pick:
+                raise HTTPException(status_code=400, detail="Pick (OVER/UNDER) is required")
+            if bet.prop_type not in BET_PROP_STATS:
+                raise HTTPException(
+                    status_code=400, 
+                    detail=f"Invalid prop type: {bet.prop_type}. Supported: points, rebounds, assists, steals, turnovers, threes_made, pra, pr, pa"
+                )
         
-        # Calculate simulated value
-        try:
-            if bet.prop_type in ["pra", "pr", "pa"]:
-                # Combo stats - sum multiple stats
-                simulated_value = 0
-                if "p" in bet.prop_type:
-                    simulated_value += getattr(simulation_result, "points", 0)
-                if "r" in bet.prop_type:
-                    simulated_value += getattr(simulation_result, "rebounds", 0)
-                if "a" in bet.prop_type:
-                    simulated_value += getattr(simulation_result, "assists", 0)
-            else:
-                # Single stat
-                stat_key = prop_map.get(bet.prop_type)
-                if not stat_key:
-                    raise HTTPException(
-                        status_code=400, 
-                        detail=f"Invalid prop type: {bet.prop_type}. Supported: points, rebounds, assists, steals, turnovers, threes_made, pra, pr, pa"
-                    )
-                simulated_value = getattr(simulation_result, stat_key, 0)
-        except Exception as e:
-            raise HTTPException(
-                status_code=500,
-                detail=f"Error calculating simulated value for {bet.player_name} {bet.prop_type}: {str(e)}"
-            )
+        # Find players and get their stats (all legs at once)
+        players = await nba_stats_service.get_players_data(
+            [bet.player_name for bet in bets], last_n_games=5
+        )
         
-        # Determine if bet won
-        if bet.pick.upper() == "OVER":
-            won = simulated_value > bet.line
-        else:
-            won = simulated_value < bet.line
-        
-        # Calculate probability (simplified - would need multiple sims for accuracy)
-        # For now, use the margin
-        margin = abs(simulated_value - bet.line)
-        if margin >= 3:
-            probability = 0.75 if won else 0.25
-        elif margin >= 1.5:
-            probability = 0.65 if won else 0.35
-        else:
-            probability = 0.55 if won else 0.45
-        
-        # Calculate season average for this prop type
-        if bet.prop_type in ["pra", "pr", "pa"]:
-            # Combo stats - calculate from individual averages
-            season_avg_value = 0
-            if "p" in bet.prop_type:
-                season_avg_value += getattr(season_avg, "points_per_game", 0)
-            if "r" in bet.prop_type:
-                season_avg_value += getattr(season_avg, "rebounds_per_game", 0)
-            if "a" in bet.prop_type:
-                season_avg_value += getattr(season_avg, "assists_per_game", 0)
-        else:
-            # Single stat - get from season averages
-            stat_key = prop_map.get(bet.prop_type)
-            if stat_key:
-                # Map simulation stat name to season average property name
-                season_avg_map = {
-                    "points": "points_per_game",
-                    "rebounds": "rebounds_per_game",
-                    "assists": "assists_per_game",
-                    "steals": "steals_per_game",
-                    "turnovers": "turnovers_per_game",
-                    "three_pointers_made": "three_point_percentage"
-                }
-                season_stat_key = season_avg_map.get(stat_key, stat_key)
-                season_avg_value = getattr(season_avg, season_stat_key, 0)
-            else:
-                season_avg_value = 0
+        batches = {}
+        results = []
+        for bet in bets:
+            player = players[bet.player_name]
+            if not player:
+                raise HTTPException(status_code=404, detail=f"Player not found: {bet.player_name}")
+            
+            season_avg = player["season_averages"]
+            if not season_avg:
+                raise HTTPException(status_code=404, detail=f"Stats not found for {bet.player_name}")
+            
+            # Run the Monte Carlo simulation (vectorized - one batch of games per player)
+            player_id = player["player_info"].player_id
+            if player_id not in batches:
+                batches[player_id] = game_simulator.simulate_batch(
+                    season_avg,
+                    player["recent_games"],
+                    num_simulations=settings.bet_simulations,
+                    is_home=True,
+                    rng=make_rng(seed, PLAYER_STREAM, len(batches))
+                )
+            
+            results.append(_evaluate_bet_leg(bet, season_avg, batches[player_id]))
         
-        def round_half(v: float) -> float:
-            try:
-                return round(v * 2) / 2
-            except Exception:
-                return v
-
-        return {
-            "player_name": bet.player_name,
-            "prop_type": bet.prop_type,
-            "line": bet.line,
-            "pick": bet.pick,
-            "simulated_value": round_half(simulated_value),
-            "won": won,
-            "probability": probability,
-            "season_average": round_half(season_avg_value),
-            "simulation_details": {
-                "points": round_half(getattr(simulation_result, 'points', 0)),
-                "rebounds": round_half(getattr(simulation_result, 'rebounds', 0)),
-                "assists": round_half(getattr(simulation_result, 'assists', 0)),
-                "three_pointers_made": round_half(getattr(simulation_result, 'three_pointers_made', 0)),
-                "steals": round_half(getattr(simulation_result, 'steals', 0)),
-                "blocks": round_half(getattr(simulation_result, 'blocks', 0)),
-            }
-        }
+        return results
         
     except HTTPException:
         raise
     except Exception as e:
         import traceback
         traceback.print_exc()
-        raise HTTPException(status_code=500, detail=f"Error simulating bet for {bet.player_name}: {str(e)}")
+        names = ", ".join(dict.fromkeys(bet.player_name for bet in bets))
+        raise HTTPException(status_code=500, detail=f"Error simulating bet for {names}: {str(e)}")
+
+
+def _evaluate_bet_leg(bet, season_avg, batch) -> dict:
+    """Settle one leg and summarize its prop distribution from a player's SimulationBatch"""
+    stat_key = BET_PROP_STATS[bet.prop_type]
+    values = batch[stat_key]
+    
+    # Hit probability over all simulated games
+    if bet.pick.upper() == "OVER":
+        hits = values > bet.line
+    else:
+        hits = values < bet.line
+    num_hits = int(hits.sum())
+    hit_probability = num_hits / len(values)
+    ci_low, ci_high = wilson_interval(num_hits, len(values))
+
+    # Keep payouts finite when a line is (almost) never / always hit
+    probability = min(max(hit_probability, MIN_LEG_PROBABILITY), 1 - MIN_LEG_PROBABILITY)
+
+    # The bet is settled on one simulated game (the first draw)
+    simulated_value = float(values[0])
+    won = bool(hits[0])
+
+    percentiles = np.percentile(values, BET_PERCENTILES)
+
+    # Calculate season average for this prop type
+    if bet.prop_type in ["pra", "pr", "pa"]:
+        # Combo stats - calculate from individual averages
+        season_avg_value = 0
+        if "p" in bet.prop_type:
+            season_avg_value += getattr(season_avg, "points_per_game", 0)
+        if "r" in bet.prop_type:
+            season_avg_value += getattr(season_avg, "rebounds_per_game", 0)
+        if "a" in bet.prop_type:
+            season_avg_value += getattr(season_avg, "assists_per_game", 0)
+    else:
+        # Map simulation stat name to season average property name
+        season_avg_map = {
+            "points": "points_per_game",
+            "rebounds": "rebounds_per_game",
+            "assists": "assists_per_game",
+            "steals": "steals_per_game",
+            "turnovers": "turnovers_per_game",
+            "three_pointers_made": "three_point_percentage"
+        }
+        season_avg_value = getattr(season_avg, season_avg_map.get(stat_key, stat_key), 0)
+
+    def round_half(v: float) -> float:
+        try:
+            return round(v * 2) / 2
+        except Exception:
+            return v
+
+    return {
+        "player_name": bet.player_name,
+        "prop_type": bet.prop_type,
+        "line": bet.line,
+        "pick": bet.pick,
+        "simulated_value": round_half(simulated_value),
+        "won": won,
+        "probability": round(probability, 4),
+        "hit_probability": round(hit_probability, 4),
+        "confidence_interval": {
+            "level": 0.95,
+            "low": round(ci_low, 4),
+            "high": round(ci_high, 4)
+        },
+        "expected_value": round(float(values.mean()), 2),
+        "percentiles": {
+            f"p{p}": float(value) for p, value in zip(BET_PERCENTILES, percentiles)
+        },
+        "simulations_run": len(values),
+        "season_average": round_half(season_avg_value),
+        "simulation_details": {
+            "points": round_half(float(batch.points[0])),
+            "rebounds": round_half(float(batch.rebounds[0])),
+            "assists": round_half(float(batch.assists[0])),
+            "three_pointers_made": round_half(float(batch.three_pointers_made[0])),
+            "steals": round_half(float(batch.steals[0])),
+            "blocks": round_half(float(batch.blocks[0])),
+        }
+    }
+
 
 
 @router.post("/place-bet")
@@ -474,7 +583,8 @@ async def place_bet_with_simulation(bet: PropBet):
     try:
         # First, simulate the bet
         # Simulate the bet
-        simulation = await _simulate_bet_leg(bet)
+        seed = resolve_seed(bet.seed)
+        simulation = await _simulate_bet_leg(bet, seed)
         
         # Adjust probability for power play
         win_probability = simulation["probability"]
@@ -484,8 +594,7 @@ async def place_bet_with_simulation(bet: PropBet):
                 bet.power_play_multiplier
             )
             # Re-determine win/loss with adjusted probability
-            import random
-            simulation["won"] = random.random() < adjusted_prob
+            simulation["won"] = bool(make_rng(seed, POWER_PLAY_STREAM).random() < adjusted_prob)
             simulation["adjusted_probability"] = adjusted_prob
             simulation["original_probability"] = win_probability
         
@@ -530,6 +639,7 @@ async def place_bet_with_simulation(bet: PropBet):
         
         return {
             "bet_placed": True,
+            "seed": seed,
             "result": simulation,
             "odds_info": {
                 "win_probability": round(win_probability * 100, 1),
@@ -590,13 +700,13 @@ async def place_parlay_with_simulation(parlay: MultiPropBet):
                 detail="Parlays cannot have more than 6 legs. You submitted {} legs.".format(num_legs)
             )
         
-        # Simulate each bet
+        # Simulate all legs (player data fetched concurrently)
         simulation_results = []
         probabilities = []
         wins = []
         
-        for bet in parlay.bets:
-            result = await _simulate_bet_leg(bet)
+        seed = resolve_seed(parlay.seed)
+        for result in await _simulate_bet_legs(parlay.bets, seed):
             simulation_results.append(result)
             probabilities.append(result["probability"])
             wins.append(result["won"])
@@ -693,6 +803,7 @@ async def place_parlay_with_simulation(parlay: MultiPropBet):
         # Build comprehensive response
         response = {
             "parlay_placed": True,
+            "seed": seed,
             "bet_mode": parlay.bet_mode,
             "bet_result": bet_result,
             "num_legs": num_legs,
@@ -805,8 +916,15 @@ async def get_cache_stats():
     - Cache TTL
     - Cached keys and their ages
     - Number of players in each cache
+    - Slate build durations, game statuses and next scheduled runs
+    - Shared NBA stats cache size and hit/miss counters
+    - Persistent stats store row counts and hit/miss counters
     """
-    return cache_warmer.get_cache_stats()
+    return {
+        **cache_warmer.get_cache_stats(),
+        "stats_cache": stats_cache.get_stats(),
+        "stats_store": await stats_store.get_stats()
+    }
 
 
 @router.post("/cache/refresh")
@@ -832,11 +950,13 @@ async def refresh_cache():
 @router.post("/cache/clear")
 async def clear_cache():
     """
-    Clear all cached data
+    Clear all in-memory cached data
     
-    Next request will trigger fresh fetch from NBA API
+    Next request reloads from the persistent stats store, or the NBA API
+    for data the store does not have (or that is stale)
     """
     cache_warmer.clear_cache()
+    stats_cache.invalidate()
     return {
         "message": "Cache cleared successfully",
         "stats": cache_warmer.get_cache_stats()
@@ -0,0 +1,189 @@
+"""
+Job Routes - Submit heavy simulations / training as background jobs and poll or stream them
+"""
+from fastapi import APIRouter, HTTPException, Query
+from typing import Any, Dict, List, Literal, Optional
+from pydantic import BaseModel, Field, ValidationError
+from datetime import datetime
+
+from app.routes.ml_simulation import TrainModelRequest, TrainModelResponse
+from app.services.event_stream import EventStream, StreamFormat, stream_response
+from app.services.game_projection import game_projection_service
+from app.services.job_queue import Job, JobQueueFull, job_queue
+from app.services.ml_simulator import ml_game_simulator
+from app.services.random_streams import MAX_SEED, derive_seed, resolve_seed
+from app.services.schedule import schedule_service
+from app.services.simulation_pool import SimulationBackend
+
+router = APIRouter(prefix="/api/jobs", tags=["Jobs"])
+
+
+class SimulateGamesParams(BaseModel):
+    days: List[Literal["today", "tomorrow"]] = Field(["today"], min_length=1)
+    num_simulations: int = Field(10, ge=1, le=10000)
+    backend: Optional[SimulationBackend] = None
+    seed: Optional[int] = Field(None, ge=0, le=MAX_SEED)
+
+
+class JobRequest(BaseModel):
+    kind: Literal["simulate_games", "train_models"]
+    params: Dict[str, Any] = {}
+
+
+# Parameter model for each job kind
+JOB_PARAMS = {
+    "simulate_games": SimulateGamesParams,
+    "train_models": TrainModelRequest,
+}
+
+
+async def _simulate_games_job(params: Dict[str, Any], progress) -> Dict[str, Any]:
+    """Project every game of each requested day (the simulate_all_games.py workload)"""
+    request = SimulateGamesParams(**params)
+    seed = resolve_seed(request.seed)
+    results = {}
+
+    for day_index, day in enumerate(request.days):
+        games = await (schedule_service.get_todays_games() if day == "today" else schedule_service.get_tomorrows_games())
+
+        # Each day replays on its own with simulate-todays-games?seed=<day seed>
+        day_seed = derive_seed(seed, day_index)
+        game_results = []
+        async for result in game_projection_service.iter_games(
+            games, request.num_simulations, request.backend, day_seed
+        ):
+            game_results.append(result)
+            await progress("game", {
+                "day": day,
+                **{key: value for key, value in result.items() if key != "projection"},
+                "completed_games": len(game_results),
+                "total_games": len(games)
+            })
+
+        game_results.sort(key=lambda result: result["index"])
+        projections = [result["projection"] for result in game_results if result["status"] == "complete"]
+        results[day] = {
+            "total_games": len(games),
+            "simulated_games": len(projections),
+            "seed": day_seed,
+            "games": projections
+        }
+
+    return {
+        "date": datetime.now().strftime('%Y-%m-%d'),
+        "num_simulations": request.num_simulations,
+        "seed": seed,
+        "days": results
+    }
+
+
+async def _train_models_job(params: Dict[str, Any], progress) -> Dict[str, Any]:
+    """Train the ML models (same result as POST /api/ml-simulation/train)"""
+    request = TrainModelRequest(**params)
+    start_time = datetime.now()
+
+    accuracy_scores = await ml_game_simulator.train_models(
+        season=request.season,
+        min_games=request.min_games,
+        progress=progress,
+        refresh_data=request.refresh_data,
+        engine=request.engine
+    )
+
+    return TrainModelResponse(
+        status="success",
+        message=f"Successfully trained {len(accuracy_scores)} models using top teams data",
+        accuracy_scores=accuracy_scores,
+        training_time=str(datetime.now() - start_time)
+    ).model_dump()
+
+
+job_queue.register("simulate_games", _simulate_games_job)
+job_queue.register("train_models", _train_models_job)
+
+
+def _get_job(job_id: str) -> Job:
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found (or its result expired)")
+    return job
+
+
+@router.post("", status_code=202)
+async def submit_job(request: JobRequest):
+    """
+    Submit a job and get its job_id right away
+
+    Kinds:
+    - simulate_games: params {days: ["today", "tomorrow"], num_simulations, backend, seed}
+    - train_models: params {season, min_games, refresh_data, engine}
+
+    Submitting the same kind and params as a queued, running or recently
+    finished job returns that job (deduplicated: true).
+    """
+    try:
+        params = JOB_PARAMS[request.kind](**request.params).model_dump()
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid params for {request.kind}: {e}")
+
+    try:
+        job, deduplicated = job_queue.submit(request.kind, params)
+    except JobQueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e))
+
+    return {**job.to_dict(), "deduplicated": deduplicated}
+
+
+@router.get("")
+async def list_jobs():
+    """All retained jobs (newest first) and queue statistics"""
+    return {
+        "jobs": [job.to_dict() for job in reversed(job_queue.list_jobs())],
+        "stats": job_queue.get_stats()
+    }
+
+
+@router.get("/{job_id}")
+async def get_job(job_id: str):
+    """Job status and latest progress"""
+    return _get_job(job_id).to_dict()
+
+
+@router.get("/{job_id}/result")
+async def get_job_result(job_id: str):
+    """Result of a finished job (409 while it is still queued or running)"""
+    job = _get_job(job_id)
+    if not job.finished:
+        raise HTTPException(status_code=409, detail=f"Job {job_id} is still {job.status}")
+    return job.to_dict(include_result=True)
+
+
+@router.get("/{job_id}/events")
+async def stream_job_events(
+    job_id: str,
+    stream: StreamFormat = Query("sse", description="sse or ndjson")
+):
+    """
+    Stream a job's progress: every event so far, then new ones as they
+    happen, then a "done" event with the final job status
+    """
+    job = _get_job(job_id)
+    return stream_response(lambda events: _stream_job(events, job), stream)
+
+
+async def _stream_job(events: EventStream, job: Job):
+    sequence = 0
+    while True:
+        new_events = await job.events_after(sequence)
+        for sequence, event, data in new_events:
+            await events.emit(event, data)
+        if job.finished and not new_events:
+            break
+    await events.emit("done", job.to_dict())
+
+
+@router.delete("/{job_id}")
+async def cancel_job(job_id: str):
+    """Cancel a queued or running job"""
+    _get_job(job_id)
+    return job_queue.cancel(job_id).to_dict()
@@ -1,13 +1,16 @@
 """
 ML Simulation Routes - Train and use ML models for game simulation
 """
-from fastapi import APIRouter, HTTPException, BackgroundTasks
-from typing import List, Optional
-from pydantic import BaseModel
+import asyncio
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Query
+from typing import List, Literal, Optional, Tuple
+from pydantic import BaseModel, Field
 from datetime import datetime
 
 from app.services.ml_simulator import ml_game_simulator
 from app.services.nba_stats import nba_stats_service
+from app.services.event_stream import EventStream, StreamFormat, stream_response
+from app.services.random_streams import MAX_SEED, derive_seed, make_rng, resolve_seed
 
 router = APIRouter(prefix="/api/ml-simulation", tags=["ML Simulation"])
 
@@ -15,6 +18,8 @@ router = APIRouter(prefix="/api/ml-simulation", tags=["ML Simulation"])
 class TrainModelRequest(BaseModel):
     season: str = "2023-24"
     min_games: int = 10
+    refresh_data: bool = False  # Collect the season's game logs again instead of reading the saved dataset
+    engine: Optional[Literal["gbr", "hist", "multi_output"]] = None  # Training engine (default: the ML_ENGINE setting)
 
 
 class TrainModelResponse(BaseModel):
@@ -36,10 +41,67 @@ class MLPredictionResponse(BaseModel):
     message: str
 
 
+class MLBatchPredictionRequest(BaseModel):
+    players: List[MLPredictionRequest] = Field(..., description="Players to predict", min_length=1, max_length=500)
+
+
+class MLBatchPredictionResponse(BaseModel):
+    predictions: List[MLPredictionResponse]
+    not_found: List[str]  # Players that were not found or have no season averages
+    message: str
+
+
+class MLBatchSimulationRequest(BaseModel):
+    players: List[MLPredictionRequest] = Field(..., description="Players to simulate", min_length=1, max_length=500)
+    num_simulations: int = Field(100, description="Simulations per player", ge=1, le=10000)
+    seed: Optional[int] = Field(None, description="Replay a previous run (the seed it returned)", ge=0, le=MAX_SEED)
+
+
+# Stats averaged in ML simulation responses
+SIMULATION_AVERAGE_STATS = ['points', 'rebounds', 'assists', 'steals', 'blocks', 'three_pointers_made']
+
+
+def _prediction_confidence(predictions: dict) -> str:
+    """Confidence based on how many stats the models cover"""
+    return "High" if len(predictions) >= 6 else "Medium" if len(predictions) >= 4 else "Low"
+
+
+async def _ensure_models(detail: str):
+    """Load saved models if none are trained (400 with detail if there are none)"""
+    if not await ml_game_simulator.ensure_loaded():
+        raise HTTPException(status_code=400, detail=detail)
+
+
+async def _fetch_batch_players(requests: List[MLPredictionRequest]) -> Tuple[list, List[str]]:
+    """
+    Player info, season averages and last 10 games of every requested
+    player, fetched concurrently
+
+    Returns ([(request, player_info, season_averages, recent_games)], not found player names).
+    """
+    async def fetch(request: MLPredictionRequest):
+        player_info = await nba_stats_service.get_player_info(request.player_name)
+        if not player_info:
+            return None
+        recent_games, season_averages = await asyncio.gather(
+            nba_stats_service.get_player_game_log(player_info.player_id, last_n_games=10),
+            nba_stats_service.get_player_season_averages(player_info.player_id)
+        )
+        if not season_averages:
+            return None
+        return request, player_info, season_averages, recent_games or []
+
+    results = await asyncio.gather(*(fetch(request) for request in requests))
+    found = [result for result in results if result is not None]
+    not_found = [request.player_name for request, result in zip(requests, results) if result is None]
+    return found, not_found
+
+
 @router.post("/train", response_model=TrainModelResponse)
 async def train_ml_models(
     request: TrainModelRequest,
-    background_tasks: BackgroundTasks
+    background_tasks: BackgroundTasks,
+    stream: Optional[StreamFormat] = Query(None, description="sse or ndjson - send per-player and per-model progress while training")
 ):
     """
     🤖 Train ML models using data from top playoff teams
@@ -54,20 +116,34 @@ async def train_ml_models(
     - **West:** Nuggets, Lakers, Warriors, Suns
     
     **Training Process:**
-    - Collects 80+ games from star players on these teams
+    - Collects the full season game logs of these teams' rosters and a list
+      of star players, all concurrently, and saves them per season - later
+      trainings on the same season read them from disk (refresh_data=true
+      collects them again)
     - Uses season averages, recent form, home/away, and trends as features
-    - Trains separate models for each stat type
-    - Returns accuracy (R² scores) for each model
+    - Trains a model per stat type in parallel across CPUs (engine "gbr" or
+      "hist"), or one model for every stat (engine "multi_output")
+    - Returns accuracy (R² scores) and fit time for each model
+    
+    **Streaming:** with stream=sse or ndjson, "player" events arrive as
+    training data is collected, a "dataset" event once it is ready and
+    "model" events as each model is trained, then a "done" event with the
+    response below.
     
     ⚠️ **Note:** This can take 2-5 minutes to complete
     """
+    if stream:
+        return stream_response(lambda events: _stream_training(events, request), stream)
+    
     try:
         start_time = datetime.now()
         
         # Train models
         accuracy_scores = await ml_game_simulator.train_models(
             season=request.season,
-            min_games=request.min_games
+            min_games=request.min_games,
+            refresh_data=request.refresh_data,
+            engine=request.engine
         )
         
         training_time = str(datetime.now() - start_time)
@@ -83,6 +159,26 @@ async def train_ml_models(
         raise HTTPException(status_code=500, detail=f"Training error: {str(e)}")
 
 
+async def _stream_training(events: EventStream, request: TrainModelRequest):
+    """Events for train?stream=... (errors are sent as an "error" event)"""
+    start_time = datetime.now()
+    
+    accuracy_scores = await ml_game_simulator.train_models(
+        season=request.season,
+        min_games=request.min_games,
+        progress=events.emit,
+        refresh_data=request.refresh_data,
+        engine=request.engine
+    )
+    
+    await events.emit("done", TrainModelResponse(
+        status="success",
+        message=f"Successfully trained {len(accuracy_scores)} models using top teams data",
+        accuracy_scores=accuracy_scores,
+        training_time=str(datetime.now() - start_time)
+    ).model_dump())
+
+
 @router.get("/model-status")
 async def get_model_status():
     """
@@ -91,22 +187,24 @@ async def get_model_status():
     Returns:
     - Training status
     - Available models
-    - Model accuracy scores
+    - The live model bundle: version, engine, training season, feature
+      schema and accuracy scores
     """
     # Try to load existing models
-    if not ml_game_simulator.is_trained:
-        ml_game_simulator.load_models()
+    await ml_game_simulator.ensure_loaded()
+    bundle = ml_game_simulator.bundle
     
     return {
-        "is_trained": ml_game_simulator.is_trained,
-        "available_models": list(ml_game_simulator.models.keys()),
-        "total_models": len(ml_game_simulator.models),
+        "is_trained": bundle is not None,
+        "available_models": list(bundle.models) if bundle else [],
+        "total_models": len(bundle.models) if bundle else 0,
+        "model_bundle": bundle.metadata() if bundle else None,
         "stat_types": ml_game_simulator.stat_types,
         "top_teams_used": {
             "east": ml_game_simulator.top_east_teams,
             "west": ml_game_simulator.top_west_teams
         },
-        "message": "Models ready" if ml_game_simulator.is_trained else "Models not trained yet. Use /train endpoint."
+        "message": "Models ready" if bundle else "Models not trained yet. Use /train endpoint."
     }
 
 
@@ -124,13 +222,7 @@ async def ml_predict_performance(request: MLPredictionRequest):
     """
     try:
         # Load models if not loaded
-        if not ml_game_simulator.is_trained:
-            loaded = ml_game_simulator.load_models()
-            if not loaded:
-                raise HTTPException(
-                    status_code=400,
-                    detail="ML models not trained yet. Please use /api/ml-simulation/train first."
-                )
+        await _ensure_models("ML models not trained yet. Please use /api/ml-simulation/train first.")
         
         # Get player data
         player_info = await nba_stats_service.get_player_info(request.player_name)
@@ -152,7 +244,7 @@ async def ml_predict_performance(request: MLPredictionRequest):
         )
         
         # Calculate confidence based on model performance
-        confidence = "High" if len(predictions) >= 6 else "Medium" if len(predictions) >= 4 else "Low"
+        confidence = _prediction_confidence(predictions)
         
         # Format predictions
         formatted_predictions = {
@@ -173,11 +265,50 @@ async def ml_predict_performance(request: MLPredictionRequest):
         raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
 
 
+@router.post("/predict-batch", response_model=MLBatchPredictionResponse)
+async def ml_predict_batch(request: MLBatchPredictionRequest):
+    """
+    🎯 ML predictions for many players in one call (e.g. a full slate)
+    
+    Same predictions as /predict, but every player's features are built
+    together and each model predicts all players at once. Players that
+    are not found are listed in not_found.
+    """
+    try:
+        await _ensure_models("ML models not trained yet. Please use /api/ml-simulation/train first.")
+        
+        found, not_found = await _fetch_batch_players(request.players)
+        predictions = ml_game_simulator.predict_batch([
+            (season_averages, recent_games, player.is_home)
+            for player, _, season_averages, recent_games in found
+        ])
+        
+        return MLBatchPredictionResponse(
+            predictions=[
+                MLPredictionResponse(
+                    player_name=player_info.full_name,
+                    predictions={stat_type: round(value, 1) for stat_type, value in player_predictions.items()},
+                    confidence=_prediction_confidence(player_predictions),
+                    message="ML prediction based on top teams' historical data"
+                )
+                for (_, player_info, _, _), player_predictions in zip(found, predictions)
+            ],
+            not_found=not_found,
+            message=f"ML predictions for {len(predictions)} players"
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
+
+
 @router.post("/simulate-with-ml")
 async def simulate_game_with_ml(
     player_name: str,
     num_simulations: int = 100,
-    is_home: bool = True
+    is_home: bool = True,
+    seed: Optional[int] = Query(None, ge=0, le=MAX_SEED, description="Replay a previous run (the seed it returned)")
 ):
     """
     🎮 Simulate games using ML models (more accurate!)
@@ -187,13 +318,7 @@ async def simulate_game_with_ml(
     """
     try:
         # Load models if needed
-        if not ml_game_simulator.is_trained:
-            loaded = ml_game_simulator.load_models()
-            if not loaded:
-                raise HTTPException(
-                    status_code=400,
-                    detail="ML models not trained. Use basic simulation instead: /api/simulation/single-game"
-                )
+        await _ensure_models("ML models not trained. Use basic simulation instead: /api/simulation/single-game")
         
         # Get player data
         player_info = await nba_stats_service.get_player_info(player_name)
@@ -207,12 +332,14 @@ async def simulate_game_with_ml(
             raise HTTPException(status_code=404, detail="Could not fetch player season averages")
         
         # Run ML simulations
+        seed = resolve_seed(seed)
         simulations = await ml_game_simulator.simulate_with_ml(
             player_info,
             season_averages,
             recent_games,
             num_simulations=num_simulations,
-            is_home=is_home
+            is_home=is_home,
+            seed=seed
         )
         
         # Calculate averages
@@ -229,6 +356,7 @@ async def simulate_game_with_ml(
             "player": player_info.full_name,
             "simulation_type": "ML-based (trained on top teams)",
             "num_simulations": len(simulations),
+            "seed": seed,
             "averages": averages,
             "message": "Simulations completed using machine learning models"
         }
@@ -239,8 +367,58 @@ async def simulate_game_with_ml(
         raise HTTPException(status_code=500, detail=f"ML simulation error: {str(e)}")
 
 
+@router.post("/simulate-with-ml-batch")
+async def simulate_games_with_ml_batch(request: MLBatchSimulationRequest):
+    """
+    🎮 ML simulations for many players in one call
+    
+    Predictions for every player come from one batched model call. Each
+    player's result carries its own seed: /simulate-with-ml with that
+    seed replays the player's simulations.
+    """
+    try:
+        await _ensure_models("ML models not trained. Use basic simulation instead: /api/simulation/single-game")
+        
+        found, not_found = await _fetch_batch_players(request.players)
+        seed = resolve_seed(request.seed)
+        draws = await ml_game_simulator.simulate_batch_with_ml(
+            [(season_averages, recent_games, player.is_home) for player, _, season_averages, recent_games in found],
+            num_simulations=request.num_simulations,
+            seed=seed
+        )
+        
+        return {
+            "simulation_type": "ML-based (trained on top teams)",
+            "num_simulations": request.num_simulations,
+            "seed": seed,
+            "players": [
+                {
+                    "player": player_info.full_name,
+                    "seed": derive_seed(seed, index),
+                    "averages": {
+                        stat_type: round(float(player_draws[stat_type].mean()), 1) if stat_type in player_draws else 0.0
+                        for stat_type in SIMULATION_AVERAGE_STATS
+                    }
+                }
+                for index, ((_, player_info, _, _), player_draws) in enumerate(zip(found, draws))
+            ],
+            "not_found": not_found,
+            "message": f"Simulations completed for {len(draws)} players using machine learning models"
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"ML simulation error: {str(e)}")
+
+
 @router.get("/compare-methods/{player_name}")
-async def compare_simulation_methods(player_name: str, prop_type: str, line: float):
+async def compare_simulation_methods(
+    player_name: str,
+    prop_type: str,
+    line: float,
+    seed: Optional[int] = Query(None, ge=0, le=MAX_SEED, description="Replay a previous comparison (the seed it returned)")
+):
     """
     ⚖️ Compare ML simulation vs Basic simulation
     
@@ -264,21 +442,24 @@ async def compare_simulation_methods(player_name: str, prop_type: str, line: flo
         if not season_averages:
             raise HTTPException(status_code=404, detail="Could not fetch player season averages")
         
-        # Basic simulation
-        basic_sims = game_simulator.simulate_multiple_games(
-            player_info, season_averages, recent_games, num_simulations=50
+        # Basic simulation (columnar batch) - stream 0 of the seed, ML noise child seed 1
+        seed = resolve_seed(seed)
+        basic_sims = game_simulator.simulate_batch(
+            season_averages, recent_games, num_simulations=50, rng=make_rng(seed, 0)
+        )
+        basic_values = (
+            basic_sims[prop_type].tolist() if prop_type in basic_sims else [0] * len(basic_sims)
         )
         
         # Try ML simulation
-        ml_available = ml_game_simulator.is_trained or ml_game_simulator.load_models()
+        ml_available = await ml_game_simulator.ensure_loaded()
         
         if ml_available:
             ml_sims = await ml_game_simulator.simulate_with_ml(
-                player_info, season_averages, recent_games, num_simulations=50
+                player_info, season_averages, recent_games, num_simulations=50, seed=derive_seed(seed, 1)
             )
             
             # Compare results for the specific prop
-            basic_values = [getattr(s, prop_type, 0) for s in basic_sims]
             ml_values = [getattr(s, prop_type, 0) for s in ml_sims]
             
             basic_avg = sum(basic_values) / len(basic_values)
@@ -291,6 +472,7 @@ async def compare_simulation_methods(player_name: str, prop_type: str, line: flo
                 "player": player_info.full_name,
                 "prop": f"{prop_type.replace('_', ' ').title()}",
                 "line": line,
+                "seed": seed,
                 "basic_simulation": {
                     "average": round(basic_avg, 1),
                     "over_percentage": round(basic_over_pct, 1),
@@ -309,7 +491,6 @@ async def compare_simulation_methods(player_name: str, prop_type: str, line: flo
             }
         else:
             # Only basic available
-            basic_values = [getattr(s, prop_type, 0) for s in basic_sims]
             basic_avg = sum(basic_values) / len(basic_values)
             basic_over_pct = sum(1 for v in basic_values if v > line) / len(basic_values) * 100
             
@@ -317,6 +498,7 @@ async def compare_simulation_methods(player_name: str, prop_type: str, line: flo
                 "player": player_info.full_name,
                 "prop": f"{prop_type.replace('_', ' ').title()}",
                 "line": line,
+                "seed": seed,
                 "basic_simulation": {
                     "average": round(basic_avg, 1),
                     "over_percentage": round(basic_over_pct, 1)
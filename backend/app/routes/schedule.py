@@ -6,13 +6,26 @@ Get today's games and simulate all players
 from fastapi import APIRouter, HTTPException, Query
 from typing import List, Optional
 from datetime import datetime, timedelta
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from app.services.schedule import schedule_service
 from app.services.game_simulator import game_simulator
 from app.services.nba_stats import nba_stats_service
+from app.services.game_projection import game_projection_service
+from app.services.event_stream import EventStream, StreamFormat, stream_response
+from app.services.random_streams import MAX_SEED, make_rng, resolve_seed
+from app.services.simulation_pool import SimulationBackend
+import numpy as np
 
 router = APIRouter(prefix="/api/schedule", tags=["schedule"])
 
+# Ticket combo prop names -> SimulationBatch combo columns
+TICKET_PROP_COLUMNS = {
+    "pts+rebs+asts": "pra",
+    "pts+rebs": "pr",
+    "pts+asts": "pa",
+    "rebs+asts": "ra",
+}
+
 class GameInfo(BaseModel):
     game_id: str
     game_date: str
@@ -47,12 +60,13 @@ class PrizePickLeg(BaseModel):
 class PrizePickTicket(BaseModel):
     legs: List[PrizePickLeg]
     num_simulations: int = 100
+    seed: Optional[int] = Field(None, ge=0, le=MAX_SEED, description="Replay a previous run (returned in ticket_summary)")
 
 @router.get("/today", response_model=List[GameInfo])
 async def get_todays_games():
     """Get all NBA games scheduled for today"""
     try:
-        games = schedule_service.get_todays_games()
+        games = await schedule_service.get_todays_games()
         
         if not games:
             return []
@@ -77,7 +91,7 @@ async def get_todays_games():
 async def get_tomorrows_games():
     """Get all NBA games scheduled for tomorrow"""
     try:
-        games = schedule_service.get_tomorrows_games()
+        games = await schedule_service.get_tomorrows_games()
         
         if not games:
             return []
@@ -102,7 +116,7 @@ async def get_tomorrows_games():
 async def get_upcoming_games(days: int = Query(default=2, ge=1, le=7)):
     """Get all NBA games for the next N days"""
     try:
-        games_by_date = schedule_service.get_upcoming_games(days=days)
+        games_by_date = await schedule_service.get_upcoming_games(days=days)
         return games_by_date
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching upcoming games: {str(e)}")
@@ -111,7 +125,7 @@ async def get_upcoming_games(days: int = Query(default=2, ge=1, le=7)):
 async def get_player_next_game(player_name: str):
     """Find a player's next game (today or tomorrow)"""
     try:
-        game = schedule_service.find_player_game_today(player_name)
+        game = await schedule_service.find_player_game_today(player_name)
         
         if not game:
             raise HTTPException(
@@ -129,165 +143,24 @@ async def get_player_next_game(player_name: str):
 async def simulate_game_all_players(
     game_id: str,
     num_simulations: int = Query(default=5, ge=1, le=20),
-    top_n_players: int = Query(default=5, ge=3, le=10)
+    top_n_players: int = Query(default=5, ge=3, le=10),
+    backend: Optional[SimulationBackend] = Query(default=None, description="auto, inline or process (default: server setting)"),
+    seed: Optional[int] = Query(default=None, ge=0, le=MAX_SEED, description="Replay a previous projection (simulation_summary.seed)")
 ):
     """
     Simulate top players in a specific game
     Returns projections for key rotation players on both teams
-    Reduced defaults for faster performance: 5 simulations, 5 players per team
+    
+    Rosters and player data are fetched concurrently and every player is
+    simulated in one batched call.
     """
     try:
-        # First, get the game info
-        today_games = schedule_service.get_todays_games()
-        tomorrow_games = schedule_service.get_tomorrows_games()
-        all_games = today_games + tomorrow_games
-        
-        game = next((g for g in all_games if g['game_id'] == game_id), None)
+        game = await game_projection_service.find_game(game_id)
         
         if not game:
             raise HTTPException(status_code=404, detail=f"Game {game_id} not found")
         
-        # Get rosters for both teams
-        home_roster = schedule_service.get_team_roster(game['home_team_id'])
-        away_roster = schedule_service.get_team_roster(game['away_team_id'])
-        
-        # Simulate all players
-        home_simulations = []
-        away_simulations = []
-        
-        # Simulate home team
-        for player in home_roster[:10]:  # Top 10 players (rotation players)
-            try:
-                # Get player season averages
-                player_info = await nba_stats_service.get_player_info(player['player_name'])
-                if not player_info:
-                    continue
-                
-                season_avg = await nba_stats_service.get_player_season_averages(player_info.player_id)
-                if not season_avg:
-                    continue
-                
-                # Get recent games for better simulation
-                recent_games = await nba_stats_service.get_player_game_log(player_info.player_id, last_n_games=5)
-                if not recent_games:
-                    recent_games = []
-                
-                # Simulate games
-                simulations = game_simulator.simulate_multiple_games(
-                    player_info=player_info,
-                    season_averages=season_avg,
-                    recent_games=recent_games,
-                    opponent=game['away_team'],
-                    is_home=True,
-                    num_simulations=num_simulations
-                )
-                
-                # Calculate averages
-                avg_stats = {
-                    'points': sum(s.points for s in simulations) / len(simulations),
-                    'rebounds': sum(s.rebounds for s in simulations) / len(simulations),
-                    'assists': sum(s.assists for s in simulations) / len(simulations),
-                    'steals': sum(s.steals for s in simulations) / len(simulations),
-                    'blocks': sum(s.blocks for s in simulations) / len(simulations),
-                }
-                
-                home_simulations.append({
-                    'player_name': player['player_name'],
-                    'player_id': player['player_id'],
-                    'position': player['position'],
-                    'team': game['home_team'],
-                    'is_home': True,
-                    'projected_stats': avg_stats,
-                    'season_averages': {
-                        'points': season_avg.points_per_game,
-                        'rebounds': season_avg.rebounds_per_game,
-                        'assists': season_avg.assists_per_game,
-                        'steals': season_avg.steals_per_game,
-                        'blocks': season_avg.blocks_per_game
-                    }
-                })
-            except Exception as e:
-                print(f"Error simulating {player['player_name']}: {e}")
-                continue
-        
-        # Simulate away team
-        for player in away_roster[:10]:  # Top 10 players
-            try:
-                player_info = await nba_stats_service.get_player_info(player['player_name'])
-                if not player_info:
-                    continue
-                
-                season_avg = await nba_stats_service.get_player_season_averages(player_info.player_id)
-                if not season_avg:
-                    continue
-                
-                # Get recent games for better simulation
-                recent_games = await nba_stats_service.get_player_game_log(player_info.player_id, last_n_games=5)
-                if not recent_games:
-                    recent_games = []
-                
-                simulations = game_simulator.simulate_multiple_games(
-                    player_info=player_info,
-                    season_averages=season_avg,
-                    recent_games=recent_games,
-                    opponent=game['home_team'],
-                    is_home=False,
-                    num_simulations=num_simulations
-                )
-                
-                avg_stats = {
-                    'points': sum(s.points for s in simulations) / len(simulations),
-                    'rebounds': sum(s.rebounds for s in simulations) / len(simulations),
-                    'assists': sum(s.assists for s in simulations) / len(simulations),
-                    'steals': sum(s.steals for s in simulations) / len(simulations),
-                    'blocks': sum(s.blocks for s in simulations) / len(simulations),
-                }
-                
-                away_simulations.append({
-                    'player_name': player['player_name'],
-                    'player_id': player['player_id'],
-                    'position': player['position'],
-                    'team': game['away_team'],
-                    'is_home': False,
-                    'projected_stats': avg_stats,
-                    'season_averages': {
-                        'points': season_avg.points_per_game,
-                        'rebounds': season_avg.rebounds_per_game,
-                        'assists': season_avg.assists_per_game,
-                        'steals': season_avg.steals_per_game,
-                        'blocks': season_avg.blocks_per_game
-                    }
-                })
-            except Exception as e:
-                print(f"Error simulating {player['player_name']}: {e}")
-                continue
-        
-        # Calculate team totals
-        home_total_pts = sum(p['projected_stats']['points'] for p in home_simulations)
-        away_total_pts = sum(p['projected_stats']['points'] for p in away_simulations)
-        
-        return {
-            'game_info': {
-                'game_id': game['game_id'],
-                'game_date': game['game_date_str'],
-                'home_team': game['home_team'],
-                'away_team': game['away_team'],
-                'home_team_name': game['home_team_name'],
-                'away_team_name': game['away_team_name'],
-                'matchup': game['matchup'],
-                'game_status': game['game_status']
-            },
-            'home_team_players': home_simulations,
-            'away_team_players': away_simulations,
-            'simulation_summary': {
-                'num_simulations': num_simulations,
-                'home_team_projected_points': round(home_total_pts, 1),
-                'away_team_projected_points': round(away_total_pts, 1),
-                'projected_winner': game['home_team'] if home_total_pts > away_total_pts else game['away_team'],
-                'point_differential': abs(round(home_total_pts - away_total_pts, 1)),
-                'total_players_simulated': len(home_simulations) + len(away_simulations)
-            }
-        }
+        return await game_projection_service.project_game(game, num_simulations, backend, seed)
         
     except HTTPException:
         raise
@@ -296,14 +169,27 @@ async def simulate_game_all_players(
 
 @router.post("/simulate-todays-games")
 async def simulate_all_todays_games(
-    num_simulations: int = Query(default=10, ge=1, le=50)
+    num_simulations: int = Query(default=10, ge=1, le=50),
+    stream: Optional[StreamFormat] = Query(default=None, description="sse or ndjson - send each game as soon as it is simulated"),
+    backend: Optional[SimulationBackend] = Query(default=None, description="auto, inline or process (default: server setting)"),
+    seed: Optional[int] = Query(default=None, ge=0, le=MAX_SEED, description="Replay a previous run (returned as seed)")
 ):
     """
     Simulate ALL games happening today with all players on both teams
-    WARNING: This can take several minutes!
+    
+    Games are simulated concurrently. With stream=sse or ndjson, each game
+    is sent as a "game" event in completion order (followed by a "progress"
+    event), then a "done" event with the summary.
+    
+    The run's seed is returned; each game's own seed is in its
+    simulation_summary.
     """
+    seed = resolve_seed(seed)
+    if stream:
+        return stream_response(lambda events: _stream_todays_games(events, num_simulations, backend, seed), stream)
+    
     try:
-        games = schedule_service.get_todays_games()
+        games = await schedule_service.get_todays_games()
         
         if not games:
             return {
@@ -311,28 +197,48 @@ async def simulate_all_todays_games(
                 "games": []
             }
         
-        all_simulations = []
-        
-        for game in games:
-            try:
-                # Simulate this game
-                game_sim = await simulate_game_all_players(game['game_id'], num_simulations)
-                all_simulations.append(game_sim)
-            except Exception as e:
-                print(f"Error simulating game {game['game_id']}: {e}")
-                continue
+        results = [result async for result in game_projection_service.iter_games(games, num_simulations, backend, seed)]
+        results.sort(key=lambda result: result["index"])
+        all_simulations = [result["projection"] for result in results if result["status"] == "complete"]
         
         return {
             "message": f"Successfully simulated {len(all_simulations)} games",
             "date": datetime.now().strftime('%Y-%m-%d'),
             "total_games": len(games),
             "simulated_games": len(all_simulations),
+            "seed": seed,
             "games": all_simulations
         }
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error simulating today's games: {str(e)}")
 
+async def _stream_todays_games(
+    events: EventStream,
+    num_simulations: int,
+    backend: Optional[str] = None,
+    seed: Optional[int] = None
+):
+    """Events for simulate-todays-games?stream=..."""
+    games = await schedule_service.get_todays_games()
+    
+    completed_games = 0
+    simulated_games = 0
+    async for result in game_projection_service.iter_games(games, num_simulations, backend, seed):
+        completed_games += 1
+        if result["status"] == "complete":
+            simulated_games += 1
+        await events.emit("game", result)
+        await events.emit("progress", {"completed_games": completed_games, "total_games": len(games)})
+    
+    await events.emit("done", {
+        "message": f"Successfully simulated {simulated_games} games" if games else "No games scheduled for today",
+        "date": datetime.now().strftime('%Y-%m-%d'),
+        "total_games": len(games),
+        "simulated_games": simulated_games,
+        "seed": seed
+    })
+
 @router.post("/simulate-prizepicks-ticket")
 async def simulate_prizepicks_ticket(ticket: PrizePickTicket):
     """
@@ -351,23 +257,25 @@ async def simulate_prizepicks_ticket(ticket: PrizePickTicket):
     """
     try:
         # Get today's and tomorrow's games
-        today_games = schedule_service.get_todays_games()
-        tomorrow_games = schedule_service.get_tomorrows_games()
+        today_games = await schedule_service.get_todays_games()
+        tomorrow_games = await schedule_service.get_tomorrows_games()
         all_games = today_games + tomorrow_games
         
         if not all_games:
             raise HTTPException(status_code=404, detail="No games scheduled for today or tomorrow")
         
+        # Leg i draws from its own stream of the ticket's seed
+        seed = resolve_seed(ticket.seed)
         results = []
         
-        for leg in ticket.legs:
+        for index, leg in enumerate(ticket.legs):
             try:
                 # Find the player's game
                 player_game = None
                 for game in all_games:
                     # Get rosters for both teams
-                    home_roster = schedule_service.get_team_roster(game['home_team_id'])
-                    away_roster = schedule_service.get_team_roster(game['away_team_id'])
+                    home_roster = await schedule_service.get_team_roster(game['home_team_id'])
+                    away_roster = await schedule_service.get_team_roster(game['away_team_id'])
                     
                     # Check if player is in either roster
                     player_in_home = any(p['player_name'].lower() == leg.player_name.lower() for p in home_roster)
@@ -422,49 +330,26 @@ async def simulate_prizepicks_ticket(ticket: PrizePickTicket):
                     })
                     continue
                 
-                # Run simulations
-                simulations = game_simulator.simulate_multiple_games(
-                    player_info=player_info,
-                    season_averages=season_avg,
-                    recent_games=recent_games if recent_games else [],
-                    opponent=opponent_team,
+                # Run simulations (columnar batch)
+                simulations = game_simulator.simulate_batch(
+                    season_avg,
+                    recent_games if recent_games else [],
+                    num_simulations=ticket.num_simulations,
                     is_home=is_home,
-                    num_simulations=ticket.num_simulations
+                    rng=make_rng(seed, index)
                 )
                 
                 # Calculate win probability based on prop type and pick
-                wins = 0
-                stat_values = []
+                column = TICKET_PROP_COLUMNS.get(leg.prop_type, leg.prop_type)
+                stat_values = simulations[column] if column in simulations else np.zeros(len(simulations))
                 
-                for sim in simulations:
-                    if leg.prop_type == "points":
-                        value = sim.points
-                    elif leg.prop_type == "rebounds":
-                        value = sim.rebounds
-                    elif leg.prop_type == "assists":
-                        value = sim.assists
-                    elif leg.prop_type == "pts+rebs+asts":
-                        value = sim.points + sim.rebounds + sim.assists
-                    elif leg.prop_type == "pts+rebs":
-                        value = sim.points + sim.rebounds
-                    elif leg.prop_type == "pts+asts":
-                        value = sim.points + sim.assists
-                    elif leg.prop_type == "rebs+asts":
-                        value = sim.rebounds + sim.assists
-                    else:
-                        value = getattr(sim, leg.prop_type, 0)
-                    
-                    stat_values.append(value)
-                    
-                    if leg.pick.upper() == "OVER":
-                        if value > leg.line:
-                            wins += 1
-                    else:  # UNDER
-                        if value < leg.line:
-                            wins += 1
+                if leg.pick.upper() == "OVER":
+                    wins = int((stat_values > leg.line).sum())
+                else:  # UNDER
+                    wins = int((stat_values < leg.line).sum())
                 
                 win_probability = (wins / len(simulations)) * 100
-                avg_value = sum(stat_values) / len(stat_values)
+                avg_value = float(np.nanmean(stat_values))
                 
                 results.append({
                     "player_name": leg.player_name,
@@ -526,7 +411,8 @@ async def simulate_prizepicks_ticket(ticket: PrizePickTicket):
                 "successful_simulations": len(successful_legs),
                 "failed_simulations": len(ticket.legs) - len(successful_legs),
                 "overall_win_probability": round(overall_probability, 2),
-                "num_simulations_per_player": ticket.num_simulations
+                "num_simulations_per_player": ticket.num_simulations,
+                "seed": seed
             },
             "legs": results
         }
@@ -2,12 +2,14 @@
 Simulation Routes - API endpoints for game and bet simulation
 """
 from fastapi import APIRouter, HTTPException, Query
-from typing import List, Optional
+from typing import List, Literal, Optional
 from pydantic import BaseModel, Field
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from app.services.game_simulator import game_simulator
 from app.services.nba_stats import nba_stats_service
+from app.services.random_streams import MAX_SEED, make_rng, resolve_seed
+from app.services.simulation_pool import SimulationBackend, simulation_pool
 from app.models import PropType, BetType, PlayerInfo
 
 router = APIRouter(prefix="/api/simulation", tags=["Simulation"])
@@ -19,6 +21,7 @@ class SimulationRequest(BaseModel):
     opponent: Optional[str] = Field(None, description="Opponent team abbreviation")
     is_home: bool = Field(True, description="Is this a home game?")
     num_simulations: int = Field(1, description="Number of simulations to run", ge=1, le=1000)
+    seed: Optional[int] = Field(None, description="Replay a previous run (the seed it returned)", ge=0, le=MAX_SEED)
 
 
 class SingleGameSimulation(BaseModel):
@@ -44,6 +47,7 @@ class SimulationResponse(BaseModel):
     simulations: List[SingleGameSimulation]
     averages: dict
     message: str
+    seed: int
 
 
 class BetSimulationRequest(BaseModel):
@@ -51,9 +55,13 @@ class BetSimulationRequest(BaseModel):
     prop_type: PropType = Field(..., description="Type of prop to simulate")
     line: float = Field(..., description="The line/over-under value")
     bet_type: BetType = Field(..., description="Over or Under")
-    num_simulations: int = Field(100, description="Number of simulations", ge=10, le=1000)
+    num_simulations: int = Field(100, description="Number of simulations", ge=10, le=100000)
     opponent: Optional[str] = None
     is_home: bool = True
+    method: Literal["auto", "analytic", "monte_carlo"] = Field(
+        "auto", description="analytic = exact probabilities (single-stat props), monte_carlo = simulations"
+    )
+    seed: Optional[int] = Field(None, description="Replay a previous run (the seed it returned)", ge=0, le=MAX_SEED)
 
 
 class BetSimulationResponse(BaseModel):
@@ -69,6 +77,8 @@ class BetSimulationResponse(BaseModel):
     percentage_under: float
     confidence_level: str
     simulations_run: int
+    seed: int
+    method: str
     recommendation: str
     visualization_data: dict
 
@@ -81,7 +91,11 @@ class MultiLegRequest(BaseModel):
         bet_type: BetType
     
     legs: List[LegInfo] = Field(..., description="List of bet legs", min_length=2, max_length=10)
-    num_simulations: int = Field(100, description="Number of simulations", ge=10, le=500)
+    num_simulations: int = Field(100, description="Number of simulations", ge=10, le=50000)
+    same_player_correlation: float = Field(0.0, description="Correlation between legs on the same player", ge=-0.95, le=0.95)
+    same_game_correlation: float = Field(0.0, description="Correlation between legs in the same game", ge=-0.95, le=0.95)
+    backend: Optional[SimulationBackend] = Field(None, description="auto, inline or process (default: server setting)")
+    seed: Optional[int] = Field(None, description="Replay a previous run (the seed it returned)", ge=0, le=MAX_SEED)
 
 
 class MultiLegResponse(BaseModel):
@@ -89,8 +103,10 @@ class MultiLegResponse(BaseModel):
     ticket_hit_rate: str
     expected_wins_per_100: int
     leg_probabilities: List[dict]
+    legs_hit_distribution: dict = {}
     total_legs: int
     simulations_run: int
+    seed: int
     recommendation: str
     visual_breakdown: dict
 
@@ -124,53 +140,45 @@ async def simulate_single_game(request: SimulationRequest):
         if not season_averages:
             raise HTTPException(status_code=404, detail="Could not fetch player season averages")
         
-        # Run simulations
-        simulations = game_simulator.simulate_multiple_games(
-            player_info=player_info,
-            season_averages=season_averages,
-            recent_games=recent_games,
+        # Run simulations (columnar batch - response models are built only here)
+        seed = resolve_seed(request.seed)
+        batch = game_simulator.simulate_batch(
+            season_averages,
+            recent_games,
             num_simulations=request.num_simulations,
-            opponent=request.opponent,
-            is_home=request.is_home
+            is_home=request.is_home,
+            rng=make_rng(seed)
         )
         
         # Convert to response format
+        game_date = datetime.now() + timedelta(days=1)  # Future game
+        opponent = request.opponent or "TBD"
+        response_fields = SingleGameSimulation.model_fields.keys()
         sim_results = [
             SingleGameSimulation(
                 player_name=player_info.full_name,
-                game_date=sim.game_date,
-                opponent=sim.opponent,
-                is_home=sim.is_home,
-                points=sim.points or 0,
-                rebounds=sim.rebounds or 0,
-                assists=sim.assists or 0,
-                steals=sim.steals or 0,
-                blocks=sim.blocks or 0,
-                turnovers=sim.turnovers or 0,
-                three_pointers_made=sim.three_pointers_made or 0,
-                free_throws_made=sim.free_throws_made or 0,
-                fantasy_score=sim.fantasy_score,
-                minutes_played=sim.minutes_played or 0,
-                plus_minus=sim.plus_minus or 0
+                game_date=game_date,
+                opponent=opponent,
+                is_home=request.is_home,
+                **{field: value for field, value in record.items() if field in response_fields}
             )
-            for sim in simulations
+            for record in batch.to_records()
         ]
         
         # Calculate averages
         averages = {
-            "points": round(sum(s.points for s in sim_results) / len(sim_results), 1),
-            "rebounds": round(sum(s.rebounds for s in sim_results) / len(sim_results), 1),
-            "assists": round(sum(s.assists for s in sim_results) / len(sim_results), 1),
-            "steals": round(sum(s.steals for s in sim_results) / len(sim_results), 1),
-            "blocks": round(sum(s.blocks for s in sim_results) / len(sim_results), 1),
-            "three_pointers_made": round(sum(s.three_pointers_made for s in sim_results) / len(sim_results), 1),
+            field: round(mean, 1)
+            for field, mean in batch.means(
+                ["points", "rebounds", "assists", "steals", "blocks", "three_pointers_made"]
+            ).items()
         }
         
         return SimulationResponse(
             player_name=player_info.full_name,
             simulations=sim_results,
             averages=averages,
-            message=f"Successfully simulated {len(sim_results)} games for {player_info.full_name}"
+            message=f"Successfully simulated {len(sim_results)} games for {player_info.full_name}",
+            seed=seed
         )
         
     except HTTPException:
@@ -184,6 +192,10 @@ async def simulate_bet_outcome(request: BetSimulationRequest):
     """
     🎲 Simulate a bet to see your winning chances
     
+    Single-stat props (points, rebounds, assists, steals, blocks, turnovers)
+    are computed exactly from the simulation model's distribution; other
+    props fall back to Monte Carlo (set method to force either one).
+    
     This shows you:
     - Win probability (% chance of hitting)
     - Expected outcome (average result)
@@ -206,6 +218,7 @@ async def simulate_bet_outcome(request: BetSimulationRequest):
             raise HTTPException(status_code=404, detail="Could not fetch player season averages")
         
         # Run bet simulation
+        seed = resolve_seed(request.seed)
         result = game_simulator.simulate_bet_outcome(
             player_info=player_info,
             season_averages=season_averages,
@@ -213,7 +226,10 @@ async def simulate_bet_outcome(request: BetSimulationRequest):
             prop_type=request.prop_type,
             line=request.line,
             bet_type=request.bet_type,
-            num_simulations=request.num_simulations
+            num_simulations=request.num_simulations,
+            is_home=request.is_home,
+            method=request.method,
+            rng=make_rng(seed)
         )
         
         # Generate recommendation
@@ -255,12 +271,16 @@ async def simulate_bet_outcome(request: BetSimulationRequest):
             percentage_under=result["percentage_under"],
             confidence_level=result["confidence_level"],
             simulations_run=result["simulations_run"],
+            seed=seed,
+            method=result["method"],
             recommendation=recommendation,
             visualization_data=viz_data
         )
         
     except HTTPException:
         raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Bet simulation error: {str(e)}")
 
@@ -279,35 +299,44 @@ async def simulate_multi_leg_ticket(request: MultiLegRequest):
     - Individual win probability for each leg
     - Overall ticket win probability
     - How many times per 100 the full ticket would hit
+    - How often exactly 0, 1, 2... legs hit (for flex payouts)
+    
+    Legs on the same player (or in the same game) can be correlated with
+    same_player_correlation / same_game_correlation.
     """
     try:
-        # Gather data for all legs
+        # Gather data for all legs concurrently (each distinct player fetched once)
+        players = await nba_stats_service.get_players_data(
+            [leg.player_name for leg in request.legs], last_n_games=10
+        )
         legs_data = []
         
         for leg in request.legs:
-            player_info = await nba_stats_service.get_player_info(leg.player_name)
-            if not player_info:
+            player = players[leg.player_name]
+            if not player:
                 raise HTTPException(status_code=404, detail=f"Player '{leg.player_name}' not found")
             
-            recent_games = await nba_stats_service.get_player_game_log(player_info.player_id, last_n_games=10)
-            season_averages = await nba_stats_service.get_player_season_averages(player_info.player_id)
-            
-            if not season_averages:
+            if not player["season_averages"]:
                 raise HTTPException(status_code=404, detail=f"Could not fetch season averages for {leg.player_name}")
             
             legs_data.append({
-                "player_info": player_info,
-                "season_averages": season_averages,
-                "recent_games": recent_games,
+                "player_info": player["player_info"],
+                "season_averages": player["season_averages"],
+                "recent_games": player["recent_games"],
                 "prop_type": leg.prop_type,
                 "line": leg.line,
                 "bet_type": leg.bet_type
             })
         
         # Run multi-leg simulation
-        result = game_simulator.simulate_multi_leg_ticket(
+        seed = resolve_seed(request.seed)
+        result = await simulation_pool.simulate_ticket(
             legs=legs_data,
-            num_simulations=request.num_simulations
+            num_simulations=request.num_simulations,
+            same_player_correlation=request.same_player_correlation,
+            same_game_correlation=request.same_game_correlation,
+            seed=seed,
+            backend=request.backend
         )
         
         # Create visual breakdown
@@ -332,8 +361,10 @@ async def simulate_multi_leg_ticket(request: MultiLegRequest):
             ticket_hit_rate=result["ticket_hit_rate"],
             expected_wins_per_100=result["expected_wins_per_100"],
             leg_probabilities=result["leg_probabilities"],
+            legs_hit_distribution=result["legs_hit_distribution"],
             total_legs=result["total_legs"],
             simulations_run=result["simulations_run"],
+            seed=seed,
             recommendation=result["recommendation"],
             visual_breakdown=visual
         )
@@ -349,11 +380,14 @@ async def quick_odds_check(
     player_name: str,
     prop_type: PropType = Query(..., description="Stat to check"),
     line: float = Query(..., description="Line value"),
+    seed: Optional[int] = Query(None, ge=0, le=MAX_SEED, description="Replay a previous check (the seed it returned)"),
 ):
     """
     ⚡ Quick odds check for a single prop
     
-    Fast simulation (50 iterations) for quick decision making
+    Exact probabilities for single-stat props, 2000 batched simulations for
+    derived stats (threes, free throws, fantasy score). OVER and UNDER come
+    from the same simulated games; the seed is returned to replay them.
     """
     try:
         player_info = await nba_stats_service.get_player_info(player_name)
@@ -366,24 +400,23 @@ async def quick_odds_check(
         if not season_averages:
             raise HTTPException(status_code=404, detail="Could not fetch player season averages")
         
-        # Quick simulation for both OVER and UNDER
-        over_result = game_simulator.simulate_bet_outcome(
-            player_info, season_averages, recent_games,
-            prop_type, line, BetType.OVER, num_simulations=50
-        )
-        
-        under_result = game_simulator.simulate_bet_outcome(
+        # One draw - OVER and UNDER are both read from its percentages
+        seed = resolve_seed(seed)
+        result = game_simulator.simulate_bet_outcome(
             player_info, season_averages, recent_games,
-            prop_type, line, BetType.UNDER, num_simulations=50
+            prop_type, line, BetType.OVER, num_simulations=2000,
+            rng=make_rng(seed)
         )
+        over_probability = result["percentage_over"] / 100
+        under_probability = result["percentage_under"] / 100
         
         # Determine best bet
-        if over_result["win_probability"] > under_result["win_probability"]:
+        if over_probability > under_probability:
             best_bet = "OVER"
-            confidence = over_result["win_probability"]
+            confidence = over_probability
         else:
             best_bet = "UNDER"
-            confidence = under_result["win_probability"]
+            confidence = under_probability
         
         return {
             "player": player_info.full_name,
@@ -391,11 +424,12 @@ async def quick_odds_check(
             "line": line,
             "best_bet": best_bet,
             "confidence": f"{int(confidence * 100)}%",
-            "over_probability": f"{int(over_result['win_probability'] * 100)}%",
-            "under_probability": f"{int(under_result['win_probability'] * 100)}%",
-            "expected_result": over_result["expected_value"],
+            "over_probability": f"{int(over_probability * 100)}%",
+            "under_probability": f"{int(under_probability * 100)}%",
+            "expected_result": result["expected_value"],
             "season_average": getattr(season_averages, f"{prop_type.value}_per_game", 0),
-            "recommendation": "✅ TAKE IT" if confidence >= 0.58 else "⚠️ CLOSE CALL" if confidence >= 0.52 else "❌ PASS"
+            "recommendation": "✅ TAKE IT" if confidence >= 0.58 else "⚠️ CLOSE CALL" if confidence >= 0.52 else "❌ PASS",
+            "seed": seed
         }
         
     except HTTPException:
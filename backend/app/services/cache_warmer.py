@@ -1,136 +1,422 @@
 """
-Cache Warmer Service - Pre-fetch and cache player data on startup
+Cache Warmer Service - Precompute today's and tomorrow's slates in the background
 """
 
 import asyncio
 import logging
+import re
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, List, Optional
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+from app.config import settings
+from app.services.game_simulator import game_simulator
+from app.services.nba_stats import nba_stats_service
 from app.services.popular_players import popular_players_service
+from app.services.schedule import schedule_service
+from app.services.single_flight import single_flight
 
 logger = logging.getLogger(__name__)
 
+# Scoreboard status text for games that have not started, e.g. "7:30 pm ET"
+TIPOFF_PATTERN = re.compile(r"(\d{1,2}):(\d{2})\s*([ap]m)\s*ET", re.IGNORECASE)
+EASTERN = ZoneInfo("America/New_York")
+
+# Refresh this long before each tip-off (injury news, final lines)
+PRE_TIPOFF_REFRESHES = (timedelta(minutes=90), timedelta(minutes=20))
+
+# SimulationBatch column behind each PrizePicks line key
+BASELINE_STATS = {
+    "points": "points",
+    "rebounds": "rebounds",
+    "assists": "assists",
+    "steals": "steals",
+    "turnovers": "turnovers",
+    "threes_made": "three_pointers_made",
+    "pra": "pra",
+    "pr": "pr",
+    "pa": "pa",
+}
+
+
+def parse_tipoff(game: Dict) -> Optional[datetime]:
+    """Local tip-off time of a scheduled game, or None once it has started / finished"""
+    match = TIPOFF_PATTERN.search(str(game.get('game_status', '')))
+    game_date = game.get('game_date')
+    if not match or not isinstance(game_date, datetime):
+        return None
+
+    hour = int(match.group(1)) % 12 + (12 if match.group(3).lower() == "pm" else 0)
+    tipoff = datetime(game_date.year, game_date.month, game_date.day, hour, int(match.group(2)), tzinfo=EASTERN)
+    return tipoff.astimezone().replace(tzinfo=None)
+
+
+class SlateBuildProgress:
+    """
+    Game results of one in-flight slate build, for streaming clients to follow
+
+    Every follower gets the games finished so far and then each new one as
+    the build completes it, so any number of clients share one build.
+    """
+
+    def __init__(self):
+        self.games: List[Dict] = []
+        self.finished = False
+        self.error: Optional[str] = None
+        self._changed = asyncio.Event()
+
+    def _notify(self):
+        # Wake the current followers; later waits use a fresh event
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def add(self, game_result: Dict):
+        self.games.append(game_result)
+        self._notify()
+
+    def finish(self, error: Optional[str] = None):
+        self.finished = True
+        self.error = error
+        self._notify()
+
+    async def follow(self) -> AsyncIterator[Dict]:
+        """Each game result (players with baselines) in completion order, until the build ends"""
+        sent = 0
+        while True:
+            changed = self._changed
+            while sent < len(self.games):
+                yield self.games[sent]
+                sent += 1
+            if self.finished:
+                if self.error:
+                    raise RuntimeError(f"Slate build failed: {self.error}")
+                return
+            if sent == len(self.games):
+                await changed.wait()
+
 
 class CacheWarmer:
-    """Service to pre-fetch and cache player data"""
-    
+    """
+    Background scheduler that keeps today's and tomorrow's slates warm
+
+    - Slates (popular players, prop lines and baseline simulation
+      distributions) are built off the request path and keyed by date
+    - Requests never wait for a rebuild: a stale slate is served while it
+      is rebuilt in the background (stale-while-revalidate). Only a cold
+      slate waits for its build, up to settings.slate_timeout
+    - Rebuilds run every refresh interval, and additionally shortly before
+      each of today's tip-offs
+    """
+
+    DAYS = ("today", "tomorrow")
+
     def __init__(self):
-        self.cache: Dict[str, Dict] = {}
-        self.cache_ttl = 300  # 5 minutes in seconds
+        self.cache: Dict[str, List[Dict]] = {}
+        self.cache_ttl = settings.slate_cache_ttl
+        self.refresh_interval = settings.slate_refresh_interval
         self.last_fetch_time: Dict[str, datetime] = {}
+        self.build_durations: Dict[str, float] = {}
+        self.build_errors: Dict[str, str] = {}
+        self.game_statuses: Dict[str, Dict[str, str]] = {}
+        self.next_run: Dict[str, datetime] = {}
         self.warmup_complete = False
-        
+
+        self._builds: Dict[str, asyncio.Task] = {}
+        self._progress: Dict[str, SlateBuildProgress] = {}
+        self._scheduler: Optional[asyncio.Task] = None
+
+    def _date_key(self, day: str) -> str:
+        date = datetime.now() + timedelta(days=1 if day == "tomorrow" else 0)
+        return date.strftime("%Y-%m-%d")
+
     def is_cache_valid(self, key: str) -> bool:
         """Check if cached data is still valid"""
         if key not in self.last_fetch_time:
             return False
-        
+
         elapsed = (datetime.now() - self.last_fetch_time[key]).total_seconds()
         return elapsed < self.cache_ttl
-    
-    async def get_today_players(self) -> List[Dict]:
-        """Get today's players (from cache if valid, otherwise fetch)"""
-        cache_key = "today"
-        
-        if self.is_cache_valid(cache_key) and cache_key in self.cache:
-            logger.info("📦 Returning cached data for today's players")
-            return self.cache[cache_key]
-        
-        logger.info("🔄 Fetching fresh data for today's players...")
-        players = await popular_players_service.get_popular_players_for_today()
-        
-        self.cache[cache_key] = players
-        self.last_fetch_time[cache_key] = datetime.now()
-        
-        logger.info(f"✅ Cached {len(players)} players for today")
-        return players
-    
-    async def get_tomorrow_players(self) -> List[Dict]:
-        """Get tomorrow's players (from cache if valid, otherwise fetch)"""
-        cache_key = "tomorrow"
-        
-        if self.is_cache_valid(cache_key) and cache_key in self.cache:
-            logger.info("📦 Returning cached data for tomorrow's players")
-            return self.cache[cache_key]
-        
-        logger.info("🔄 Fetching fresh data for tomorrow's players...")
-        players = await popular_players_service.get_popular_players_for_tomorrow()
-        
-        self.cache[cache_key] = players
-        self.last_fetch_time[cache_key] = datetime.now()
-        
-        logger.info(f"✅ Cached {len(players)} players for tomorrow")
+
+    def get_slate(self, day: str) -> Dict:
+        """
+        Current slate for "today" or "tomorrow" without waiting for a build
+
+        status is "ready", "stale" (served while a rebuild runs) or
+        "building" (no slate yet - players is empty). error is the last
+        build's error, if it failed.
+        """
+        key = self._date_key(day)
+
+        if key not in self.cache:
+            self._start_build(day)
+            return {
+                "date": key, "status": "building", "players": [], "age_seconds": None,
+                "error": self.build_errors.get(key)
+            }
+
+        status = "ready"
+        if not self.is_cache_valid(key):
+            status = "stale"
+            self._start_build(day)
+
+        return {
+            "date": key,
+            "status": status,
+            "players": self.cache[key],
+            "age_seconds": round((datetime.now() - self.last_fetch_time[key]).total_seconds(), 1),
+            "error": self.build_errors.get(key)
+        }
+
+    async def wait_for_slate(self, day: str, timeout: Optional[float] = None) -> Dict:
+        """
+        Like get_slate, but a cold slate waits for its build
+
+        Waits at most timeout seconds (default settings.slate_timeout) and
+        then returns status "building"; a failed build returns status
+        "error" with the build's error.
+        """
+        slate = self.get_slate(day)
+        if slate["status"] != "building":
+            return slate
+
+        try:
+            await asyncio.wait_for(
+                asyncio.shield(self._builds[day]),
+                settings.slate_timeout if timeout is None else timeout
+            )
+        except asyncio.TimeoutError:
+            return slate
+        except Exception:
+            pass  # Recorded in build_errors
+
+        key = slate["date"]
+        if key not in self.cache:
+            return {**slate, "status": "error", "error": self.build_errors.get(key, "slate build failed")}
+        return self.get_slate(day)
+
+    def _start_build(self, day: str) -> asyncio.Task:
+        """Start a background build for day unless one is already running"""
+        progress = SlateBuildProgress()
+        task = single_flight.start(("slate", day), lambda: self._build_slate(day, progress))
+        if self._builds.get(day) is not task:
+            # A new build (otherwise the running one and its progress are kept)
+            self._builds[day] = task
+            self._progress[day] = progress
+        return task
+
+    def build_progress(self, day: str) -> Optional[SlateBuildProgress]:
+        """Progress of day's in-flight build (None if no build is running)"""
+        task = self._builds.get(day)
+        if task is None or task.done():
+            return None
+        return self._progress.get(day)
+
+    async def _build_slate(self, day: str, progress: SlateBuildProgress) -> List[Dict]:
+        """
+        Build and cache one day's slate (players, lines, baseline distributions)
+
+        Each game's players get their baselines as soon as the game is
+        built, and the game is published to progress for streaming clients.
+        """
+        key = self._date_key(day)
+        start_time = time.monotonic()
+        logger.info(f"🔄 Building slate for {day} ({key})...")
+
+        try:
+            game_results = []
+            async for game_result in popular_players_service.iter_slate(day):
+                for player in game_result["players"]:
+                    player["baseline"] = await self.baseline_distribution(
+                        player, is_home=player["team"] == game_result["home_team"]
+                    )
+                game_results.append(game_result)
+                progress.add(game_result)
+            game_results.sort(key=lambda game_result: game_result["index"])
+
+            players = [player for game_result in game_results for player in game_result["players"]]
+
+            self.cache[key] = players
+            self.last_fetch_time[key] = datetime.now()
+            self.build_durations[key] = round(time.monotonic() - start_time, 2)
+            self.game_statuses[key] = {
+                game_result["matchup"]: game_result["status"] for game_result in game_results
+            }
+            self.build_errors.pop(key, None)
+            self._prune()
+
+            logger.info(f"✅ Cached {len(players)} players for {day} in {self.build_durations[key]}s")
+            progress.finish()
+        except asyncio.CancelledError:
+            progress.finish(error="cancelled")
+            raise
+        except Exception as e:
+            progress.finish(error=str(e))
+            self.build_errors[key] = str(e)
+            logger.error(f"❌ Failed to build slate for {day}: {e}")
+            # Retry sooner than a regular refresh
+            self.next_run[day] = datetime.now() + timedelta(seconds=min(self.refresh_interval, 300))
+            raise
+
+        self.next_run[day] = await self._next_run_time(day)
         return players
-    
-    async def warmup_cache(self):
-        """Pre-fetch today's and tomorrow's players on server startup"""
-        logger.info("🔥 Starting cache warmup...")
-        
+
+    def _prune(self):
+        """Drop slates for dates that are no longer today or tomorrow"""
+        current = {self._date_key(day) for day in self.DAYS}
+        for key in [key for key in self.cache if key not in current]:
+            for store in (self.cache, self.last_fetch_time, self.build_durations, self.game_statuses):
+                store.pop(key, None)
+
+    async def baseline_distribution(self, player: Dict, is_home: bool) -> Dict[str, Dict]:
+        """Over probabilities and percentiles for each of a player's prop lines"""
         try:
-            # Fetch both today and tomorrow in parallel
-            today_task = asyncio.create_task(self.get_today_players())
-            tomorrow_task = asyncio.create_task(self.get_tomorrow_players())
-            
-            today_players, tomorrow_players = await asyncio.gather(
-                today_task,
-                tomorrow_task,
-                return_exceptions=True
+            season_avg = await nba_stats_service.get_player_season_averages(player["player_id"])
+            recent_games = await nba_stats_service.get_player_game_log(player["player_id"], last_n_games=10)
+            if not season_avg:
+                return {}
+
+            batch = game_simulator.simulate_batch(
+                season_avg, recent_games,
+                num_simulations=settings.slate_baseline_simulations,
+                is_home=is_home
             )
-            
-            # Check for errors
-            if isinstance(today_players, Exception):
-                logger.error(f"❌ Failed to fetch today's players: {today_players}")
-            else:
-                logger.info(f"✅ Warmed up cache with {len(today_players)} players for today")
-            
-            if isinstance(tomorrow_players, Exception):
-                logger.error(f"❌ Failed to fetch tomorrow's players: {tomorrow_players}")
-            else:
-                logger.info(f"✅ Warmed up cache with {len(tomorrow_players)} players for tomorrow")
-            
-            self.warmup_complete = True
-            logger.info("🎉 Cache warmup complete!")
-            
         except Exception as e:
-            logger.error(f"❌ Cache warmup failed: {e}")
-            self.warmup_complete = False
-    
-    async def refresh_cache_periodically(self, interval_seconds: int = 300):
-        """Background task to refresh cache every X seconds"""
-        logger.info(f"🔄 Starting periodic cache refresh (every {interval_seconds}s)")
-        
+            logger.warning(f"Baseline simulation failed for {player.get('player_name')}: {e}")
+            return {}
+
+        baseline = {}
+        for prop, line in player.get("prizepicks_lines", {}).items():
+            field = BASELINE_STATS.get(prop)
+            if not field:
+                continue
+            values = batch[field]
+            p10, p50, p90 = np.percentile(values, [10, 50, 90])
+            baseline[prop] = {
+                "line": line,
+                "mean": round(float(values.mean()), 1),
+                "over_probability": round(float((values > line).mean()), 3),
+                "p10": float(p10),
+                "p50": float(p50),
+                "p90": float(p90)
+            }
+        return baseline
+
+    async def _next_run_time(self, day: str) -> datetime:
+        """Next rebuild: the refresh interval, or earlier to land just before a tip-off"""
+        now = datetime.now()
+        next_run = now + timedelta(seconds=self.refresh_interval)
+
+        if day == "today":
+            try:
+                games = await schedule_service.get_todays_games()
+            except Exception:
+                games = []
+            for game in games:
+                tipoff = parse_tipoff(game)
+                if tipoff is None:
+                    continue
+                for lead in PRE_TIPOFF_REFRESHES:
+                    run_at = tipoff - lead
+                    if now < run_at < next_run:
+                        next_run = run_at
+
+        # A new day starts a new slate
+        midnight = datetime(now.year, now.month, now.day) + timedelta(days=1, minutes=1)
+        return min(next_run, midnight)
+
+    async def _run_scheduler(self):
+        """Rebuild each day's slate when its next run time comes up"""
+        logger.info(f"🗓️  Slate scheduler started (refresh every {self.refresh_interval}s, aligned to tip-offs)")
+
         while True:
             try:
-                await asyncio.sleep(interval_seconds)
-                logger.info("🔄 Refreshing cache...")
-                await self.warmup_cache()
+                now = datetime.now()
+                for day in self.DAYS:
+                    if self.next_run.get(day, now) <= now:
+                        self.next_run[day] = now + timedelta(seconds=self.refresh_interval)
+                        self._start_build(day)
+
+                wake_at = min(self.next_run.values())
+                await asyncio.sleep(min(max((wake_at - datetime.now()).total_seconds(), 1), 60))
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
-                logger.error(f"❌ Periodic cache refresh failed: {e}")
-    
+                logger.error(f"❌ Slate scheduler error: {e}")
+                await asyncio.sleep(60)
+
+    def start(self):
+        """Start the background scheduler (first builds run immediately)"""
+        if self._scheduler is None or self._scheduler.done():
+            self._scheduler = asyncio.create_task(self._run_scheduler())
+
+    async def stop(self):
+        """Stop the scheduler and any running builds"""
+        tasks = list(self._builds.values())
+        if self._scheduler is not None:
+            tasks.append(self._scheduler)
+            self._scheduler = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._builds.clear()
+        self._progress.clear()
+
+    async def warmup_cache(self):
+        """Build today's and tomorrow's slates now and wait for them"""
+        logger.info("🔥 Starting cache warmup...")
+
+        # Fetch both today and tomorrow in parallel
+        results = await asyncio.gather(
+            *[self._start_build(day) for day in self.DAYS],
+            return_exceptions=True
+        )
+
+        # Check for errors
+        for day, result in zip(self.DAYS, results):
+            if isinstance(result, BaseException):
+                logger.error(f"❌ Failed to fetch {day}'s players: {result}")
+            else:
+                logger.info(f"✅ Warmed up cache with {len(result)} players for {day}")
+
+        self.warmup_complete = not any(isinstance(result, BaseException) for result in results)
+        logger.info("🎉 Cache warmup complete!")
+
     def clear_cache(self):
         """Manually clear the cache"""
         self.cache.clear()
         self.last_fetch_time.clear()
         self.warmup_complete = False
         logger.info("🧹 Cache cleared")
-    
+
     def get_cache_stats(self) -> Dict:
         """Get cache statistics"""
         stats = {
             "warmup_complete": self.warmup_complete,
             "cache_ttl_seconds": self.cache_ttl,
+            "refresh_interval_seconds": self.refresh_interval,
+            "scheduler_running": self._scheduler is not None and not self._scheduler.done(),
+            "building": [day for day, task in self._builds.items() if not task.done()],
+            "next_runs": {day: run_at.isoformat(timespec="seconds") for day, run_at in self.next_run.items()},
             "cached_keys": list(self.cache.keys()),
             "cache_ages": {}
         }
-        
+
         for key, last_fetch in self.last_fetch_time.items():
             age_seconds = (datetime.now() - last_fetch).total_seconds()
             stats["cache_ages"][key] = {
                 "age_seconds": round(age_seconds, 2),
                 "is_valid": age_seconds < self.cache_ttl,
-                "players_count": len(self.cache.get(key, []))
+                "players_count": len(self.cache.get(key, [])),
+                "build_seconds": self.build_durations.get(key),
+                "game_statuses": self.game_statuses.get(key, {})
             }
-        
+
+        if self.build_errors:
+            stats["build_errors"] = dict(self.build_errors)
+
         return stats
 
 
@@ -0,0 +1,111 @@
+"""
+Event Stream - Stream long-running endpoint results as SSE or NDJSON
+"""
+import asyncio
+import json
+import logging
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Literal
+
+from fastapi.responses import StreamingResponse
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+StreamFormat = Literal["sse", "ndjson"]
+
+MEDIA_TYPES = {
+    "sse": "text/event-stream",
+    "ndjson": "application/x-ndjson",
+}
+
+# Sentinel queued by the producer task when it is finished
+_DONE = object()
+
+
+class EventStream:
+    """
+    Bounded buffer between a producer and a slow HTTP client
+
+    The producer awaits emit(); once max_buffered events are waiting to be
+    sent, emit() blocks until the client reads more, so a slow client
+    pauses the work instead of the whole result piling up in memory.
+    """
+
+    def __init__(self, max_buffered: int):
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_buffered)
+
+    async def emit(self, event: str, data: Dict[str, Any]):
+        """Queue an event, waiting while the buffer is full"""
+        await self._queue.put((event, data))
+
+
+def _encode(event: str, data: Dict[str, Any], format: StreamFormat) -> str:
+    if format == "sse":
+        return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+    return json.dumps({"type": event, **data}, default=str) + "\n"
+
+
+def _heartbeat(format: StreamFormat) -> str:
+    # SSE comments are ignored by EventSource clients
+    if format == "sse":
+        return ": keep-alive\n\n"
+    return json.dumps({"type": "heartbeat"}) + "\n"
+
+
+async def _iter_stream(
+    producer: Callable[[EventStream], Awaitable[None]],
+    format: StreamFormat
+) -> AsyncIterator[str]:
+    stream = EventStream(settings.stream_buffer_size)
+
+    async def run():
+        try:
+            await producer(stream)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"❌ Stream producer failed: {e}")
+            await stream.emit("error", {"error": str(e)})
+        await stream._queue.put(_DONE)
+
+    task = asyncio.create_task(run())
+    try:
+        while True:
+            try:
+                item = await asyncio.wait_for(stream._queue.get(), timeout=settings.stream_heartbeat_interval)
+            except asyncio.TimeoutError:
+                # Keep proxies from closing an idle connection
+                yield _heartbeat(format)
+                continue
+
+            if item is _DONE:
+                break
+            yield _encode(*item, format)
+    finally:
+        # Client disconnected (or stream finished) - stop the work
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
+def stream_response(
+    producer: Callable[[EventStream], Awaitable[None]],
+    format: StreamFormat = "sse"
+) -> StreamingResponse:
+    """
+    Response that runs producer(stream) and sends each emitted event as it comes
+
+    format "sse" sends `event: <name>` / `data: <json>` frames, "ndjson"
+    sends one {"type": <name>, ...} object per line. An exception in the
+    producer is sent as an "error" event, and a heartbeat goes out whenever
+    nothing was sent for settings.stream_heartbeat_interval seconds.
+    """
+    return StreamingResponse(
+        _iter_stream(producer, format),
+        media_type=MEDIA_TYPES[format],
+        headers={
+            "Cache-Control": "no-cache",
+            # Ask reverse proxies not to buffer the stream
+            "X-Accel-Buffering": "no"
+        }
+    )
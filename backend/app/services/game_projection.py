@@ -0,0 +1,199 @@
+"""
+Game Projection Service - Project every rotation player in a game with one batched simulation
+"""
+import asyncio
+import logging
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.models import GameStats, SeasonAverages
+from app.services.nba_stats import nba_stats_service
+from app.services.random_streams import derive_seed, resolve_seed
+from app.services.schedule import schedule_service
+from app.services.simulation_pool import simulation_pool
+
+logger = logging.getLogger(__name__)
+
+# Stats projected for each player
+PROJECTED_STATS = ['points', 'rebounds', 'assists', 'steals', 'blocks']
+
+
+class GameProjectionService:
+    """
+    Projected stats for the rotation players on both teams of a game
+
+    - Both rosters, then every player's season averages and game log, are
+      fetched concurrently (through the shared cache, store and
+      single-flight layers, so rosters and player data are reused)
+    - All players of a game are simulated in one batched draw, through
+      simulation_pool (inline or sharded across processes)
+    - iter_games projects several games at once and yields each one as soon
+      as it is done
+    """
+
+    def __init__(self, rotation_size: int = 10):
+        self.rotation_size = rotation_size
+
+    async def find_game(self, game_id: str) -> Optional[Dict]:
+        """Today's or tomorrow's game with this id"""
+        today_games, tomorrow_games = await asyncio.gather(
+            schedule_service.get_todays_games(),
+            schedule_service.get_tomorrows_games()
+        )
+        return next((game for game in today_games + tomorrow_games if game['game_id'] == game_id), None)
+
+    async def project_game(
+        self,
+        game: Dict,
+        num_simulations: int,
+        backend: Optional[str] = None,
+        seed: Optional[int] = None
+    ) -> Dict:
+        """
+        Projections for a game's rotation players
+
+        Same shape as the simulate-all-players response: game_info,
+        home_team_players, away_team_players and simulation_summary.
+        Players without season averages are left out. backend overrides
+        settings.simulation_backend for this game; the seed used is
+        returned in simulation_summary and replays the same projection.
+        """
+        seed = resolve_seed(seed)
+        home_roster, away_roster = await asyncio.gather(
+            schedule_service.get_team_roster(game['home_team_id']),
+            schedule_service.get_team_roster(game['away_team_id'])
+        )
+        entries = (
+            [(player, game['home_team'], True) for player in home_roster[:self.rotation_size]] +
+            [(player, game['away_team'], False) for player in away_roster[:self.rotation_size]]
+        )
+
+        player_data = await asyncio.gather(*(self._fetch_player(player) for player, _, _ in entries))
+        simulated = [
+            (entry, data) for entry, data in zip(entries, player_data) if data is not None
+        ]
+
+        # One vectorized draw for every player in the game
+        batches = await simulation_pool.simulate_players(
+            [(season_avg, recent_games, is_home) for (_, _, is_home), (season_avg, recent_games) in simulated],
+            num_simulations=num_simulations,
+            seed=seed,
+            backend=backend
+        )
+
+        home_simulations = []
+        away_simulations = []
+        for ((player, team, is_home), (season_avg, _)), batch in zip(simulated, batches):
+            projection = {
+                'player_name': player['player_name'],
+                'player_id': player['player_id'],
+                'position': player['position'],
+                'team': team,
+                'is_home': is_home,
+                'projected_stats': batch.means(PROJECTED_STATS),
+                'season_averages': {
+                    'points': season_avg.points_per_game,
+                    'rebounds': season_avg.rebounds_per_game,
+                    'assists': season_avg.assists_per_game,
+                    'steals': season_avg.steals_per_game,
+                    'blocks': season_avg.blocks_per_game
+                }
+            }
+            (home_simulations if is_home else away_simulations).append(projection)
+
+        # Calculate team totals
+        home_total_pts = sum(p['projected_stats']['points'] for p in home_simulations)
+        away_total_pts = sum(p['projected_stats']['points'] for p in away_simulations)
+
+        return {
+            'game_info': {
+                'game_id': game['game_id'],
+                'game_date': game['game_date_str'],
+                'home_team': game['home_team'],
+                'away_team': game['away_team'],
+                'home_team_name': game['home_team_name'],
+                'away_team_name': game['away_team_name'],
+                'matchup': game['matchup'],
+                'game_status': game['game_status']
+            },
+            'home_team_players': home_simulations,
+            'away_team_players': away_simulations,
+            'simulation_summary': {
+                'num_simulations': num_simulations,
+                'seed': seed,
+                'home_team_projected_points': round(home_total_pts, 1),
+                'away_team_projected_points': round(away_total_pts, 1),
+                'projected_winner': game['home_team'] if home_total_pts > away_total_pts else game['away_team'],
+                'point_differential': abs(round(home_total_pts - away_total_pts, 1)),
+                'total_players_simulated': len(home_simulations) + len(away_simulations)
+            }
+        }
+
+    async def _fetch_player(self, player: Dict) -> Optional[Tuple[SeasonAverages, List[GameStats]]]:
+        """Season averages and last 5 games for a roster player (None to skip the player)"""
+        try:
+            season_avg, recent_games = await asyncio.gather(
+                nba_stats_service.get_player_season_averages(player['player_id']),
+                nba_stats_service.get_player_game_log(player['player_id'], last_n_games=5)
+            )
+        except Exception as e:
+            logger.warning(f"Error fetching {player['player_name']}: {e}")
+            return None
+
+        if not season_avg:
+            return None
+        return season_avg, recent_games or []
+
+    async def iter_games(
+        self,
+        games: List[Dict],
+        num_simulations: int,
+        backend: Optional[str] = None,
+        seed: Optional[int] = None
+    ) -> AsyncIterator[Dict]:
+        """
+        Project games concurrently and yield one result per game as it completes
+
+        At most settings.projection_max_concurrency games run at a time.
+        Each result has index (position in games), game_id, matchup,
+        status ("complete" or "failed"), projection (None if failed), error
+        and elapsed_seconds. Game i is projected with the child seed
+        derive_seed(seed, i), so a slate run replays from one seed and each
+        game from its own (simulation_summary.seed).
+        """
+        seed = resolve_seed(seed)
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
+        semaphore = asyncio.Semaphore(settings.projection_max_concurrency)
+
+        async def run(index: int, game: Dict) -> Dict:
+            async with semaphore:
+                return await self.project_game(game, num_simulations, backend, derive_seed(seed, index))
+
+        tasks = {asyncio.create_task(run(index, game)): (index, game) for index, game in enumerate(games)}
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    index, game = tasks[task]
+                    error = task.exception()
+                    if error is not None:
+                        logger.error(f"❌ Error simulating game {game['game_id']}: {error}")
+                    yield {
+                        "index": index,
+                        "game_id": game['game_id'],
+                        "matchup": game.get('matchup', f"{game['away_team']} @ {game['home_team']}"),
+                        "status": "failed" if error is not None else "complete",
+                        "projection": None if error is not None else task.result(),
+                        "error": str(error) if error is not None else None,
+                        "elapsed_seconds": round(loop.time() - start_time, 2)
+                    }
+        finally:
+            # Consumer stopped early (e.g. client disconnected)
+            for task in pending:
+                task.cancel()
+
+
+# Global instance
+game_projection_service = GameProjectionService()
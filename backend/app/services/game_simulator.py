@@ -1,17 +1,41 @@
 """
 Game Simulation Service - Simulates NBA games and player performances
 """
-import random
 import numpy as np
+from scipy import special
 from typing import List, Dict, Optional, Tuple, Any
 from datetime import datetime, timedelta
 from app.models import (
     GameStats, SeasonAverages, PropType, BetType, PlayerInfo
 )
+from app.services.simulation_batch import SimulationBatch
 import logging
 
 logger = logging.getLogger(__name__)
 
+# GameStats field (and simulate_batch column) for each simulated prop type
+BATCH_STAT_FIELDS = {
+    PropType.POINTS: "points",
+    PropType.REBOUNDS: "rebounds",
+    PropType.ASSISTS: "assists",
+    PropType.STEALS: "steals",
+    PropType.BLOCKS: "blocks",
+    PropType.THREES_MADE: "three_pointers_made",
+    PropType.TURNOVERS: "turnovers",
+    PropType.FREE_THROWS_MADE: "free_throws_made",
+    PropType.FANTASY_SCORE: "fantasy_score",
+}
+
+# Props drawn straight from the gamma model: (GameStats field, SeasonAverages field)
+GAMMA_PROP_STATS = {
+    PropType.POINTS: ("points", "points_per_game"),
+    PropType.REBOUNDS: ("rebounds", "rebounds_per_game"),
+    PropType.ASSISTS: ("assists", "assists_per_game"),
+    PropType.STEALS: ("steals", "steals_per_game"),
+    PropType.BLOCKS: ("blocks", "blocks_per_game"),
+    PropType.TURNOVERS: ("turnovers", "turnovers_per_game"),
+}
+
 
 class GameSimulator:
     """
@@ -50,23 +74,21 @@ class GameSimulator:
         season_averages: SeasonAverages,
         recent_games: List[GameStats],
         opponent: Optional[str] = None,
-        is_home: bool = True
+        is_home: bool = True,
+        rng: Optional[np.random.Generator] = None
     ) -> GameStats:
         """
         Simulate a single game for a player
         
+        Draws come from rng (random_streams.make_rng for a reproducible
+        game), or a fresh unseeded generator.
+        
         Returns a GameStats object with simulated performance
         """
+        rng = np.random.default_rng() if rng is None else rng
         try:
-            # Analyze recent form
-            form_assessment = self._assess_player_form(recent_games)
-            streak_modifier = self.streak_modifiers.get(form_assessment, 1.0)
-            
-            # Home court advantage (small boost)
-            home_modifier = 1.05 if is_home else 0.98
-            
-            # Combined modifier
-            total_modifier = streak_modifier * home_modifier
+            # Combined streak and home court modifier
+            total_modifier = self._game_modifier(recent_games, is_home)
             
             # Simulate each stat
             simulated_stats = {
@@ -75,6 +97,7 @@ class GameSimulator:
                     recent_games,
                     "points",
                     total_modifier,
+                    rng,
                     PropType.POINTS
                 ),
                 "rebounds": self._simulate_stat(
@@ -82,6 +105,7 @@ class GameSimulator:
                     recent_games,
                     "rebounds",
                     total_modifier,
+                    rng,
                     PropType.REBOUNDS
                 ),
                 "assists": self._simulate_stat(
@@ -89,6 +113,7 @@ class GameSimulator:
                     recent_games,
                     "assists",
                     total_modifier,
+                    rng,
                     PropType.ASSISTS
                 ),
                 "steals": self._simulate_stat(
@@ -96,6 +121,7 @@ class GameSimulator:
                     recent_games,
                     "steals",
                     total_modifier,
+                    rng,
                     PropType.STEALS
                 ),
                 "blocks": self._simulate_stat(
@@ -103,6 +129,7 @@ class GameSimulator:
                     recent_games,
                     "blocks",
                     total_modifier,
+                    rng,
                     PropType.BLOCKS
                 ),
                 "turnovers": self._simulate_stat(
@@ -110,6 +137,7 @@ class GameSimulator:
                     recent_games,
                     "turnovers",
                     total_modifier,
+                    rng,
                     PropType.TURNOVERS
                 ),
             }
@@ -123,7 +151,7 @@ class GameSimulator:
             points = simulated_stats["points"]
             
             # Rough estimation of shot distribution
-            estimated_fta = max(0, int(random.gauss(points * 0.25, 2)))
+            estimated_fta = max(0, int(rng.normal(points * 0.25, 2)))
             simulated_stats["free_throws_made"] = int(estimated_fta * ft_pct)
             simulated_stats["free_throws_attempted"] = estimated_fta
             
@@ -133,7 +161,7 @@ class GameSimulator:
             
             # Estimate 3-pointers (varies by position/player style)
             avg_threes_per_game = self._estimate_threes_per_game(recent_games)
-            three_pt_made = max(0, int(random.gauss(avg_threes_per_game * total_modifier, avg_threes_per_game * 0.4)))
+            three_pt_made = max(0, int(rng.normal(avg_threes_per_game * total_modifier, avg_threes_per_game * 0.4)))
             three_pt_attempted = int(three_pt_made / three_pt_pct) if three_pt_pct > 0 and three_pt_made > 0 else three_pt_made * 3
             
             simulated_stats["three_pointers_made"] = three_pt_made
@@ -148,7 +176,7 @@ class GameSimulator:
             simulated_stats["field_goals_attempted"] = two_pt_attempted + three_pt_attempted
             
             # Minutes played (usually between 28-38 for starters)
-            simulated_stats["minutes_played"] = random.gauss(
+            simulated_stats["minutes_played"] = rng.normal(
                 season_averages.minutes_per_game,
                 3.0
             )
@@ -162,7 +190,7 @@ class GameSimulator:
                 simulated_stats["blocks"] * 0.5 -
                 simulated_stats["turnovers"] * 0.5
             )
-            simulated_stats["plus_minus"] = int(random.gauss(performance_score * 0.3, 8))
+            simulated_stats["plus_minus"] = int(rng.normal(performance_score * 0.3, 8))
             
             # Create simulated game
             game_date = datetime.now() + timedelta(days=1)  # Future game
@@ -195,23 +223,142 @@ class GameSimulator:
         recent_games: List[GameStats],
         num_simulations: int = 100,
         opponent: Optional[str] = None,
-        is_home: bool = True
+        is_home: bool = True,
+        rng: Optional[np.random.Generator] = None
     ) -> List[GameStats]:
         """
         Run multiple simulations to get a distribution of outcomes
+        
+        Draws are made by the vectorized engine (simulate_batch); GameStats
+        objects are only built here, for callers that need individual games.
         """
-        simulations = []
-        for _ in range(num_simulations):
-            sim_game = self.simulate_player_game(
-                player_info,
-                season_averages,
-                recent_games,
-                opponent,
-                is_home
-            )
-            simulations.append(sim_game)
+        batch = self.simulate_batch(
+            season_averages,
+            recent_games,
+            num_simulations=num_simulations,
+            is_home=is_home,
+            rng=rng
+        )
+        
+        logger.info(f"Simulated {num_simulations} games for {player_info.full_name}: "
+                   f"{batch['points'].mean():.1f} pts, {batch['rebounds'].mean():.1f} reb, "
+                   f"{batch['assists'].mean():.1f} ast on average")
+        
+        return batch.to_game_stats(player_info, opponent, is_home)
+    
+    def simulate_batch(
+        self,
+        season_averages: SeasonAverages,
+        recent_games: List[GameStats],
+        num_simulations: int = 1000,
+        is_home: bool = True,
+        rng: Optional[np.random.Generator] = None
+    ) -> SimulationBatch:
+        """
+        Vectorized Monte Carlo engine - simulate num_simulations games at once
+        
+        Uses the same model as simulate_player_game, but every stat is drawn
+        for all simulations in a single NumPy call.
+        
+        Returns a SimulationBatch: one array of length num_simulations per
+        GameStats stat field, plus vectorized fantasy score and combos.
+        """
+        return self.simulate_players_batch(
+            [(season_averages, recent_games, is_home)],
+            num_simulations=num_simulations,
+            rng=rng
+        )[0]
+    
+    def simulate_players_batch(
+        self,
+        players: List[Tuple[SeasonAverages, List[GameStats], bool]],
+        num_simulations: int = 1000,
+        rng: Optional[np.random.Generator] = None
+    ) -> List[SimulationBatch]:
+        """
+        simulate_batch for many players in one pass
+        
+        players is a list of (season_averages, recent_games, is_home). Each
+        stat is drawn for every player and simulation in a single NumPy call
+        on a (players, num_simulations) matrix, so a whole game's rotation
+        costs about as much as one player.
+        
+        Draws come from rng (random_streams.make_rng for reproducible runs,
+        seeded shards in simulation_pool), or a fresh unseeded generator.
+        
+        Returns one SimulationBatch per player, in order.
+        """
+        rng = np.random.default_rng() if rng is None else rng
+        n = int(num_simulations)
+        size = (len(players), n)
+        if not players:
+            return []
+        
+        def column(values) -> np.ndarray:
+            """Per-player values as a (players, 1) column that broadcasts over simulations"""
+            return np.asarray(values, dtype=float).reshape(-1, 1)
+        
+        modifiers = [self._game_modifier(recent_games, is_home) for _, recent_games, is_home in players]
+        
+        batch = {
+            stat_name: self._simulate_stat_matrix(players, modifiers, prop_type, n, rng)
+            for prop_type, (stat_name, _) in GAMMA_PROP_STATS.items()
+        }
+        
+        fg_pct = column([season_averages.field_goal_percentage for season_averages, _, _ in players])
+        three_pt_pct = column([season_averages.three_point_percentage for season_averages, _, _ in players])
+        ft_pct = column([season_averages.free_throw_percentage for season_averages, _, _ in players])
+        points = batch["points"]
+        
+        # Free throws (same shot-distribution estimate as simulate_player_game)
+        fta = np.maximum(0, np.trunc(rng.normal(points * 0.25, 2, size=size))).astype(np.int64)
+        ftm = np.floor(fta * ft_pct).astype(np.int64)
+        field_goal_points = points - ftm
+        
+        # 3-pointers
+        avg_threes = column([self._estimate_threes_per_game(recent_games) for _, recent_games, _ in players])
+        threes_made = np.maximum(
+            0, np.trunc(rng.normal(avg_threes * column(modifiers), avg_threes * 0.4, size=size))
+        ).astype(np.int64)
+        threes_attempted = np.where(
+            (three_pt_pct > 0) & (threes_made > 0),
+            np.trunc(threes_made / np.where(three_pt_pct > 0, three_pt_pct, 1.0)),
+            threes_made * 3
+        ).astype(np.int64)
+        
+        # 2-pointers
+        two_pt_made = np.maximum(0, (field_goal_points - threes_made * 3) // 2)
+        two_pt_attempted = np.where(
+            fg_pct > 0,
+            np.trunc(two_pt_made / np.where(fg_pct > 0, fg_pct, 1.0)),
+            two_pt_made * 2
+        ).astype(np.int64)
+        
+        batch["free_throws_made"] = ftm
+        batch["free_throws_attempted"] = fta
+        batch["three_pointers_made"] = threes_made
+        batch["three_pointers_attempted"] = threes_attempted
+        batch["field_goals_made"] = two_pt_made + threes_made
+        batch["field_goals_attempted"] = two_pt_attempted + threes_attempted
+        batch["minutes_played"] = rng.normal(
+            column([season_averages.minutes_per_game for season_averages, _, _ in players]), 3.0, size=size
+        )
         
-        return simulations
+        performance_score = (
+            batch["points"] * 0.5 +
+            batch["rebounds"] * 0.3 +
+            batch["assists"] * 0.3 +
+            batch["steals"] * 0.5 +
+            batch["blocks"] * 0.5 -
+            batch["turnovers"] * 0.5
+        )
+        batch["plus_minus"] = np.trunc(rng.normal(performance_score * 0.3, 8, size=size)).astype(np.int64)
+        
+        # Row i of every matrix is player i's batch
+        return [
+            SimulationBatch(**{field: values[i] for field, values in batch.items()})
+            for i in range(len(players))
+        ]
     
     def simulate_bet_outcome(
         self,
@@ -221,37 +368,53 @@ class GameSimulator:
         prop_type: PropType,
         line: float,
         bet_type: BetType,
-        num_simulations: int = 100
+        num_simulations: int = 100,
+        is_home: bool = True,
+        method: str = "auto",
+        rng: Optional[np.random.Generator] = None
     ) -> Dict[str, Any]:
         """
         Simulate bet outcomes and return win probability
+        
+        rng seeds the Monte Carlo draws (the analytic method draws nothing).
+        
+        method:
+            "analytic" - exact probabilities from the prop's discretized gamma
+                         distribution (single-stat props only, no sampling noise)
+            "monte_carlo" - num_simulations batched simulations
+            "auto" - analytic when the prop supports it, Monte Carlo otherwise
+                     (threes, free throws, fantasy score)
         """
-        simulations = self.simulate_multiple_games(
-            player_info,
+        if method != "monte_carlo":
+            cdf = self._prop_cdf(season_averages, recent_games, prop_type, is_home)
+            if cdf is not None:
+                return self._analytic_bet_outcome(cdf, line, bet_type)
+            if method == "analytic":
+                raise ValueError(f"No analytic distribution for {prop_type.value}, use Monte Carlo")
+        
+        batch = self.simulate_batch(
             season_averages,
             recent_games,
-            num_simulations=num_simulations
+            num_simulations=num_simulations,
+            is_home=is_home,
+            rng=rng
         )
         
         # Extract the relevant stat from each simulation
-        stat_values = []
-        for sim in simulations:
-            value = self._get_stat_value(sim, prop_type)
-            if value is not None:
-                stat_values.append(value)
+        stat_values = self._get_batch_stat_values(batch, prop_type)
         
         # Calculate win probability
         if bet_type == BetType.OVER:
-            wins = sum(1 for v in stat_values if v > line)
+            wins = int(np.count_nonzero(stat_values > line))
         else:  # UNDER
-            wins = sum(1 for v in stat_values if v < line)
+            wins = int(np.count_nonzero(stat_values < line))
         
-        win_probability = wins / len(stat_values) if stat_values else 0
+        win_probability = wins / len(stat_values) if len(stat_values) else 0
         
         # Calculate expected value
-        avg_result = np.mean(stat_values) if stat_values else 0
-        median_result = np.median(stat_values) if stat_values else 0
-        std_dev = np.std(stat_values) if stat_values else 0
+        avg_result = float(np.mean(stat_values)) if len(stat_values) else 0
+        median_result = float(np.median(stat_values)) if len(stat_values) else 0
+        std_dev = float(np.std(stat_values)) if len(stat_values) else 0
         
         return {
             "win_probability": round(win_probability, 3),
@@ -261,62 +424,123 @@ class GameSimulator:
             "line": line,
             "bet_type": bet_type.value,
             "simulations_run": len(stat_values),
-            "percentage_over": round(sum(1 for v in stat_values if v > line) / len(stat_values) * 100, 1) if stat_values else 0,
-            "percentage_under": round(sum(1 for v in stat_values if v < line) / len(stat_values) * 100, 1) if stat_values else 0,
-            "confidence_level": self._calculate_confidence(win_probability)
+            "percentage_over": round(float(np.mean(stat_values > line)) * 100, 1) if len(stat_values) else 0,
+            "percentage_under": round(float(np.mean(stat_values < line)) * 100, 1) if len(stat_values) else 0,
+            "confidence_level": self._calculate_confidence(win_probability),
+            "method": "monte_carlo"
+        }
+    
+    def _analytic_bet_outcome(self, cdf: np.ndarray, line: float, bet_type: BetType) -> Dict[str, Any]:
+        """simulate_bet_outcome result computed exactly from a _prop_cdf distribution"""
+        pmf = np.diff(cdf, prepend=0.0)
+        values = np.arange(len(pmf))
+        
+        prob_over = float(pmf[values > line].sum())
+        prob_under = float(pmf[values < line].sum())
+        win_probability = prob_over if bet_type == BetType.OVER else prob_under
+        
+        mean = float((values * pmf).sum())
+        std_dev = float(np.sqrt(((values - mean) ** 2 * pmf).sum()))
+        median = float(np.searchsorted(cdf, 0.5))
+        
+        return {
+            "win_probability": round(win_probability, 3),
+            "expected_value": round(mean, 2),
+            "median_result": round(median, 2),
+            "standard_deviation": round(std_dev, 2),
+            "line": line,
+            "bet_type": bet_type.value,
+            "simulations_run": 0,
+            "percentage_over": round(prob_over * 100, 1),
+            "percentage_under": round(prob_under * 100, 1),
+            "confidence_level": self._calculate_confidence(win_probability),
+            "method": "analytic"
         }
     
     def simulate_multi_leg_ticket(
         self,
         legs: List[Dict[str, Any]],
-        num_simulations: int = 100
+        num_simulations: int = 100,
+        same_player_correlation: float = 0.0,
+        same_game_correlation: float = 0.0,
+        rng: Optional[np.random.Generator] = None
     ) -> Dict[str, Any]:
         """
         Simulate a multi-leg parlay ticket
         
+        Each leg's prop distribution is computed once, then all legs x all
+        simulations are drawn as a single matrix. Legs on the same player or
+        in the same game can be correlated through a Gaussian copula; the
+        marginal distribution of every leg is unchanged by the correlation.
+        
         Args:
             legs: List of dicts with player_info, season_averages, recent_games, prop_type, line, bet_type
+                  (optional: is_home, game_id)
             num_simulations: Number of times to simulate the entire ticket
+            same_player_correlation: Correlation between legs on the same player
+            same_game_correlation: Correlation between legs in the same game
+            rng: Generator for the draws (fresh and unseeded if None)
         """
-        ticket_wins = 0
-        leg_results = {i: {"wins": 0, "losses": 0} for i in range(len(legs))}
+        n = int(num_simulations)
+        leg_hits, legs_hit_counts = self.ticket_hit_counts(
+            legs, n, same_player_correlation, same_game_correlation, rng=rng
+        )
+        return self.ticket_result(legs, leg_hits, legs_hit_counts)
+    
+    def ticket_hit_counts(
+        self,
+        legs: List[Dict[str, Any]],
+        num_simulations: int,
+        same_player_correlation: float = 0.0,
+        same_game_correlation: float = 0.0,
+        rng: Optional[np.random.Generator] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Draw num_simulations tickets and count hits
         
-        for _ in range(num_simulations):
-            all_legs_hit = True
-            
-            for idx, leg in enumerate(legs):
-                # Simulate one game for this leg
-                sim_game = self.simulate_player_game(
-                    leg["player_info"],
-                    leg["season_averages"],
-                    leg["recent_games"]
-                )
-                
-                # Check if this leg hits
-                actual_value = self._get_stat_value(sim_game, leg["prop_type"])
-                
-                if actual_value is None:
-                    all_legs_hit = False
-                    break
-                
-                if leg["bet_type"] == BetType.OVER:
-                    leg_hits = actual_value > leg["line"]
-                else:
-                    leg_hits = actual_value < leg["line"]
-                
-                if leg_hits:
-                    leg_results[idx]["wins"] += 1
-                else:
-                    leg_results[idx]["losses"] += 1
-                    all_legs_hit = False
-            
-            if all_legs_hit:
-                ticket_wins += 1
+        Returns (hits per leg, number of tickets hitting exactly k legs for
+        k = 0..len(legs)). Counts from independent shards add up, which is
+        how simulation_pool splits a large ticket across processes.
+        """
+        rng = np.random.default_rng() if rng is None else rng
+        n = int(num_simulations)
+        num_legs = len(legs)
+        
+        # Correlated uniforms: one column per leg
+        correlation = self._ticket_correlation_matrix(legs, same_player_correlation, same_game_correlation)
+        normals = rng.standard_normal((n, num_legs)) @ np.linalg.cholesky(correlation).T
+        uniforms = special.ndtr(normals)
+        
+        values = np.empty((n, num_legs))
+        player_batches = {}  # derived-stat legs on the same player share one batch
+        for idx, leg in enumerate(legs):
+            values[:, idx] = self._draw_leg_values(leg, uniforms[:, idx], player_batches, rng)
+        
+        lines = np.array([leg["line"] for leg in legs], dtype=float)
+        is_over = np.array([leg["bet_type"] == BetType.OVER for leg in legs])
+        
+        # NaN (e.g. missing fantasy score) never hits
+        hits = np.where(is_over, values > lines, values < lines)
+        
+        return hits.sum(axis=0), np.bincount(hits.sum(axis=1), minlength=num_legs + 1)
+    
+    def ticket_result(
+        self,
+        legs: List[Dict[str, Any]],
+        leg_hits: np.ndarray,
+        legs_hit_counts: np.ndarray
+    ) -> Dict[str, Any]:
+        """simulate_multi_leg_ticket response from (summed) ticket_hit_counts"""
+        num_legs = len(legs)
+        n = int(legs_hit_counts.sum())
+        leg_win_probs = leg_hits / n
+        legs_hit_counts = legs_hit_counts / n
+        ticket_win_probability = float(legs_hit_counts[num_legs])
         
         # Calculate individual leg probabilities
         leg_probabilities = []
-        for idx in range(len(legs)):
-            win_prob = leg_results[idx]["wins"] / num_simulations
+        for idx in range(num_legs):
+            win_prob = float(leg_win_probs[idx])
             leg_probabilities.append({
                 "leg_number": idx + 1,
                 "player": legs[idx]["player_info"].full_name,
@@ -327,27 +551,208 @@ class GameSimulator:
                 "hit_rate": f"{round(win_prob * 100, 1)}%"
             })
         
-        ticket_win_probability = ticket_wins / num_simulations
-        
         return {
             "ticket_win_probability": round(ticket_win_probability, 3),
             "ticket_hit_rate": f"{round(ticket_win_probability * 100, 1)}%",
             "expected_wins_per_100": int(ticket_win_probability * 100),
             "leg_probabilities": leg_probabilities,
-            "total_legs": len(legs),
-            "simulations_run": num_simulations,
-            "recommendation": self._get_ticket_recommendation(ticket_win_probability, len(legs))
+            "legs_hit_distribution": {
+                str(k): round(float(p), 4) for k, p in enumerate(legs_hit_counts)
+            },
+            "total_legs": num_legs,
+            "simulations_run": n,
+            "recommendation": self._get_ticket_recommendation(ticket_win_probability, num_legs)
         }
     
+    def _ticket_correlation_matrix(
+        self,
+        legs: List[Dict[str, Any]],
+        same_player_correlation: float,
+        same_game_correlation: float
+    ) -> np.ndarray:
+        """Leg correlation matrix for the ticket copula (clipped to positive definite)"""
+        num_legs = len(legs)
+        correlation = np.eye(num_legs)
+        
+        if same_player_correlation == 0 and same_game_correlation == 0:
+            return correlation
+        
+        for i in range(num_legs):
+            for j in range(i + 1, num_legs):
+                if legs[i]["player_info"].player_id == legs[j]["player_info"].player_id:
+                    rho = same_player_correlation
+                elif self._leg_game_key(legs[i]) == self._leg_game_key(legs[j]):
+                    rho = same_game_correlation
+                else:
+                    rho = 0.0
+                correlation[i, j] = correlation[j, i] = rho
+        
+        # Negative or inconsistent correlations can make the matrix indefinite
+        eigenvalues, eigenvectors = np.linalg.eigh(correlation)
+        if eigenvalues.min() < 1e-6:
+            eigenvalues = np.clip(eigenvalues, 1e-6, None)
+            correlation = eigenvectors @ np.diag(eigenvalues) @ eigenvectors.T
+            scale = np.sqrt(np.diag(correlation))
+            correlation = correlation / np.outer(scale, scale)
+        
+        return correlation
+    
+    def _leg_game_key(self, leg: Dict[str, Any]) -> Optional[str]:
+        """Identify the game a leg belongs to (explicit game_id, else the player's team)"""
+        if leg.get("game_id"):
+            return str(leg["game_id"])
+        team = leg["player_info"].team_abbreviation
+        return f"team_{team}" if team else f"player_{leg['player_info'].player_id}"
+    
+    def _draw_leg_values(
+        self,
+        leg: Dict[str, Any],
+        uniforms: np.ndarray,
+        player_batches: Dict[Tuple[int, bool], SimulationBatch],
+        rng: np.random.Generator
+    ) -> np.ndarray:
+        """
+        Map a column of (possibly correlated) uniforms to a leg's simulated prop values
+        
+        Single-stat props use the exact inverse CDF of the rounded gamma draw;
+        derived stats are sampled with simulate_batch and reordered by the
+        uniforms' ranks so they follow the same copula.
+        """
+        is_home = leg.get("is_home", True)
+        cdf = self._prop_cdf(leg["season_averages"], leg["recent_games"], leg["prop_type"], is_home)
+        if cdf is not None:
+            return np.searchsorted(cdf, uniforms, side="right").astype(float)
+        
+        batch_key = (leg["player_info"].player_id, is_home)
+        if batch_key not in player_batches:
+            player_batches[batch_key] = self.simulate_batch(
+                leg["season_averages"],
+                leg["recent_games"],
+                num_simulations=len(uniforms),
+                is_home=is_home,
+                rng=rng
+            )
+        batch = player_batches[batch_key]
+        stat_field = BATCH_STAT_FIELDS.get(leg["prop_type"])
+        if stat_field is None:
+            return np.full(len(uniforms), np.nan)
+        
+        sorted_values = np.sort(batch[stat_field].astype(float))
+        return sorted_values[np.argsort(np.argsort(uniforms))]
+    
+    def _prop_cdf(
+        self,
+        season_averages: SeasonAverages,
+        recent_games: List[GameStats],
+        prop_type: PropType,
+        is_home: bool = True
+    ) -> Optional[np.ndarray]:
+        """
+        Exact distribution of a single-stat prop: cdf[k] = P(simulated value <= k)
+        
+        Only defined for stats drawn straight from the gamma model (points,
+        rebounds, assists, steals, blocks, turnovers); returns None for
+        derived stats such as threes, free throws and fantasy score.
+        """
+        stat = GAMMA_PROP_STATS.get(prop_type)
+        if stat is None:
+            return None
+        
+        stat_name, season_field = stat
+        modifier = self._game_modifier(recent_games, is_home)
+        expected_value = self._stat_expected_value(
+            getattr(season_averages, season_field), recent_games, stat_name, modifier
+        )
+        
+        if expected_value < 0.1:
+            return np.ones(1)
+        
+        params = self._gamma_params(expected_value, prop_type)
+        if params is None:
+            cdf = np.zeros(max(0, int(round(expected_value))) + 1)
+            cdf[-1] = 1.0
+            return cdf
+        
+        # round(X) <= k  <=>  X < k + 0.5
+        shape, scale = params
+        upper = int(np.ceil(shape * scale + 15 * np.sqrt(shape) * scale)) + 1
+        cdf = special.gammainc(shape, (np.arange(upper + 1) + 0.5) / scale)
+        cdf[-1] = 1.0
+        return cdf
+    
     def _simulate_stat(
         self,
         season_avg: float,
         recent_games: List[GameStats],
         stat_name: str,
         modifier: float,
+        rng: np.random.Generator,
         prop_type: PropType
     ) -> int:
         """Simulate a single stat with realistic variance"""
+        expected_value = self._stat_expected_value(season_avg, recent_games, stat_name, modifier)
+        
+        # Handle edge case: if expected value is too low, return 0
+        if expected_value < 0.1:
+            return 0
+        
+        params = self._gamma_params(expected_value, prop_type)
+        if params is None:
+            # Fall back to simple rounding if parameters invalid
+            return max(0, int(round(expected_value)))
+        
+        shape, scale = params
+        try:
+            simulated_value = rng.gamma(shape=shape, scale=scale)
+        except (ValueError, FloatingPointError):
+            # Fallback if gamma fails
+            simulated_value = expected_value
+        
+        return max(0, int(round(simulated_value)))
+    
+    def _simulate_stat_matrix(
+        self,
+        players: List[Tuple[SeasonAverages, List[GameStats], bool]],
+        modifiers: List[float],
+        prop_type: PropType,
+        num_simulations: int,
+        rng: np.random.Generator
+    ) -> np.ndarray:
+        """Vectorized _simulate_stat for many players - a (players, num_simulations) matrix of integer draws"""
+        stat_name, average_field = GAMMA_PROP_STATS[prop_type]
+        shapes = np.ones(len(players))
+        scales = np.ones(len(players))
+        # Players whose stat is a constant (NaN = drawn from the gamma)
+        constants = np.full(len(players), np.nan)
+        
+        for i, ((season_averages, recent_games, _), modifier) in enumerate(zip(players, modifiers)):
+            expected_value = self._stat_expected_value(
+                getattr(season_averages, average_field), recent_games, stat_name, modifier
+            )
+            if expected_value < 0.1:
+                constants[i] = 0
+                continue
+            
+            params = self._gamma_params(expected_value, prop_type)
+            if params is None:
+                constants[i] = max(0, int(round(expected_value)))
+            else:
+                shapes[i], scales[i] = params
+        
+        simulated_values = rng.gamma(
+            shape=shapes[:, None], scale=scales[:, None], size=(len(players), num_simulations)
+        )
+        simulated_values = np.where(np.isnan(constants)[:, None], np.rint(simulated_values), constants[:, None])
+        return np.maximum(0, simulated_values).astype(np.int64)
+    
+    def _stat_expected_value(
+        self,
+        season_avg: float,
+        recent_games: List[GameStats],
+        stat_name: str,
+        modifier: float
+    ) -> float:
+        """Blend recent and season averages and apply the game modifier"""
         # Get recent average
         recent_values = [
             getattr(game, stat_name) 
@@ -364,12 +769,14 @@ class GameSimulator:
             weighted_avg = season_avg
         
         # Apply modifier
-        expected_value = weighted_avg * modifier
-        
-        # Handle edge case: if expected value is too low, return 0
-        if expected_value < 0.1:
-            return 0
+        return weighted_avg * modifier
+    
+    def _gamma_params(self, expected_value: float, prop_type: PropType) -> Optional[Tuple[float, float]]:
+        """
+        Gamma (shape, scale) with the given mean and the stat's variance factor
         
+        Returns None when the parameters are invalid.
+        """
         # Add variance
         variance = self.stat_variance.get(prop_type, 0.3)
         std_dev = expected_value * variance
@@ -383,18 +790,25 @@ class GameSimulator:
         try:
             shape = (expected_value / std_dev) ** 2
             scale = std_dev ** 2 / expected_value
-            
-            # Validate shape and scale parameters
-            if shape <= 0 or scale <= 0 or np.isnan(shape) or np.isnan(scale):
-                # Fall back to simple rounding if parameters invalid
-                return max(0, int(round(expected_value)))
-            
-            simulated_value = np.random.gamma(shape=shape, scale=scale)
-        except (ValueError, FloatingPointError):
-            # Fallback if gamma fails
-            simulated_value = expected_value
+        except (ZeroDivisionError, FloatingPointError):
+            return None
         
-        return max(0, int(round(simulated_value)))
+        # Validate shape and scale parameters
+        if shape <= 0 or scale <= 0 or np.isnan(shape) or np.isnan(scale):
+            return None
+        
+        return shape, scale
+    
+    def _game_modifier(self, recent_games: List[GameStats], is_home: bool) -> float:
+        """Combined streak and home court modifier"""
+        # Analyze recent form
+        form_assessment = self._assess_player_form(recent_games)
+        streak_modifier = self.streak_modifiers.get(form_assessment, 1.0)
+        
+        # Home court advantage (small boost)
+        home_modifier = 1.05 if is_home else 0.98
+        
+        return streak_modifier * home_modifier
     
     def _assess_player_form(self, recent_games: List[GameStats]) -> str:
         """Assess if player is hot, cold, or normal based on recent games"""
@@ -441,19 +855,19 @@ class GameSimulator:
     
     def _get_stat_value(self, game: GameStats, prop_type: PropType) -> Optional[float]:
         """Extract the stat value for a given prop type"""
-        stat_map = {
-            PropType.POINTS: game.points,
-            PropType.REBOUNDS: game.rebounds,
-            PropType.ASSISTS: game.assists,
-            PropType.STEALS: game.steals,
-            PropType.BLOCKS: game.blocks,
-            PropType.THREES_MADE: game.three_pointers_made,
-            PropType.TURNOVERS: game.turnovers,
-            PropType.FREE_THROWS_MADE: game.free_throws_made,
-            PropType.FANTASY_SCORE: game.fantasy_score,
-        }
+        stat_field = BATCH_STAT_FIELDS.get(prop_type)
+        return getattr(game, stat_field) if stat_field else None
+    
+    def _get_batch_stat_values(self, batch: SimulationBatch, prop_type: PropType) -> np.ndarray:
+        """Extract the stat column for a prop type from a simulate_batch result (NaNs dropped)"""
+        stat_field = BATCH_STAT_FIELDS.get(prop_type)
+        if stat_field is None:
+            return np.array([])
         
-        return stat_map.get(prop_type)
+        values = batch[stat_field]
+        if values.dtype.kind == 'f':
+            values = values[~np.isnan(values)]
+        return values
     
     def _calculate_confidence(self, win_probability: float) -> str:
         """Convert win probability to confidence level"""
@@ -0,0 +1,272 @@
+"""
+Job Queue - Run heavy simulations and training off the request path
+"""
+import asyncio
+import json
+import logging
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# A job handler gets the job's params and an async progress callback
+# (the same (event name, data) signature as EventStream.emit)
+JobHandler = Callable[[Dict[str, Any], Callable[[str, Dict], Awaitable[None]]], Awaitable[Any]]
+
+FINISHED_STATUSES = ("succeeded", "failed", "cancelled")
+
+# Progress events kept per job for polling / streaming
+MAX_JOB_EVENTS = 500
+
+
+class JobQueueFull(Exception):
+    """Too many jobs are already waiting for a worker"""
+
+
+class Job:
+    """
+    One submitted job: its parameters, status, progress events and result
+
+    status goes queued -> running -> succeeded | failed | cancelled.
+    """
+
+    def __init__(self, kind: str, params: Dict[str, Any], key: str):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.params = params
+        self.key = key
+        self.status = "queued"
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.created_at = datetime.now()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.finished_monotonic: Optional[float] = None
+        self.duplicates = 0
+        self.cancel_requested = False
+
+        self.events: List[Tuple[int, str, Dict]] = []
+        self._sequence = 0
+        self._changed = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    async def emit(self, event: str, data: Dict[str, Any]):
+        """Progress callback handed to the job's handler"""
+        self._record(event, data)
+
+    def _record(self, event: str, data: Dict[str, Any]):
+        self._sequence += 1
+        self.events.append((self._sequence, event, data))
+        del self.events[:-MAX_JOB_EVENTS]
+        self._notify()
+
+    def _notify(self):
+        # Wake everyone waiting in events_after, then start a new round
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def _finish(self, status: str, result: Any = None, error: Optional[str] = None):
+        self.status = status
+        self.result = result
+        self.error = error
+        self.finished_at = datetime.now()
+        self.finished_monotonic = time.monotonic()
+        self._record("status", {"status": status, "error": error})
+
+    async def events_after(self, sequence: int) -> List[Tuple[int, str, Dict]]:
+        """Events newer than sequence, waiting for one unless the job is finished"""
+        while True:
+            events = [item for item in self.events if item[0] > sequence]
+            if events or self.finished:
+                return events
+            await self._changed.wait()
+
+    def to_dict(self, include_result: bool = False) -> Dict[str, Any]:
+        progress = next((data for _, event, data in reversed(self.events) if event != "status"), None)
+        end = self.finished_at or datetime.now()
+        job = {
+            "job_id": self.id,
+            "kind": self.kind,
+            "params": self.params,
+            "status": self.status,
+            "created_at": self.created_at.isoformat(timespec="seconds"),
+            "started_at": self.started_at.isoformat(timespec="seconds") if self.started_at else None,
+            "finished_at": self.finished_at.isoformat(timespec="seconds") if self.finished_at else None,
+            "elapsed_seconds": round((end - self.started_at).total_seconds(), 2) if self.started_at else None,
+            "progress": progress,
+            "duplicates": self.duplicates,
+            "cancel_requested": self.cancel_requested,
+            "error": self.error
+        }
+        if include_result:
+            job["result"] = self.result
+        return job
+
+
+class JobQueue:
+    """
+    Bounded worker pool for long-running jobs
+
+    - Handlers are registered per job kind; a submit returns a Job at once
+      and one of max_workers workers runs it
+    - Submitting the same kind and params while an identical job is queued,
+      running or its result is still retained returns that job instead
+    - At most max_pending jobs wait for a worker (JobQueueFull beyond that)
+    - Finished jobs and their results are kept for result_ttl seconds
+    - Queued and running jobs can be cancelled
+    """
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 50, result_ttl: float = 3600):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.result_ttl = result_ttl
+        self._handlers: Dict[str, JobHandler] = {}
+        self._jobs: Dict[str, Job] = {}
+        self._by_key: Dict[str, Job] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._stopping = False
+
+        # Stats
+        self.submitted = 0
+        self.deduplicated = 0
+
+    def register(self, kind: str, handler: JobHandler):
+        self._handlers[kind] = handler
+
+    @property
+    def kinds(self) -> List[str]:
+        return list(self._handlers)
+
+    def start(self):
+        """Start the workers (also done on the first submit)"""
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        self._stopping = False
+        self._workers = [worker for worker in self._workers if not worker.done()]
+        while len(self._workers) < self.max_workers:
+            self._workers.append(asyncio.create_task(self._run_worker()))
+
+    async def stop(self):
+        """Cancel the workers and every running job"""
+        self._stopping = True
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def submit(self, kind: str, params: Dict[str, Any]) -> Tuple[Job, bool]:
+        """Queue a job (or reuse an identical one); returns (job, deduplicated)"""
+        if kind not in self._handlers:
+            raise ValueError(f"Unknown job kind: {kind}. Supported: {', '.join(self._handlers)}")
+
+        self._prune()
+        key = f"{kind}:{json.dumps(params, sort_keys=True, default=str)}"
+        existing = self._by_key.get(key)
+        if existing is not None and existing.status in ("queued", "running", "succeeded"):
+            existing.duplicates += 1
+            self.deduplicated += 1
+            return existing, True
+
+        pending = sum(1 for job in self._jobs.values() if job.status == "queued")
+        if pending >= self.max_pending:
+            raise JobQueueFull(f"{pending} jobs are already queued, try again later")
+
+        job = Job(kind, params, key)
+        self._jobs[job.id] = job
+        self._by_key[key] = job
+        self.submitted += 1
+
+        self.start()
+        self._queue.put_nowait(job)
+        logger.info(f"📥 Queued {kind} job {job.id}")
+        return job, False
+
+    def get(self, job_id: str) -> Optional[Job]:
+        self._prune()
+        return self._jobs.get(job_id)
+
+    def list_jobs(self) -> List[Job]:
+        self._prune()
+        return list(self._jobs.values())
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """Cancel a queued or running job (finished jobs are left as they are)"""
+        job = self.get(job_id)
+        if job is None or job.finished:
+            return job
+
+        job.cancel_requested = True
+        if job.status == "queued":
+            job._finish("cancelled")
+        elif job._task is not None:
+            job._task.cancel()
+        return job
+
+    def _prune(self):
+        """Drop finished jobs older than result_ttl"""
+        cutoff = time.monotonic() - self.result_ttl
+        for job in [job for job in self._jobs.values() if job.finished and job.finished_monotonic < cutoff]:
+            del self._jobs[job.id]
+            if self._by_key.get(job.key) is job:
+                del self._by_key[job.key]
+
+    async def _run_worker(self):
+        while True:
+            job = await self._queue.get()
+            if job.status != "queued":
+                # Cancelled while waiting
+                continue
+
+            job.status = "running"
+            job.started_at = datetime.now()
+            job._notify()
+            logger.info(f"▶️  Running {job.kind} job {job.id}")
+
+            job._task = asyncio.create_task(self._handlers[job.kind](job.params, job.emit))
+            try:
+                result = await job._task
+            except asyncio.CancelledError:
+                job._finish("cancelled")
+                # Worker shutdown (rather than a cancelled job) stops the worker too
+                if self._stopping or not job.cancel_requested:
+                    raise
+            except Exception as e:
+                logger.error(f"❌ {job.kind} job {job.id} failed: {e}")
+                job._finish("failed", error=str(e))
+            else:
+                job._finish("succeeded", result=result)
+                logger.info(f"✅ {job.kind} job {job.id} finished in {job.to_dict()['elapsed_seconds']}s")
+            finally:
+                job._task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        self._prune()
+        statuses: Dict[str, int] = {}
+        for job in self._jobs.values():
+            statuses[job.status] = statuses.get(job.status, 0) + 1
+        return {
+            "workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "result_ttl_seconds": self.result_ttl,
+            "kinds": self.kinds,
+            "jobs": statuses,
+            "submitted": self.submitted,
+            "deduplicated": self.deduplicated
+        }
+
+
+# Job handlers are registered by app.routes.jobs
+job_queue = JobQueue(
+    max_workers=settings.job_max_workers,
+    max_pending=settings.job_max_pending,
+    result_ttl=settings.job_result_ttl
+)
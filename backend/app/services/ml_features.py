@@ -0,0 +1,293 @@
+"""
+ML Features - One vectorized feature pipeline for ML training and prediction
+"""
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from app.models import GameStats, SeasonAverages
+
+# Games before the predicted one that make up "recent form"
+RECENT_WINDOW = 5
+
+# Recent games needed for a trend (last 2 vs first 2 of the window)
+TREND_MIN_GAMES = 4
+
+# Season-average context features added per stat
+RELATED_STATS = {
+    'points': ['field_goal_percentage', 'free_throw_percentage'],
+    'assists': ['points_per_game'],
+    'rebounds': ['blocks_per_game'],
+}
+
+# The shared (multi-output) matrix carries every stat's context columns once
+SHARED_RELATED_FIELDS = list(dict.fromkeys(field for fields in RELATED_STATS.values() for field in fields))
+
+
+def feature_names(stat_type: str) -> List[str]:
+    """Column names of stat_type's feature matrix, in order"""
+    return [
+        'season_average', 'season_minutes', 'season_games_played',
+        'recent_mean', 'recent_std', 'recent_games', 'recent_trend',
+        'is_home', 'minutes', 'game_number',
+        *RELATED_STATS.get(stat_type, ['none'])
+    ]
+
+
+def shared_feature_names(stat_types: List[str]) -> List[str]:
+    """Column names of the shared feature matrix, in order"""
+    return [
+        'season_minutes', 'season_games_played', *SHARED_RELATED_FIELDS,
+        'recent_games', 'is_home', 'minutes', 'game_number',
+        *(
+            f"{stat_type}_{name}"
+            for stat_type in stat_types
+            for name in ('season_average', 'recent_mean', 'recent_std', 'recent_trend')
+        )
+    ]
+
+
+def game_log_arrays(games: List[GameStats], stat_types: List[str]) -> Dict[str, np.ndarray]:
+    """
+    A game log as chronological (oldest first) columns
+
+    Each stat in stat_types is a float column with NaN for missing values,
+    plus is_home and minutes_played (0 if missing).
+    """
+    games = sorted(games, key=lambda game: game.game_date)
+    arrays = {
+        stat_type: np.array(
+            [np.nan if getattr(game, stat_type) is None else getattr(game, stat_type) for game in games],
+            dtype=np.float64
+        )
+        for stat_type in stat_types
+    }
+    arrays['is_home'] = np.array([game.is_home for game in games], dtype=np.float64)
+    arrays['minutes_played'] = np.array([game.minutes_played or 0 for game in games], dtype=np.float64)
+    return arrays
+
+
+def _window_form(windows: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """
+    Recent form of each row of windows - an (n, 4) matrix
+
+    Row i's counts[i] real games are the last entries of windows[i]
+    (oldest first), the rest is zero padding.
+    """
+    window = windows.shape[1]
+    safe_counts = np.maximum(counts, 1)
+
+    # Padding is zero: dividing by the real game count gives the window's moments
+    means = windows.sum(axis=1) / safe_counts
+    squares = (windows ** 2).sum(axis=1) / safe_counts
+    stds = np.sqrt(np.maximum(squares - means ** 2, 0.0))
+
+    first = np.minimum(window - counts, window - 2)
+    rows = np.arange(len(windows))
+    first_two = (windows[rows, first] + windows[rows, first + 1]) / 2
+    last_two = windows[:, -2:].mean(axis=1)
+    trends = np.where(counts >= TREND_MIN_GAMES, last_two - first_two, 0.0)
+
+    return np.column_stack([
+        np.where(counts > 0, means, 0.0),
+        np.where(counts > 0, stds, 0.0),
+        counts,
+        trends
+    ])
+
+
+def recent_form(values: np.ndarray, window: int = RECENT_WINDOW) -> np.ndarray:
+    """
+    Recent-form features of every game from the games before it - an (n, 4) matrix
+
+    Row i summarizes values[i-window:i] (fewer at the start of the log):
+    mean, std, number of games and trend (mean of the last 2 minus mean of
+    the first 2, when there are at least TREND_MIN_GAMES). Missing values
+    count as 0; a game with no history gets all zeros.
+    """
+    n = len(values)
+    filled = np.nan_to_num(values, nan=0.0)
+
+    # Row i of windows is values[i-window:i], zero-padded before the first game
+    windows = sliding_window_view(np.concatenate([np.zeros(window), filled]), window)[:n]
+    return _window_form(windows, np.minimum(np.arange(n), window))
+
+
+def next_game_form(logs: List[Dict[str, np.ndarray]], stat_type: str) -> np.ndarray:
+    """Recent form of the game after each log (game_log_arrays) - an (n, 4) matrix"""
+    windows = np.zeros((len(logs), RECENT_WINDOW))
+    counts = np.zeros(len(logs), dtype=np.int64)
+    for row, arrays in enumerate(logs):
+        recent = np.nan_to_num(arrays[stat_type][-RECENT_WINDOW:], nan=0.0)
+        if len(recent):
+            windows[row, -len(recent):] = recent
+        counts[row] = len(recent)
+    return _window_form(windows, counts)
+
+
+def _season_columns(season_avgs: List[SeasonAverages], fields: List[str], n: int) -> np.ndarray:
+    """Season-average fields as (n, len(fields)) columns - one average per row, or one for every row"""
+    values = np.array(
+        [[getattr(season_avg, field, 0) for field in fields] for season_avg in season_avgs],
+        dtype=np.float64
+    ).reshape(len(season_avgs), len(fields))
+    return np.broadcast_to(values, (n, len(fields)))
+
+
+def feature_matrix(
+    stat_type: str,
+    season_avgs: List[SeasonAverages],
+    form: np.ndarray,
+    is_home: np.ndarray,
+    minutes: np.ndarray,
+    game_number: np.ndarray
+) -> np.ndarray:
+    """
+    stat_type's features for n games (columns as in feature_names)
+
+    season_avgs holds each row's season averages, or one for every row.
+    """
+    n = len(form)
+    season = _season_columns(season_avgs, [f"{stat_type}_per_game", 'minutes_per_game', 'games_played'], n)
+    if stat_type in RELATED_STATS:
+        related = _season_columns(season_avgs, RELATED_STATS[stat_type], n)
+    else:
+        related = np.zeros((n, 1))
+
+    return np.column_stack([season, form, is_home, minutes, game_number, related])
+
+
+def shared_feature_matrix(
+    stat_types: List[str],
+    season_avgs: List[SeasonAverages],
+    forms: Dict[str, np.ndarray],
+    is_home: np.ndarray,
+    minutes: np.ndarray,
+    game_number: np.ndarray
+) -> np.ndarray:
+    """One feature matrix for every stat of n games (columns as in shared_feature_names)"""
+    n = len(game_number)
+    columns = [
+        _season_columns(season_avgs, ['minutes_per_game', 'games_played', *SHARED_RELATED_FIELDS], n),
+        forms[stat_types[0]][:, 2] if stat_types else np.zeros(n),  # Recent games (the same for every stat)
+        is_home,
+        minutes,
+        game_number
+    ]
+    for stat_type in stat_types:
+        columns.append(_season_columns(season_avgs, [f"{stat_type}_per_game"], n))
+        columns.append(forms[stat_type][:, [0, 1, 3]])
+    return np.column_stack(columns)
+
+
+def training_features(
+    season_avg: SeasonAverages,
+    games: List[GameStats],
+    stat_types: List[str]
+) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """
+    (X, y) per stat for one player's season: one row per game with that stat
+
+    Every game is described by the games before it (chronologically), its
+    venue, minutes played and position in the season.
+    """
+    arrays = game_log_arrays(games, stat_types)
+    game_number = np.arange(1, len(games) + 1, dtype=np.float64)
+
+    matrices = {}
+    for stat_type in stat_types:
+        values = arrays[stat_type]
+        X = feature_matrix(
+            stat_type, [season_avg], recent_form(values),
+            arrays['is_home'], arrays['minutes_played'], game_number
+        )
+        has_target = ~np.isnan(values)
+        matrices[stat_type] = (X[has_target], values[has_target])
+    return matrices
+
+
+def shared_training_features(
+    season_avg: SeasonAverages,
+    games: List[GameStats],
+    stat_types: List[str]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (X, Y) for a multi-output model: one row per game with every stat,
+    Y's columns in stat_types order
+    """
+    arrays = game_log_arrays(games, stat_types)
+    game_number = np.arange(1, len(games) + 1, dtype=np.float64)
+    forms = {stat_type: recent_form(arrays[stat_type]) for stat_type in stat_types}
+
+    X = shared_feature_matrix(
+        stat_types, [season_avg], forms, arrays['is_home'], arrays['minutes_played'], game_number
+    )
+    Y = np.column_stack([arrays[stat_type] for stat_type in stat_types]).reshape(len(games), len(stat_types))
+    has_targets = ~np.isnan(Y).any(axis=1)
+    return X[has_targets], Y[has_targets]
+
+
+class NextGames:
+    """
+    The next game of many players, as feature-ready columns
+
+    players are (season averages, recent games, is_home) like the
+    simulation batches; minutes_projections default to each player's
+    season minutes per game.
+    """
+
+    def __init__(
+        self,
+        players: List[Tuple[SeasonAverages, List[GameStats], bool]],
+        stat_types: List[str],
+        minutes_projections: Optional[List[Optional[float]]] = None
+    ):
+        self.season_avgs = [season_avg for season_avg, _, _ in players]
+        self.logs = [game_log_arrays(recent_games, stat_types) for _, recent_games, _ in players]
+        self.is_home = np.array([1.0 if is_home else 0.0 for _, _, is_home in players])
+        minutes_projections = minutes_projections or [None] * len(players)
+        self.minutes = np.array([
+            season_avg.minutes_per_game if minutes is None else minutes
+            for season_avg, minutes in zip(self.season_avgs, minutes_projections)
+        ], dtype=np.float64)
+        self.game_number = np.array(
+            [season_avg.games_played + 1 for season_avg in self.season_avgs], dtype=np.float64
+        )
+
+    def form(self, stat_type: str) -> np.ndarray:
+        return next_game_form(self.logs, stat_type)
+
+
+def prediction_features(
+    players: List[Tuple[SeasonAverages, List[GameStats], bool]],
+    stat_types: List[str],
+    minutes_projections: Optional[List[Optional[float]]] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Feature matrix per stat for the players' next games - one row per player
+
+    Built exactly like a training row: the next game is described by the
+    recent games before it.
+    """
+    games = NextGames(players, stat_types, minutes_projections)
+    return {
+        stat_type: feature_matrix(
+            stat_type, games.season_avgs, games.form(stat_type), games.is_home, games.minutes, games.game_number
+        )
+        for stat_type in stat_types
+    }
+
+
+def shared_prediction_features(
+    players: List[Tuple[SeasonAverages, List[GameStats], bool]],
+    stat_types: List[str],
+    minutes_projections: Optional[List[Optional[float]]] = None
+) -> np.ndarray:
+    """The shared feature matrix of the players' next games - one row per player"""
+    games = NextGames(players, stat_types, minutes_projections)
+    return shared_feature_matrix(
+        stat_types, games.season_avgs,
+        {stat_type: games.form(stat_type) for stat_type in stat_types},
+        games.is_home, games.minutes, games.game_number
+    )
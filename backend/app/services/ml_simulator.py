@@ -4,19 +4,112 @@ Uses historical performance of playoff-caliber teams to build better models
 """
 import numpy as np
 import pandas as pd
-from typing import List, Dict, Optional, Tuple
+from typing import Awaitable, Callable, List, Dict, Optional, Tuple
 from datetime import datetime, timedelta
-from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
+from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor, HistGradientBoostingRegressor
+from sklearn.metrics import r2_score
 from sklearn.preprocessing import StandardScaler
-import pickle
+from joblib import Parallel, delayed
+import time
+import threading
+import asyncio
 import logging
-from pathlib import Path
 
+from app.config import settings
 from app.models import GameStats, SeasonAverages, PlayerInfo, PropType
-from app.services.nba_stats import nba_stats_service
+from app.services.random_streams import derive_seed, resolve_seed
+from app.services.simulation_pool import simulation_pool
+from app.services.ml_features import (
+    feature_names, prediction_features, shared_feature_names, shared_prediction_features,
+    shared_training_features, training_features
+)
+from app.services.model_bundle import ModelBundle, model_store
+from app.services.training_dataset import TrainingPlayer, training_data_service
 
 logger = logging.getLogger(__name__)
 
+# Awaited with (event name, data) while training runs
+ProgressCallback = Callable[[str, Dict], Awaitable[None]]
+
+# Std dev of the noise around each ML prediction, as a share of the prediction
+ML_NOISE_STD = {
+    'steals': 0.40,  # Higher variance for defensive stats
+    'blocks': 0.40,
+    'assists': 0.25,
+    'rebounds': 0.25,
+}
+DEFAULT_ML_NOISE_STD = 0.20
+
+# Training engines:
+# - "gbr": one GradientBoostingRegressor per stat
+# - "hist": one HistGradientBoostingRegressor per stat (binned - much faster on large datasets)
+# - "multi_output": one RandomForestRegressor predicting every stat from a shared feature matrix
+ML_ENGINES = ("gbr", "hist", "multi_output")
+
+
+def draw_ml_simulations(
+    predictions: Dict[str, float],
+    num_simulations: int,
+    rng: np.random.Generator
+) -> Dict[str, np.ndarray]:
+    """num_simulations noisy draws around each prediction (rounded, floored at 0)"""
+    return {
+        stat_type: np.maximum(0, np.rint(rng.normal(
+            predicted_value,
+            max(predicted_value, 0.0) * ML_NOISE_STD.get(stat_type, DEFAULT_ML_NOISE_STD),
+            size=num_simulations
+        ))).astype(np.int64)
+        for stat_type, predicted_value in predictions.items()
+    }
+
+
+def _new_model(engine: str, n_jobs: int = 1):
+    if engine == "gbr":
+        return GradientBoostingRegressor(n_estimators=100, learning_rate=0.1, max_depth=5, random_state=42)
+    if engine == "hist":
+        return HistGradientBoostingRegressor(max_iter=100, learning_rate=0.1, max_depth=5, random_state=42)
+    return RandomForestRegressor(n_estimators=100, max_depth=12, min_samples_leaf=5, n_jobs=n_jobs, random_state=42)
+
+
+def _fit_model(
+    engine: str,
+    X: np.ndarray,
+    y: np.ndarray,
+    n_jobs: int = 1
+) -> Tuple[object, StandardScaler, np.ndarray, np.ndarray, float]:
+    """
+    Fit a scaler and model on an 80/20 split
+    
+    Module level so joblib workers can run it. y is one target column or
+    a (samples, stats) matrix; returns (model, scaler, train R² per target,
+    test R² per target, fit seconds).
+    """
+    # Split train/test
+    split_idx = int(len(X) * 0.8)
+    X_train, X_test = X[:split_idx], X[split_idx:]
+    y_train, y_test = y[:split_idx], y[split_idx:]
+    
+    # Scale features
+    scaler = StandardScaler()
+    X_train_scaled = scaler.fit_transform(X_train)
+    X_test_scaled = scaler.transform(X_test)
+    
+    start = time.perf_counter()
+    model = _new_model(engine, n_jobs)
+    model.fit(X_train_scaled, y_train)
+    seconds = time.perf_counter() - start
+    
+    # Evaluate
+    train_scores = r2_score(y_train, model.predict(X_train_scaled), multioutput="raw_values")
+    test_scores = r2_score(y_test, model.predict(X_test_scaled), multioutput="raw_values")
+    
+    return model, scaler, train_scores, test_scores, seconds
+
+
+def _fit_stat_model(engine: str, stat_type: str, X: np.ndarray, y: np.ndarray) -> Tuple:
+    """_fit_model for one stat, tagged with the stat (parallel results arrive in any order)"""
+    return (stat_type, *_fit_model(engine, X, y))
+
 
 class MLGameSimulator:
     """
@@ -24,242 +117,282 @@ class MLGameSimulator:
     """
     
     def __init__(self):
-        self.models = {}  # Store models for each stat type
-        self.scalers = {}  # Store scalers for each stat type
-        self.is_trained = False
-        self.model_path = Path("models")
-        self.model_path.mkdir(exist_ok=True)
+        # The live models - replaced as a whole (one reference swap) when
+        # a training finishes or a saved bundle is loaded
+        self.bundle: Optional[ModelBundle] = None
+        self._load_task: Optional[asyncio.Task] = None
+        self.training_jobs = settings.ml_training_jobs or -1  # joblib n_jobs (-1 = every CPU)
         
         # Top teams from each conference (can be updated each season)
         self.top_east_teams = ["BOS", "MIL", "PHI", "CLE"]  # Top 4 East
         self.top_west_teams = ["DEN", "LAL", "GSW", "PHX"]  # Top 4 West
         self.top_teams = self.top_east_teams + self.top_west_teams
         
+        # Stars trained on in addition to the top teams' rosters
+        self.star_players = [
+            "LeBron James", "Stephen Curry", "Giannis Antetokounmpo",
+            "Nikola Jokic", "Joel Embiid", "Luka Doncic",
+            "Jayson Tatum", "Kevin Durant", "Damian Lillard",
+            "Anthony Davis", "Kawhi Leonard", "Jimmy Butler"
+        ]
+        
         # Stats to predict
         self.stat_types = [
             'points', 'rebounds', 'assists', 'steals', 
             'blocks', 'turnovers', 'three_pointers_made', 'free_throws_made'
         ]
     
+    @property
+    def is_trained(self) -> bool:
+        return self.bundle is not None
+    
+    @property
+    def models(self) -> Dict:
+        """The live model of each stat type"""
+        return self.bundle.models if self.bundle else {}
+    
     async def train_models(
         self, 
         season: str = "2023-24",
-        min_games: int = 10
+        min_games: int = 10,
+        progress: Optional[ProgressCallback] = None,
+        refresh_data: bool = False,
+        engine: Optional[str] = None
     ) -> Dict[str, float]:
         """
         Train ML models using historical data from top teams
         
-        Returns accuracy scores for each stat type
+        The season's game logs are read from the saved training dataset
+        when there is one (refresh_data=True collects them again).
+        
+        engine (default settings.ml_engine) is one of ML_ENGINES. The
+        per-stat engines fit their stat models in parallel across CPUs
+        (joblib); "multi_output" fits one model for every stat.
+        
+        progress, if given, is awaited with ("player", {...}) as each
+        player's games are collected, ("dataset", {...}) once the training
+        data is ready and ("model", {...}) as each stat's model is trained.
+        Models are fit in a worker thread so the event loop keeps serving
+        (and streaming) meanwhile.
+        
+        Returns accuracy scores and fit time for each stat type
         """
-        logger.info("Starting model training with top teams data...")
+        engine = engine or settings.ml_engine
+        if engine not in ML_ENGINES:
+            raise ValueError(f"Unknown ML engine: {engine}. Supported: {', '.join(ML_ENGINES)}")
+        
+        logger.info(f"Starting model training with top teams data ({engine})...")
         
         # Collect training data
-        training_data = await self._collect_training_data(season, min_games)
+        training_players = await self._collect_training_data(season, min_games, progress, refresh_data)
         
-        if len(training_data) < 100:
-            raise ValueError(f"Insufficient training data: only {len(training_data)} samples")
+        num_samples = sum(len(player.games) for player in training_players)
+        if num_samples < 100:
+            raise ValueError(f"Insufficient training data: only {num_samples} samples")
         
-        # Train models for each stat type
+        models = {}
+        scalers = {}
         accuracy_scores = {}
         
-        for stat_type in self.stat_types:
-            logger.info(f"Training model for {stat_type}...")
-            
-            # Prepare features and target
-            X, y = self._prepare_features(training_data, stat_type)
-            
+        async def record(stat_type: str, model, scaler, train_score: float, test_score: float,
+                         seconds: float, samples: int):
+            models[stat_type] = model
+            scalers[stat_type] = scaler
+            accuracy_scores[stat_type] = {
+                'train_r2': round(float(train_score), 3),
+                'test_r2': round(float(test_score), 3),
+                'samples': samples,
+                'engine': engine,
+                'train_seconds': round(seconds, 3)
+            }
+            logger.info(f"{stat_type}: Train R² = {train_score:.3f}, Test R² = {test_score:.3f} ({seconds:.2f}s)")
+            if progress:
+                await progress("model", {
+                    "stat_type": stat_type,
+                    **accuracy_scores[stat_type],
+                    "completed_models": len(accuracy_scores),
+                    "total_models": len(self.stat_types)
+                })
+        
+        if engine == "multi_output":
+            shared_stats, X, Y = await asyncio.to_thread(self._prepare_shared_features, training_players)
             if len(X) == 0:
-                logger.warning(f"No data for {stat_type}, skipping")
-                continue
-            
-            # Split train/test
-            split_idx = int(len(X) * 0.8)
-            X_train, X_test = X[:split_idx], X[split_idx:]
-            y_train, y_test = y[:split_idx], y[split_idx:]
+                raise ValueError("Insufficient training data: no games with every stat")
             
-            # Scale features
-            scaler = StandardScaler()
-            X_train_scaled = scaler.fit_transform(X_train)
-            X_test_scaled = scaler.transform(X_test)
-            
-            # Train model (using Gradient Boosting for better accuracy)
-            model = GradientBoostingRegressor(
-                n_estimators=100,
-                learning_rate=0.1,
-                max_depth=5,
-                random_state=42
+            logger.info(f"Training one model for {len(shared_stats)} stats...")
+            model, scaler, train_scores, test_scores, seconds = await asyncio.to_thread(
+                _fit_model, engine, X, Y, self.training_jobs
             )
-            model.fit(X_train_scaled, y_train)
+            # One fit serves every stat: its time is reported for each
+            for index, stat_type in enumerate(shared_stats):
+                await record(stat_type, model, scaler, train_scores[index], test_scores[index], seconds, len(X))
+        else:
+            shared_stats = []
             
-            # Evaluate
-            train_score = model.score(X_train_scaled, y_train)
-            test_score = model.score(X_test_scaled, y_test)
+            # Feature matrices for every stat in one pass
+            features = await asyncio.to_thread(self._prepare_features, training_players)
+            for stat_type in self.stat_types:
+                if len(features[stat_type][0]) == 0:
+                    logger.warning(f"No data for {stat_type}, skipping")
+                    del features[stat_type]
             
-            # Store model and scaler
-            self.models[stat_type] = model
-            self.scalers[stat_type] = scaler
+            loop = asyncio.get_running_loop()
+            fits_done = object()  # Queued by the fitting thread when it stops
+            results: asyncio.Queue = asyncio.Queue()
+            stop_fitting = threading.Event()
             
-            accuracy_scores[stat_type] = {
-                'train_r2': round(train_score, 3),
-                'test_r2': round(test_score, 3),
-                'samples': len(X)
-            }
+            def send(item):
+                try:
+                    loop.call_soon_threadsafe(results.put_nowait, item)
+                except RuntimeError:
+                    # Event loop closed (shutdown) - nobody is waiting any more
+                    pass
             
-            logger.info(f"{stat_type}: Train R² = {train_score:.3f}, Test R² = {test_score:.3f}")
+            def fit_all():
+                # Results arrive as each stat's model finishes; the thread never
+                # waits on the event loop, and stops once training is abandoned
+                fits = Parallel(n_jobs=self.training_jobs, return_as="generator_unordered")(
+                    delayed(_fit_stat_model)(engine, stat_type, X, y)
+                    for stat_type, (X, y) in features.items()
+                )
+                try:
+                    for fit in fits:
+                        if stop_fitting.is_set():
+                            break
+                        send(fit)
+                except Exception as e:
+                    send(e)
+                finally:
+                    # Abort the fits still pending in the joblib workers
+                    fits.close()
+                    send(fits_done)
+            
+            logger.info(f"Training {len(features)} models ({self.training_jobs} jobs)...")
+            fitting = asyncio.ensure_future(asyncio.to_thread(fit_all))
+            try:
+                while True:
+                    item = await results.get()
+                    if item is fits_done:
+                        break
+                    if isinstance(item, Exception):
+                        raise item
+                    stat_type, model, scaler, train_scores, test_scores, seconds = item
+                    await record(
+                        stat_type, model, scaler, train_scores[0], test_scores[0], seconds, len(features[stat_type][0])
+                    )
+            finally:
+                # Cancelled (client gone, job deleted) or failed: stop consuming fits
+                stop_fitting.set()
+            await fitting
         
-        self.is_trained = True
+        trained_stats = [stat_type for stat_type in self.stat_types if stat_type in models]
+        bundle = ModelBundle(
+            engine=engine,
+            models={stat_type: models[stat_type] for stat_type in trained_stats},
+            scalers={stat_type: scalers[stat_type] for stat_type in trained_stats},
+            shared_stats=shared_stats,
+            feature_schema=self._feature_schema(engine, trained_stats, shared_stats),
+            training={"season": season, "min_games": min_games, "samples": num_samples},
+            metrics={stat_type: accuracy_scores[stat_type] for stat_type in trained_stats}
+        )
         
         # Save models
-        self._save_models()
+        try:
+            await asyncio.to_thread(model_store.save, bundle)
+        except Exception as e:
+            logger.error(f"Error saving models: {e}")
+        
+        # Requests already predicting keep the bundle they started with
+        self.bundle = bundle
         
-        return accuracy_scores
+        return bundle.metrics
+    
+    def _feature_schema(self, engine: str, stats: List[str], shared_stats: List[str]) -> Dict[str, List[str]]:
+        """Feature names the models of a bundle expect"""
+        if engine == "multi_output":
+            return {"shared": shared_feature_names(shared_stats)}
+        return {stat_type: feature_names(stat_type) for stat_type in stats}
     
     async def _collect_training_data(
         self, 
         season: str,
-        min_games: int
-    ) -> List[Dict]:
-        """
-        Collect historical game data from top teams
+        min_games: int,
+        progress: Optional[ProgressCallback] = None,
+        refresh: bool = False
+    ) -> List[TrainingPlayer]:
         """
-        training_data = []
+        Historical games of the top teams' rosters and the star players
         
-        # Get all players from top teams
+        Collected concurrently and saved per season by training_data_service;
+        players with fewer than min_games games are left out.
+        """
         logger.info(f"Collecting data from top teams: {self.top_teams}")
+        dataset, source = await training_data_service.get_dataset(
+            season, self.top_teams, self.star_players, refresh=refresh, progress=progress
+        )
+        training_players = dataset.eligible_players(min_games)
+        num_samples = sum(len(player.games) for player in training_players)
         
-        # For each top team, get their roster and game logs
-        for team_abbr in self.top_teams:
-            try:
-                # Get team's players (this would need nba_api integration)
-                # For now, we'll use a placeholder approach
-                # In production, you'd query team rosters
-                
-                # Placeholder: Get games against these teams from player histories
-                logger.info(f"Processing team: {team_abbr}")
-                
-            except Exception as e:
-                logger.error(f"Error collecting data for {team_abbr}: {e}")
-                continue
-        
-        # Alternative approach: Collect from specific star players we know
-        star_players = [
-            "LeBron James", "Stephen Curry", "Giannis Antetokounmpo",
-            "Nikola Jokic", "Joel Embiid", "Luka Doncic",
-            "Jayson Tatum", "Kevin Durant", "Damian Lillard",
-            "Anthony Davis", "Kawhi Leonard", "Jimmy Butler"
-        ]
-        
-        for player_name in star_players:
-            try:
-                player_info = await nba_stats_service.get_player_info(player_name)
-                if not player_info:
-                    continue
-                
-                # Get extensive game log (full season)
-                game_log = await nba_stats_service.get_player_game_log(
-                    player_info.player_id,
-                    season=season,
-                    last_n_games=82  # Full season
-                )
-                
-                season_avg = await nba_stats_service.get_player_season_averages(
-                    player_info.player_id,
-                    season=season
-                )
-                
-                if not season_avg or len(game_log) < min_games:
-                    continue
-                
-                # Process each game as a training sample
-                for i, game in enumerate(game_log):
-                    # Get recent form (last 5 games before this one)
-                    recent_games = game_log[max(0, i-5):i] if i > 0 else []
-                    
-                    training_sample = {
-                        'player_id': player_info.player_id,
-                        'player_name': player_info.full_name,
-                        'game': game,
-                        'season_avg': season_avg,
-                        'recent_games': recent_games,
-                        'game_number': i + 1
-                    }
-                    
-                    training_data.append(training_sample)
-                
-                logger.info(f"Collected {len(game_log)} games from {player_name}")
-                
-            except Exception as e:
-                logger.error(f"Error collecting data for {player_name}: {e}")
-                continue
+        if progress:
+            await progress("dataset", {
+                "season": season,
+                "source": source,
+                "players": len(dataset.players),
+                "games": dataset.num_games,
+                "samples": num_samples,
+                "collected_at": dataset.collected_at.isoformat(timespec="seconds")
+            })
         
-        logger.info(f"Total training samples collected: {len(training_data)}")
-        return training_data
+        logger.info(f"Total training samples collected: {num_samples}")
+        return training_players
     
     def _prepare_features(
         self, 
-        training_data: List[Dict],
-        stat_type: str
-    ) -> Tuple[np.ndarray, np.ndarray]:
-        """
-        Prepare feature matrix and target vector for a specific stat
+        training_players: List[TrainingPlayer]
+    ) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
         """
-        features = []
-        targets = []
+        Feature matrix and target vector of every stat type
         
-        for sample in training_data:
-            game = sample['game']
-            season_avg = sample['season_avg']
-            recent_games = sample['recent_games']
-            
-            # Get target value
-            target_value = getattr(game, stat_type, None)
-            if target_value is None:
+        Each player's game log is turned into whole columns at once
+        (ml_features.training_features) and the players are stacked.
+        """
+        per_player = [
+            training_features(player.season_avg, player.games, self.stat_types)
+            for player in training_players
+        ]
+        features = {}
+        for stat_type in self.stat_types:
+            matrices = [player_features[stat_type] for player_features in per_player]
+            if not matrices:
+                features[stat_type] = (np.empty((0, 0)), np.empty(0))
                 continue
-            
-            # Build feature vector
-            feature_vector = []
-            
-            # Season averages
-            feature_vector.append(getattr(season_avg, f"{stat_type}_per_game", 0))
-            feature_vector.append(season_avg.minutes_per_game)
-            feature_vector.append(season_avg.games_played)
-            
-            # Recent form (last 5 games)
-            if recent_games:
-                recent_values = [getattr(g, stat_type, 0) for g in recent_games]
-                feature_vector.append(np.mean(recent_values))  # Recent average
-                feature_vector.append(np.std(recent_values))   # Recent variance
-                feature_vector.append(len(recent_values))      # Number of recent games
-                
-                # Trend (difference between last 2 and first 2 games)
-                if len(recent_values) >= 4:
-                    recent_trend = np.mean(recent_values[-2:]) - np.mean(recent_values[:2])
-                    feature_vector.append(recent_trend)
-                else:
-                    feature_vector.append(0)
-            else:
-                feature_vector.extend([0, 0, 0, 0])  # No recent data
-            
-            # Game context
-            feature_vector.append(1 if game.is_home else 0)  # Home/away
-            feature_vector.append(game.minutes_played or 0)  # Minutes played
-            feature_vector.append(sample['game_number'])     # Season progression
-            
-            # Related stats (correlations)
-            if stat_type == 'points':
-                feature_vector.append(season_avg.field_goal_percentage)
-                feature_vector.append(season_avg.free_throw_percentage)
-            elif stat_type == 'assists':
-                feature_vector.append(season_avg.points_per_game)
-            elif stat_type == 'rebounds':
-                feature_vector.append(season_avg.blocks_per_game)
-            else:
-                feature_vector.append(0)  # Placeholder
-            
-            features.append(feature_vector)
-            targets.append(target_value)
+            features[stat_type] = (
+                np.concatenate([X for X, _ in matrices]),
+                np.concatenate([y for _, y in matrices])
+            )
+        return features
+    
+    def _prepare_shared_features(
+        self,
+        training_players: List[TrainingPlayer]
+    ) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """
+        The shared feature matrix and target matrix of a multi-output model
         
-        return np.array(features), np.array(targets)
+        Returns (stats, X, Y): stats with any recorded values (Y's columns),
+        and one row per game that has all of them.
+        """
+        stats = [
+            stat_type for stat_type in self.stat_types
+            if any(getattr(game, stat_type) is not None for player in training_players for game in player.games)
+        ]
+        matrices = [
+            shared_training_features(player.season_avg, player.games, stats)
+            for player in training_players
+        ]
+        if not stats or not matrices:
+            return stats, np.empty((0, 0)), np.empty((0, len(stats)))
+        return stats, np.concatenate([X for X, _ in matrices]), np.concatenate([Y for _, Y in matrices])
     
     def predict_player_performance(
         self,
@@ -272,106 +405,89 @@ class MLGameSimulator:
         """
         Predict player's performance using trained ML models
         """
-        if not self.is_trained:
-            raise ValueError("Models not trained yet. Call train_models() first.")
-        
-        predictions = {}
+        return self.predict_batch([(season_averages, recent_games, is_home)], [minutes_projection])[0]
+    
+    def predict_batch(
+        self,
+        players: List[Tuple[SeasonAverages, List[GameStats], bool]],
+        minutes_projections: Optional[List[Optional[float]]] = None
+    ) -> List[Dict[str, float]]:
+        """
+        Predict many players' next games at once - one prediction dict per player
         
-        # Estimate minutes if not provided
-        if minutes_projection is None:
-            minutes_projection = season_averages.minutes_per_game
+        players are (season averages, recent games, is_home). The feature
+        matrix of every player is built in one pass and each model predicts
+        all rows in a single call.
+        """
+        # One bundle for the whole call, even if a retrain swaps it meanwhile
+        bundle = self.bundle
+        if bundle is None:
+            raise ValueError("Models not trained yet. Call train_models() first.")
+        if not players:
+            return []
         
-        for stat_type in self.stat_types:
-            if stat_type not in self.models:
-                continue
-            
-            # Build feature vector (same structure as training)
-            feature_vector = []
-            
-            # Season averages
-            feature_vector.append(getattr(season_averages, f"{stat_type}_per_game", 0))
-            feature_vector.append(season_averages.minutes_per_game)
-            feature_vector.append(season_averages.games_played)
-            
-            # Recent form
-            if recent_games:
-                recent_values = [getattr(g, stat_type, 0) for g in recent_games[-5:]]
-                feature_vector.append(np.mean(recent_values))
-                feature_vector.append(np.std(recent_values))
-                feature_vector.append(len(recent_values))
-                
-                if len(recent_values) >= 4:
-                    recent_trend = np.mean(recent_values[-2:]) - np.mean(recent_values[:2])
-                    feature_vector.append(recent_trend)
-                else:
-                    feature_vector.append(0)
-            else:
-                feature_vector.extend([0, 0, 0, 0])
-            
-            # Game context
-            feature_vector.append(1 if is_home else 0)
-            feature_vector.append(minutes_projection)
-            feature_vector.append(season_averages.games_played + 1)  # Next game
-            
-            # Related stats
-            if stat_type == 'points':
-                feature_vector.append(season_averages.field_goal_percentage)
-                feature_vector.append(season_averages.free_throw_percentage)
-            elif stat_type == 'assists':
-                feature_vector.append(season_averages.points_per_game)
-            elif stat_type == 'rebounds':
-                feature_vector.append(season_averages.blocks_per_game)
-            else:
-                feature_vector.append(0)
-            
-            # Scale and predict
-            X = np.array([feature_vector])
-            X_scaled = self.scalers[stat_type].transform(X)
-            prediction = self.models[stat_type].predict(X_scaled)[0]
-            
-            # Ensure non-negative
-            predictions[stat_type] = max(0, prediction)
+        if bundle.engine == "multi_output":
+            # One matrix and one prediction for every stat
+            X = shared_prediction_features(players, bundle.shared_stats, minutes_projections)
+            stat_type = bundle.shared_stats[0]
+            values = bundle.models[stat_type].predict(bundle.scalers[stat_type].transform(X)).reshape(len(players), -1)
+            columns = {stat_type: values[:, index] for index, stat_type in enumerate(bundle.shared_stats)}
+        else:
+            # Feature rows built exactly like the training rows
+            features = prediction_features(players, list(bundle.models), minutes_projections)
+            columns = {
+                stat_type: bundle.models[stat_type].predict(bundle.scalers[stat_type].transform(X))
+                for stat_type, X in features.items()
+            }
         
-        return predictions
+        # Ensure non-negative
+        columns = {stat_type: np.maximum(values, 0.0) for stat_type, values in columns.items()}
+        return [
+            {stat_type: float(values[row]) for stat_type, values in columns.items()}
+            for row in range(len(players))
+        ]
     
-    def _save_models(self):
-        """Save trained models to disk"""
+    def load_models(self) -> bool:
+        """
+        Load the current model bundle from disk (memory-mapped)
+        
+        Blocking - from async code use ensure_loaded. A bundle whose
+        feature schema differs from the current feature pipeline is not
+        loaded (retrain instead). Returns whether models are ready.
+        """
         try:
-            for stat_type in self.models:
-                model_file = self.model_path / f"{stat_type}_model.pkl"
-                scaler_file = self.model_path / f"{stat_type}_scaler.pkl"
-                
-                with open(model_file, 'wb') as f:
-                    pickle.dump(self.models[stat_type], f)
-                
-                with open(scaler_file, 'wb') as f:
-                    pickle.dump(self.scalers[stat_type], f)
+            bundle = model_store.load_current()
+            if bundle is None:
+                logger.info("No saved model bundle - train models first")
+                return self.is_trained
             
-            logger.info(f"Models saved to {self.model_path}")
-        except Exception as e:
-            logger.error(f"Error saving models: {e}")
-    
-    def load_models(self):
-        """Load pre-trained models from disk"""
-        try:
-            for stat_type in self.stat_types:
-                model_file = self.model_path / f"{stat_type}_model.pkl"
-                scaler_file = self.model_path / f"{stat_type}_scaler.pkl"
-                
-                if model_file.exists() and scaler_file.exists():
-                    with open(model_file, 'rb') as f:
-                        self.models[stat_type] = pickle.load(f)
-                    
-                    with open(scaler_file, 'rb') as f:
-                        self.scalers[stat_type] = pickle.load(f)
+            expected = self._feature_schema(bundle.engine, list(bundle.models), bundle.shared_stats)
+            if bundle.feature_schema != expected:
+                logger.warning(f"Model bundle {bundle.version} was trained on other features - retrain")
+                return self.is_trained
             
-            self.is_trained = len(self.models) > 0
-            logger.info(f"Loaded {len(self.models)} pre-trained models")
+            self.bundle = bundle
+            logger.info(f"Loaded model bundle {bundle.version} ({bundle.engine}, {len(bundle.models)} models)")
             return True
             
         except Exception as e:
             logger.error(f"Error loading models: {e}")
-            return False
+            return self.is_trained
+    
+    def start_preload(self):
+        """Load the current bundle in the background (the first requests then find it ready)"""
+        if self._load_task is None or self._load_task.done():
+            self._load_task = asyncio.create_task(asyncio.to_thread(self.load_models))
+    
+    async def ensure_loaded(self) -> bool:
+        """
+        Are models ready? If not, load the current bundle off the event
+        loop - concurrent callers (and the startup preload) share one load.
+        """
+        if not self.is_trained:
+            self.start_preload()
+            await asyncio.shield(self._load_task)
+        return self.is_trained
     
     async def simulate_with_ml(
         self,
@@ -379,15 +495,18 @@ class MLGameSimulator:
         season_averages: SeasonAverages,
         recent_games: List[GameStats],
         num_simulations: int = 100,
-        is_home: bool = True
+        is_home: bool = True,
+        backend: Optional[str] = None,
+        seed: Optional[int] = None
     ) -> List[GameStats]:
         """
         Simulate games using ML predictions with realistic variance
+        
+        The same seed (and trained models) reproduces the same games.
         """
-        if not self.is_trained:
-            # Try to load pre-trained models
-            if not self.load_models():
-                raise ValueError("No trained models available. Train models first.")
+        # Try to load pre-trained models
+        if not await self.ensure_loaded():
+            raise ValueError("No trained models available. Train models first.")
         
         # Get ML predictions
         ml_predictions = self.predict_player_performance(
@@ -397,40 +516,50 @@ class MLGameSimulator:
             is_home
         )
         
-        simulations = []
+        # Add realistic variance to ML predictions - all draws at once, sharded
+        # across processes for large runs
+        draws = await simulation_pool.draw_ml(ml_predictions, num_simulations, seed=seed, backend=backend)
         
-        for _ in range(num_simulations):
-            # Add realistic variance to ML predictions
-            simulated_stats = {}
-            
-            for stat_type, predicted_value in ml_predictions.items():
-                # Add Gaussian noise (15-25% std dev based on stat type)
-                if stat_type in ['steals', 'blocks']:
-                    std_dev = predicted_value * 0.40  # Higher variance for defensive stats
-                elif stat_type in ['assists', 'rebounds']:
-                    std_dev = predicted_value * 0.25
-                else:
-                    std_dev = predicted_value * 0.20
-                
-                simulated_value = np.random.normal(predicted_value, std_dev)
-                simulated_stats[stat_type] = max(0, int(round(simulated_value)))
-            
-            # Create GameStats object
-            game_date = datetime.now() + timedelta(days=1)
-            
+        game_date = datetime.now() + timedelta(days=1)
+        simulations = []
+        for index in range(num_simulations):
             sim_game = GameStats(
-                game_id=f"ML_SIM_{player_info.player_id}_{game_date.strftime('%Y%m%d')}_{_}",
+                game_id=f"ML_SIM_{player_info.player_id}_{game_date.strftime('%Y%m%d')}_{index}",
                 player_id=player_info.player_id,
                 game_date=game_date,
                 opponent="TBD",
                 is_home=is_home,
-                **simulated_stats
+                **{stat_type: int(values[index]) for stat_type, values in draws.items()}
             )
             
             sim_game.fantasy_score = sim_game.calculate_fantasy_score()
             simulations.append(sim_game)
         
         return simulations
+    
+    async def simulate_batch_with_ml(
+        self,
+        players: List[Tuple[SeasonAverages, List[GameStats], bool]],
+        num_simulations: int = 100,
+        backend: Optional[str] = None,
+        seed: Optional[int] = None
+    ) -> List[Dict[str, np.ndarray]]:
+        """
+        ML simulations of many players - one {stat: draws} dict per player
+        
+        Predictions come from one predict_batch call. Player i draws with
+        derive_seed(seed, i), so simulate_with_ml with that seed replays it.
+        """
+        # Try to load pre-trained models
+        if not await self.ensure_loaded():
+            raise ValueError("No trained models available. Train models first.")
+        
+        seed = resolve_seed(seed)
+        predictions = self.predict_batch(players)
+        return await asyncio.gather(*(
+            simulation_pool.draw_ml(player_predictions, num_simulations, seed=derive_seed(seed, index), backend=backend)
+            for index, player_predictions in enumerate(predictions)
+        ))
 
 
 # Singleton instance
@@ -0,0 +1,154 @@
+"""
+Model Bundle - Versioned ML model artifacts, memory-mapped on load
+"""
+import json
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import joblib
+import sklearn
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Bump when the bundle layout changes - older bundles are not loaded
+BUNDLE_FORMAT = 1
+
+# Bundles kept on disk: the current one and the ones before it (for rollback)
+BUNDLES_KEPT = 3
+
+
+class ModelBundle:
+    """
+    Everything one training run produced: each stat's model and scaler,
+    the feature schema they expect, and the engine, training season and
+    metrics.
+
+    A bundle is never modified after it is built - the simulator swaps
+    whole bundles, so a prediction never mixes models from two trainings.
+    """
+
+    def __init__(
+        self,
+        engine: str,
+        models: Dict[str, Any],
+        scalers: Dict[str, Any],
+        shared_stats: List[str],
+        feature_schema: Dict[str, List[str]],
+        training: Dict[str, Any],
+        metrics: Dict[str, Dict],
+        version: Optional[str] = None,
+        created_at: Optional[datetime] = None
+    ):
+        self.engine = engine
+        self.models = models
+        self.scalers = scalers
+        self.shared_stats = shared_stats  # multi_output: the stats the shared model predicts, in order
+        self.feature_schema = feature_schema  # Feature names per stat ("shared" for multi_output)
+        self.training = training  # season, min_games, samples
+        self.metrics = metrics  # Accuracy scores per stat
+        self.created_at = created_at or datetime.now()
+        self.version = version or self.created_at.strftime("%Y%m%dT%H%M%S%f")
+
+    def metadata(self) -> Dict[str, Any]:
+        """Everything but the models (JSON-safe)"""
+        return {
+            "format": BUNDLE_FORMAT,
+            "version": self.version,
+            "engine": self.engine,
+            "stats": list(self.models),
+            "shared_stats": self.shared_stats,
+            "feature_schema": self.feature_schema,
+            "training": self.training,
+            "metrics": self.metrics,
+            "created_at": self.created_at.isoformat(timespec="seconds"),
+            "sklearn_version": sklearn.__version__
+        }
+
+
+class ModelStore:
+    """
+    Model bundles on disk
+
+    Each bundle is one uncompressed joblib file, so its NumPy arrays are
+    memory-mapped on load instead of copied. current.json names the live
+    bundle; it is replaced atomically once a new bundle is fully written,
+    so a reader (another worker, a restart) sees the old bundle or the new
+    one, never a partial write.
+    """
+
+    def __init__(self, model_dir: str):
+        self.model_dir = Path(model_dir)
+
+    @property
+    def _pointer(self) -> Path:
+        return self.model_dir / "current.json"
+
+    def _path(self, version: str) -> Path:
+        return self.model_dir / f"bundle-{version}.joblib"
+
+    def save(self, bundle: ModelBundle):
+        """Write a bundle and make it the current one"""
+        self.model_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(bundle.version)
+        tmp_path = path.with_name(f"{path.name}.tmp")
+        joblib.dump(
+            {"metadata": bundle.metadata(), "models": bundle.models, "scalers": bundle.scalers},
+            tmp_path
+        )
+        os.replace(tmp_path, path)
+
+        tmp_pointer = self._pointer.with_name("current.json.tmp")
+        tmp_pointer.write_text(json.dumps({"version": bundle.version, "file": path.name}))
+        os.replace(tmp_pointer, self._pointer)
+        logger.info(f"💾 Model bundle {bundle.version} saved to {path}")
+
+        self._prune(keep=path)
+
+    def _prune(self, keep: Path):
+        """Delete all but the newest BUNDLES_KEPT bundles"""
+        bundles = sorted(self.model_dir.glob("bundle-*.joblib"), reverse=True)
+        for path in bundles[BUNDLES_KEPT:]:
+            if path != keep:
+                path.unlink(missing_ok=True)
+
+    def current_version(self) -> Optional[str]:
+        """Version of the current bundle (None if there is none)"""
+        if not self._pointer.exists():
+            return None
+        return json.loads(self._pointer.read_text())["version"]
+
+    def load_current(self) -> Optional[ModelBundle]:
+        """The current bundle, memory-mapped (None if there is none or it is an older format)"""
+        if not self._pointer.exists():
+            return None
+        path = self.model_dir / json.loads(self._pointer.read_text())["file"]
+
+        data = joblib.load(path, mmap_mode="r")
+        metadata = data["metadata"]
+        if metadata["format"] != BUNDLE_FORMAT:
+            logger.warning(f"Model bundle {path} has format {metadata['format']}, expected {BUNDLE_FORMAT} - retrain")
+            return None
+        if metadata["sklearn_version"] != sklearn.__version__:
+            logger.warning(f"Model bundle {path} was built with scikit-learn {metadata['sklearn_version']} "
+                           f"(running {sklearn.__version__})")
+
+        return ModelBundle(
+            engine=metadata["engine"],
+            models=data["models"],
+            scalers=data["scalers"],
+            shared_stats=metadata["shared_stats"],
+            feature_schema=metadata["feature_schema"],
+            training=metadata["training"],
+            metrics=metadata["metrics"],
+            version=metadata["version"],
+            created_at=datetime.fromisoformat(metadata["created_at"])
+        )
+
+
+# Global instance
+model_store = ModelStore(settings.ml_model_dir)
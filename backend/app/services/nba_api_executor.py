@@ -0,0 +1,133 @@
+"""
+NBA API Executor - Run blocking nba_api calls off the event loop
+"""
+import asyncio
+import functools
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from app.config import settings
+from app.services.rate_limiter import nba_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+
+class NBAApiExecutor:
+    """
+    Bounded thread pool for the synchronous nba_api endpoints
+
+    nba_api uses blocking HTTP requests, so calling it directly inside an
+    async route freezes the event loop for every user. run() executes the
+    call on a fixed-size pool instead: at most max_workers upstream requests
+    are in flight, extra calls queue, and unrelated endpoints keep responding.
+
+    Timeouts and cancellation apply to the awaiting coroutine: a call that
+    has not started yet is dropped from the queue, while a call that is
+    already running finishes in its thread and its result is discarded.
+    """
+
+    def __init__(self, max_workers: int = 8, timeout: float = 15.0):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        # Stats
+        self.calls = 0
+        self.in_flight = 0
+        self.timeouts = 0
+        self.cancelled = 0
+        self.errors = 0
+        self.total_call_time = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="nba_api"
+            )
+        return self._executor
+
+    async def run(
+        self,
+        func: Callable[..., Any],
+        *args,
+        endpoint: Optional[str] = None,
+        timeout: Optional[float] = None,
+        **kwargs
+    ) -> Any:
+        """
+        Run func(*args, **kwargs) on the pool and await the result
+
+        If endpoint is given (e.g. "playergamelog") the call first waits for
+        the shared rate limiter's budget for that endpoint.
+
+        Raises asyncio.TimeoutError if the call (including time spent queued
+        for a worker) takes longer than timeout seconds (default: the
+        executor timeout).
+        """
+        if endpoint is None:
+            return await self._run(func, args, kwargs, timeout)
+
+        async with nba_rate_limiter.acquire(endpoint):
+            return await self._run(func, args, kwargs, timeout)
+
+    async def _run(
+        self,
+        func: Callable[..., Any],
+        args: tuple,
+        kwargs: Dict[str, Any],
+        timeout: Optional[float]
+    ) -> Any:
+        loop = asyncio.get_running_loop()
+        call = functools.partial(func, *args, **kwargs)
+        timeout = self.timeout if timeout is None else timeout
+
+        self.calls += 1
+        self.in_flight += 1
+        start_time = time.monotonic()
+        try:
+            return await asyncio.wait_for(
+                loop.run_in_executor(self._get_executor(), call),
+                timeout=timeout
+            )
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            logger.warning(f"nba_api call {getattr(func, '__name__', func)} timed out after {timeout}s")
+            raise
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            self.in_flight -= 1
+            self.total_call_time += time.monotonic() - start_time
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Executor statistics"""
+        return {
+            "max_workers": self.max_workers,
+            "timeout_seconds": self.timeout,
+            "calls": self.calls,
+            "in_flight": self.in_flight,
+            "timeouts": self.timeouts,
+            "cancelled": self.cancelled,
+            "errors": self.errors,
+            "avg_call_seconds": round(self.total_call_time / self.calls, 3) if self.calls else 0.0
+        }
+
+    def shutdown(self):
+        """Stop the worker threads (queued calls are cancelled)"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Shared by every service that talks to stats.nba.com
+nba_api_executor = NBAApiExecutor(
+    max_workers=settings.nba_api_max_workers,
+    timeout=settings.nba_api_timeout
+)
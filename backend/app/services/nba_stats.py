@@ -5,10 +5,14 @@ from datetime import datetime, timedelta
 import pandas as pd
 from app.models import PlayerInfo, GameStats, SeasonAverages
 from app.config import settings
+from app.services.nba_api_executor import nba_api_executor
+from app.services.stats_cache import stats_cache, is_completed_season, NO_EXPIRY
+from app.services.stats_store import stats_store
+from app.services.player_directory import player_directory
+from app.services.single_flight import single_flight
 import json
 import time
 from functools import wraps
-from nba_api.stats.static import players as nba_players
 from nba_api.stats.endpoints import playergamelog, commonplayerinfo, playercareerstats
 
 def retry_with_backoff(max_retries=3, initial_delay=1):
@@ -51,183 +55,275 @@ class NBAStatsService:
             'Referer': 'https://www.nba.com/',
             'Connection': 'keep-alive',
         }
-        self._last_request_time = 0
-        self._min_request_interval = 1.2  # Increased to 1.2 seconds between requests to avoid rate limiting
+        # Upstream requests are throttled by the shared nba_rate_limiter,
+        # cached in the process-wide stats_cache (TTLs per data type) and
+        # persisted in the SQLite stats_store
         
-        # Add simple in-memory cache with timestamps
-        self._cache = {}
-        self._cache_ttl = 600  # Cache for 10 minutes (600 seconds) - longer cache to reduce API calls
-        
-    async def _rate_limit(self):
-        """Enforce rate limiting between API calls"""
-        current_time = time.time()
-        time_since_last = current_time - self._last_request_time
-        if time_since_last < self._min_request_interval:
-            await asyncio.sleep(self._min_request_interval - time_since_last)
-        self._last_request_time = time.time()
-    
-    def _get_from_cache(self, cache_key: str) -> Optional[Any]:
-        """Get value from cache if not expired"""
-        if cache_key in self._cache:
-            value, timestamp = self._cache[cache_key]
-            if time.time() - timestamp < self._cache_ttl:
-                print(f"  ✅ Using cached data for {cache_key}")
-                return value
-            else:
-                # Expired, remove from cache
-                del self._cache[cache_key]
-        return None
+    def _get_from_cache(self, kind: str, cache_key: str) -> Optional[Any]:
+        """Get value from the shared stats cache if not expired"""
+        value = stats_cache.get(kind, cache_key)
+        if value is not None:
+            print(f"  ✅ Using cached data for {cache_key}")
+        return value
     
-    def _set_cache(self, cache_key: str, value: Any):
-        """Store value in cache with timestamp"""
-        self._cache[cache_key] = (value, time.time())
+    def _set_cache(self, kind: str, cache_key: str, value: Any, ttl: Optional[float] = None):
+        """Store value in the shared stats cache (ttl defaults to the kind's TTL)"""
+        stats_cache.set(kind, cache_key, value, ttl)
     
     async def get_player_info(self, player_name: str) -> Optional[PlayerInfo]:
-        """Get player information by name using nba_api - searches both active and inactive players"""
+        """Get player information by name - searches both active and inactive players"""
         try:
-            await self._rate_limit()
-            
-            # Search active players first
-            all_players = nba_players.get_active_players()
-            
-            # Find player by name (case insensitive)
-            found_players = [p for p in all_players if player_name.lower() in p['full_name'].lower()]
+            # Indexed exact / prefix / fuzzy lookup (active players first)
+            player = player_directory.lookup(player_name)
             
-            # If not found in active, search inactive (for injured/traded players)
-            if not found_players:
-                all_players = nba_players.get_inactive_players()
-                found_players = [p for p in all_players if player_name.lower() in p['full_name'].lower()]
-            
-            if not found_players:
+            if not player:
                 print(f"Player not found: {player_name}")
                 return None
             
-            player = found_players[0]
-            
-            # Get additional player info
-            try:
-                player_info = commonplayerinfo.CommonPlayerInfo(player_id=player['id'])
-                player_data = player_info.get_data_frames()[0]
-                
-                return PlayerInfo(
-                    player_id=player['id'],
-                    full_name=player['full_name'],
-                    first_name=player['first_name'],
-                    last_name=player['last_name'],
-                    team_id=int(player_data['TEAM_ID'].iloc[0]) if not player_data.empty else 0,
-                    team_name=str(player_data['TEAM_NAME'].iloc[0]) if not player_data.empty else "",
-                    team_abbreviation=str(player_data['TEAM_ABBREVIATION'].iloc[0]) if not player_data.empty else "",
-                    position=str(player_data['POSITION'].iloc[0]) if not player_data.empty else ""
-                )
-            except:
-                # Fallback if additional info fails
-                return PlayerInfo(
-                    player_id=player['id'],
-                    full_name=player['full_name'],
-                    first_name=player['first_name'],
-                    last_name=player['last_name'],
-                    team_id=0,
-                    team_name="",
-                    team_abbreviation="",
-                    position=""
-                )
+            return await self._build_player_info(player)
                 
         except Exception as e:
             print(f"Error fetching player info: {e}")
             return None
     
+    async def _build_player_info(self, player: Dict[str, Any]) -> PlayerInfo:
+        """PlayerInfo for a static player record, with team info when available"""
+        # Get additional player info
+        try:
+            team_info = await self.get_player_team_info(player['id'])
+        except Exception:
+            # Fallback if additional info fails (cancellation still propagates)
+            team_info = {}
+        
+        return PlayerInfo(
+            player_id=player['id'],
+            full_name=player['full_name'],
+            first_name=player['first_name'],
+            last_name=player['last_name'],
+            team_id=team_info.get('team_id', 0),
+            team_name=team_info.get('team_name', ""),
+            team_abbreviation=team_info.get('team_abbreviation', ""),
+            position=team_info.get('position', "")
+        )
+    
+    async def get_players_data(self, player_names: List[str], last_n_games: int = 10) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Player info, season averages and recent games for several players at once
+        
+        Each distinct player is fetched once, however many names resolve to
+        it, and every player's three lookups run concurrently - a 6-leg
+        ticket waits for its slowest player, not for 18 serial round-trips.
+        
+        Returns {player_name: {"player_info", "season_averages", "recent_games"}},
+        with None for names that match no player.
+        """
+        players: Dict[int, Dict[str, Any]] = {}
+        player_ids: Dict[str, Optional[int]] = {}
+        for player_name in player_names:
+            player = player_directory.lookup(player_name)
+            if not player:
+                print(f"Player not found: {player_name}")
+            player_ids[player_name] = player['id'] if player else None
+            if player:
+                players[player['id']] = player
+        
+        async def fetch(player: Dict[str, Any]) -> Dict[str, Any]:
+            player_info, season_averages, recent_games = await asyncio.gather(
+                self._build_player_info(player),
+                self.get_player_season_averages(player['id']),
+                self.get_player_game_log(player['id'], last_n_games=last_n_games)
+            )
+            return {
+                "player_info": player_info,
+                "season_averages": season_averages,
+                "recent_games": recent_games
+            }
+        
+        results = await asyncio.gather(*(fetch(player) for player in players.values()))
+        data = dict(zip(players, results))
+        return {
+            player_name: data[player_id] if player_id is not None else None
+            for player_name, player_id in player_ids.items()
+        }
+    
+    async def get_player_team_info(self, player_id: int) -> Dict[str, Any]:
+        """
+        Current team and position for a player from commonplayerinfo
+        
+        Memoized in the shared stats cache; returns {} if nba_api has no info.
+        """
+        cache_key = f"player_info_{player_id}"
+        cached_result = self._get_from_cache("player_info", cache_key)
+        if cached_result is not None:
+            return cached_result
+        
+        # Concurrent callers share one upstream fetch
+        return await single_flight.do(
+            ("player_info", player_id),
+            lambda: self._fetch_player_team_info(player_id, cache_key)
+        )
+    
+    async def _fetch_player_team_info(self, player_id: int, cache_key: str) -> Dict[str, Any]:
+        player_data = await nba_api_executor.run(
+            lambda: commonplayerinfo.CommonPlayerInfo(player_id=player_id, timeout=10).get_data_frames()[0],
+            endpoint="commonplayerinfo"
+        )
+        
+        team_info = {}
+        if not player_data.empty:
+            team_info = {
+                'team_id': int(player_data['TEAM_ID'].iloc[0]),
+                'team_name': str(player_data['TEAM_NAME'].iloc[0]),
+                'team_abbreviation': str(player_data['TEAM_ABBREVIATION'].iloc[0]),
+                'position': str(player_data['POSITION'].iloc[0])
+            }
+        
+        self._set_cache("player_info", cache_key, team_info)
+        return team_info
+    
     @retry_with_backoff(max_retries=2, initial_delay=2)
     async def get_player_game_log(self, player_id: int, season: str = "2024-25", last_n_games: int = 10) -> List[GameStats]:
-        """Get recent game logs for a player using nba_api with retry logic and caching"""
+        """
+        Get recent game logs for a player with retry logic and caching
+        
+        The full season log is kept once per player (memory cache -> persistent
+        store -> nba_api); any last_n_games is a slice of it.
+        """
         try:
-            # Check cache first
-            cache_key = f"gamelog_{player_id}_{season}_{last_n_games}"
-            cached_result = self._get_from_cache(cache_key)
-            if cached_result is not None:
-                return cached_result
-            
-            # Add delay to avoid rate limiting
-            await self._rate_limit()
-            
-            # Use nba_api library to get game log with reduced timeout
-            gamelog = playergamelog.PlayerGameLog(player_id=player_id, season=season, timeout=10)
-            df = gamelog.get_data_frames()[0]
-            
-            if df.empty:
-                return []
-            
-            # Limit to last N games
-            df = df.head(last_n_games)
-            
-            game_stats = []
-            for _, row in df.iterrows():
-                try:
-                    game_date = pd.to_datetime(row['GAME_DATE'])
-                except:
-                    game_date = datetime.now()
-                
-                # Parse matchup to determine opponent and home/away
-                matchup = str(row['MATCHUP'])
-                is_home = 'vs.' in matchup
-                # Extract opponent abbreviation
-                opponent = matchup.split()[-1] if matchup else ""
-                
-                game_stat = GameStats(
-                    game_id=str(row['Game_ID']),
-                    player_id=player_id,
-                    game_date=game_date,
-                    opponent=opponent,
-                    is_home=is_home,
-                    minutes_played=self._parse_minutes(str(row.get('MIN', ''))) if pd.notna(row.get('MIN')) else None,
-                    points=int(row['PTS']) if pd.notna(row.get('PTS')) else None,
-                    rebounds=int(row['REB']) if pd.notna(row.get('REB')) else None,
-                    assists=int(row['AST']) if pd.notna(row.get('AST')) else None,
-                    steals=int(row['STL']) if pd.notna(row.get('STL')) else None,
-                    blocks=int(row['BLK']) if pd.notna(row.get('BLK')) else None,
-                    turnovers=int(row['TOV']) if pd.notna(row.get('TOV')) else None,
-                    field_goals_made=int(row['FGM']) if pd.notna(row.get('FGM')) else None,
-                    field_goals_attempted=int(row['FGA']) if pd.notna(row.get('FGA')) else None,
-                    three_pointers_made=int(row['FG3M']) if pd.notna(row.get('FG3M')) else None,
-                    three_pointers_attempted=int(row['FG3A']) if pd.notna(row.get('FG3A')) else None,
-                    free_throws_made=int(row['FTM']) if pd.notna(row.get('FTM')) else None,
-                    free_throws_attempted=int(row['FTA']) if pd.notna(row.get('FTA')) else None,
-                    plus_minus=int(row['PLUS_MINUS']) if pd.notna(row.get('PLUS_MINUS')) else None
-                )
-                
-                # Calculate fantasy score
-                game_stat.fantasy_score = game_stat.calculate_fantasy_score()
-                game_stats.append(game_stat)
-            
-            # Cache the result
-            self._set_cache(cache_key, game_stats)
-            return game_stats
+            # Concurrent callers for the same player/season share one fetch
+            season_games = await single_flight.do(
+                ("gamelog", player_id, season),
+                lambda: self._get_season_game_log(player_id, season)
+            )
+            return season_games[:last_n_games]
             
         except Exception as e:
             print(f"Error fetching game log: {e}")
             return []
     
+    async def _get_season_game_log(self, player_id: int, season: str) -> List[GameStats]:
+        """Full season game log, most recent game first"""
+        # Check cache first
+        cache_key = f"gamelog_{player_id}_{season}"
+        cached_result = self._get_from_cache("gamelog", cache_key)
+        if cached_result is not None:
+            return cached_result
+        
+        # Then the persistent store, which survives restarts
+        stored = await stats_store.get_game_log(player_id, season)
+        stored_games = [GameStats.model_validate(game) for game in stored[0]] if stored is not None else []
+        if stored is not None and stored[1]:
+            self._set_cache("gamelog", cache_key, stored_games)
+            return stored_games
+        
+        # Incremental sync: only ask for games since the latest stored game date
+        # (inclusive, so a game stored mid-day is refreshed; duplicates are merged by game_id)
+        date_from = ""
+        if stored_games and settings.game_log_incremental_sync:
+            date_from = stored_games[0].game_date.strftime('%m/%d/%Y')
+        
+        # Use nba_api library to get game log with reduced timeout (rate limited, off the event loop)
+        df = await nba_api_executor.run(
+            lambda: playergamelog.PlayerGameLog(
+                player_id=player_id, season=season, date_from_nullable=date_from, timeout=10
+            ).get_data_frames()[0],
+            endpoint="playergamelog"
+        )
+        
+        new_games = self._parse_game_log(df, player_id) if not df.empty else []
+        if not new_games and not stored_games:
+            return []
+        
+        await stats_store.save_game_log(
+            player_id, season, [game.model_dump(mode="json") for game in new_games]
+        )
+        
+        new_ids = {game.game_id for game in new_games}
+        season_games = new_games + [game for game in stored_games if game.game_id not in new_ids]
+        season_games.sort(key=lambda game: game.game_date, reverse=True)
+        
+        # Cache the result
+        self._set_cache("gamelog", cache_key, season_games)
+        return season_games
+    
+    def _parse_game_log(self, df: pd.DataFrame, player_id: int) -> List[GameStats]:
+        """Convert a PlayerGameLog data frame (most recent game first) to GameStats"""
+        game_stats = []
+        for _, row in df.iterrows():
+            try:
+                game_date = pd.to_datetime(row['GAME_DATE'])
+            except:
+                game_date = datetime.now()
+            
+            # Parse matchup to determine opponent and home/away
+            matchup = str(row['MATCHUP'])
+            is_home = 'vs.' in matchup
+            # Extract opponent abbreviation
+            opponent = matchup.split()[-1] if matchup else ""
+            
+            game_stat = GameStats(
+                game_id=str(row['Game_ID']),
+                player_id=player_id,
+                game_date=game_date,
+                opponent=opponent,
+                is_home=is_home,
+                minutes_played=self._parse_minutes(str(row.get('MIN', ''))) if pd.notna(row.get('MIN')) else None,
+                points=int(row['PTS']) if pd.notna(row.get('PTS')) else None,
+                rebounds=int(row['REB']) if pd.notna(row.get('REB')) else None,
+                assists=int(row['AST']) if pd.notna(row.get('AST')) else None,
+                steals=int(row['STL']) if pd.notna(row.get('STL')) else None,
+                blocks=int(row['BLK']) if pd.notna(row.get('BLK')) else None,
+                turnovers=int(row['TOV']) if pd.notna(row.get('TOV')) else None,
+                field_goals_made=int(row['FGM']) if pd.notna(row.get('FGM')) else None,
+                field_goals_attempted=int(row['FGA']) if pd.notna(row.get('FGA')) else None,
+                three_pointers_made=int(row['FG3M']) if pd.notna(row.get('FG3M')) else None,
+                three_pointers_attempted=int(row['FG3A']) if pd.notna(row.get('FG3A')) else None,
+                free_throws_made=int(row['FTM']) if pd.notna(row.get('FTM')) else None,
+                free_throws_attempted=int(row['FTA']) if pd.notna(row.get('FTA')) else None,
+                plus_minus=int(row['PLUS_MINUS']) if pd.notna(row.get('PLUS_MINUS')) else None
+            )
+            
+            # Calculate fantasy score
+            game_stat.fantasy_score = game_stat.calculate_fantasy_score()
+            game_stats.append(game_stat)
+        
+        return game_stats
+    
     @retry_with_backoff(max_retries=3, initial_delay=2)
     async def get_player_season_averages(self, player_id: int, season: str = "2024-25") -> Optional[SeasonAverages]:
-        """Get season averages for a player using nba_api with retry logic and caching"""
+        """Get season averages for a player (memory cache -> persistent store -> nba_api)"""
+        # Concurrent callers for the same player/season share one fetch
+        return await single_flight.do(
+            ("season_avg", player_id, season),
+            lambda: self._get_season_averages(player_id, season)
+        )
+    
+    async def _get_season_averages(self, player_id: int, season: str) -> Optional[SeasonAverages]:
         try:
             # Check cache first
             cache_key = f"season_avg_{player_id}_{season}"
-            cached_result = self._get_from_cache(cache_key)
+            cached_result = self._get_from_cache("season_avg", cache_key)
             if cached_result is not None:
                 return cached_result
             
-            # Add delay to avoid rate limiting
-            await self._rate_limit()
-            
-            # Use career stats endpoint to get season averages with reduced timeout
-            career_stats = playercareerstats.PlayerCareerStats(player_id=player_id, timeout=10)
-            df = career_stats.get_data_frames()[0]  # SeasonTotalsRegularSeason
+            # Then the stored career rows, else the career stats endpoint (rate limited, off the event loop)
+            career_rows = await stats_store.get_career_stats(player_id, season)
+            if career_rows is not None:
+                df = pd.DataFrame(career_rows)
+            else:
+                df = await nba_api_executor.run(
+                    lambda: playercareerstats.PlayerCareerStats(player_id=player_id, timeout=10).get_data_frames()[0],  # SeasonTotalsRegularSeason
+                    endpoint="playercareerstats"
+                )
+                if not df.empty:
+                    await stats_store.save_career_stats(player_id, df.to_dict("records"))
             
             if df.empty:
                 return None
             
             # Get the specified season stats
             season_data = df[df['SEASON_ID'] == season]
+            is_exact_season = not season_data.empty
             
             if season_data.empty:
                 # If exact season not found, get the most recent season
@@ -256,8 +352,11 @@ class NBAStatsService:
                 free_throw_percentage=float(row['FT_PCT']) if pd.notna(row.get('FT_PCT')) else 0.0
             )
             
-            # Cache the result
-            self._set_cache(cache_key, season_avg)
+            # Cache the result - a completed season never changes, keep it for the process lifetime
+            self._set_cache(
+                "season_avg", cache_key, season_avg,
+                ttl=NO_EXPIRY if is_exact_season and is_completed_season(season) else None
+            )
             return season_avg
                 
         except Exception as e:
@@ -6,6 +6,7 @@ from app.models import (
     UserAccount, Bet, BetSlip, BetStatus, BetType, PropType, 
     Leaderboard, BettingStats, Portfolio
 )
+from app.services.random_streams import make_rng, resolve_seed
 import json
 from collections import defaultdict
 import logging
@@ -272,29 +273,32 @@ class PaperBettingService:
         
         return leaderboard_entries[:limit]
     
-    async def simulate_bet_settlement(self, bet_id: str, win_probability: float = 0.5) -> Bet:
-        """Simulate bet settlement for testing (randomly determine outcome)"""
-        import random
-        
+    async def simulate_bet_settlement(self, bet_id: str, win_probability: float = 0.5, seed: Optional[int] = None) -> Bet:
+        """Simulate bet settlement for testing (randomly determine outcome, replayable with the bet's settlement_seed)"""
         bet = self.bets.get(bet_id)
         if not bet:
             raise ValueError("Bet not found")
         
+        seed = resolve_seed(seed)
+        rng = make_rng(seed)
+        
         # Simulate a result based on the line and bet type
-        if random.random() < win_probability:
+        if rng.random() < win_probability:
             # Make it a winning bet
             if bet.bet_type == BetType.OVER:
-                actual_result = bet.line_value + random.uniform(0.5, 5.0)
+                actual_result = bet.line_value + rng.uniform(0.5, 5.0)
             else:  # UNDER
-                actual_result = bet.line_value - random.uniform(0.5, 5.0)
+                actual_result = bet.line_value - rng.uniform(0.5, 5.0)
         else:
             # Make it a losing bet
             if bet.bet_type == BetType.OVER:
-                actual_result = bet.line_value - random.uniform(0.5, 5.0)
+                actual_result = bet.line_value - rng.uniform(0.5, 5.0)
             else:  # UNDER
-                actual_result = bet.line_value + random.uniform(0.5, 5.0)
+                actual_result = bet.line_value + rng.uniform(0.5, 5.0)
         
-        return await self.settle_bet(bet_id, max(0, actual_result))  # Ensure non-negative
+        bet = await self.settle_bet(bet_id, max(0, float(actual_result)))  # Ensure non-negative
+        bet.settlement_seed = seed
+        return bet
     
     async def reset_user_balance(self, user_id: str) -> UserAccount:
         """Reset user balance to starting amount (for testing/demo purposes)"""
@@ -0,0 +1,149 @@
+"""
+Player Directory - In-memory name index over nba_api's static player list
+"""
+import difflib
+import logging
+import re
+import time
+import unicodedata
+from typing import Any, Dict, List, Optional
+
+from nba_api.stats.static import players as nba_players
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_name(name: str) -> str:
+    """
+    Fold a player name to a lookup key
+
+    Strips accents ("Luka Dončić" -> "luka doncic"), lowercases, drops
+    periods and apostrophes ("P.J. Tucker" -> "pj tucker") and turns
+    hyphens into spaces.
+    """
+    folded = unicodedata.normalize("NFKD", name)
+    folded = "".join(c for c in folded if not unicodedata.combining(c)).lower()
+    folded = re.sub(r"[.'’`]", "", folded)
+    folded = re.sub(r"[^a-z0-9]+", " ", folded)
+    return folded.strip()
+
+
+class PlayerDirectory:
+    """
+    Exact, prefix and fuzzy player lookup without scanning the player list
+
+    Built once from the static (bundled) active and inactive player lists:
+    - exact index: normalized full name -> player ids
+    - prefix index: every prefix of the normalized full name and of each
+      name part ("luka", "don", "doncic", "luka don") -> player ids
+    - fuzzy fallback: difflib over normalized full names, only on a miss
+
+    Active players rank ahead of inactive ones.
+    """
+
+    def __init__(self):
+        self._players: Dict[int, Dict[str, Any]] = {}
+        self._exact: Dict[str, List[int]] = {}
+        self._prefix: Dict[str, List[int]] = {}
+        self._names: List[str] = []
+        self.build_seconds = 0.0
+
+        # Stats
+        self.lookups = 0
+        self.fuzzy_lookups = 0
+
+    @property
+    def is_built(self) -> bool:
+        return bool(self._players)
+
+    def build(self):
+        """(Re)build the indexes from nba_api's static player data"""
+        start_time = time.monotonic()
+        players: Dict[int, Dict[str, Any]] = {}
+        exact: Dict[str, List[int]] = {}
+        prefix: Dict[str, List[int]] = {}
+
+        # Active first, so every id list is already ranked
+        for player in nba_players.get_active_players() + nba_players.get_inactive_players():
+            if player["id"] in players:
+                continue
+            players[player["id"]] = player
+
+            key = normalize_name(player["full_name"])
+            exact.setdefault(key, []).append(player["id"])
+
+            parts = key.split()
+            for i in range(len(parts)):
+                tail = " ".join(parts[i:])
+                for end in range(1, len(tail) + 1):
+                    ids = prefix.setdefault(tail[:end], [])
+                    if not ids or ids[-1] != player["id"]:
+                        ids.append(player["id"])
+
+        self._players = players
+        self._exact = exact
+        self._prefix = prefix
+        self._names = list(exact)
+        self.build_seconds = time.monotonic() - start_time
+        logger.info(f"Player directory built: {len(players)} players in {self.build_seconds:.3f}s")
+
+    def get(self, player_id: int) -> Optional[Dict[str, Any]]:
+        """Static player record by id"""
+        if not self.is_built:
+            self.build()
+        return self._players.get(player_id)
+
+    def search(self, name: str, limit: int = 10, active_only: bool = False) -> List[Dict[str, Any]]:
+        """
+        Players matching a name, best match first
+
+        Active before inactive players, exact before prefix matches, then
+        (only if both miss) fuzzy matches ranked by similarity.
+        """
+        if not self.is_built:
+            self.build()
+
+        self.lookups += 1
+        key = normalize_name(name)
+        if not key:
+            return []
+
+        # Stable sort keeps exact ahead of prefix matches within active / inactive
+        candidate_ids = sorted(
+            self._exact.get(key, []) + self._prefix.get(key, []),
+            key=lambda player_id: not self._players[player_id]["is_active"]
+        )
+        if not candidate_ids:
+            self.fuzzy_lookups += 1
+            for match in difflib.get_close_matches(key, self._names, n=limit * 2, cutoff=0.75):
+                candidate_ids.extend(self._exact[match])
+
+        results = []
+        seen = set()
+        for player_id in candidate_ids:
+            player = self._players[player_id]
+            if player_id in seen or (active_only and not player["is_active"]):
+                continue
+            seen.add(player_id)
+            results.append(player)
+            if len(results) >= limit:
+                break
+        return results
+
+    def lookup(self, name: str, active_only: bool = False) -> Optional[Dict[str, Any]]:
+        """Best matching player for a name, or None"""
+        matches = self.search(name, limit=1, active_only=active_only)
+        return matches[0] if matches else None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "players": len(self._players),
+            "prefix_keys": len(self._prefix),
+            "build_seconds": round(self.build_seconds, 3),
+            "lookups": self.lookups,
+            "fuzzy_lookups": self.fuzzy_lookups
+        }
+
+
+# Built at startup, shared by NBAStatsService and NBAScheduleService
+player_directory = PlayerDirectory()
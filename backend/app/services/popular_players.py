@@ -2,11 +2,13 @@
 Popular Players Service - Get star players with PrizePicks lines for betting
 """
 
-from typing import List, Dict, Optional
+from typing import AsyncIterator, List, Dict, Optional
 from datetime import datetime
-from app.services.schedule import NBAScheduleService
-from app.services.nba_stats import NBAStatsService
-from nba_api.stats.endpoints import commonteamroster
+from app.config import settings
+from app.services.schedule import schedule_service
+from app.services.nba_stats import nba_stats_service
+from app.services.player_directory import normalize_name
+from nba_api.stats.library.parameters import Season
 import asyncio
 
 # Popular players by team (star players who are commonly on PrizePicks)
@@ -102,8 +104,9 @@ class PopularPlayersService:
     """Service to get popular players with PrizePicks-style lines"""
     
     def __init__(self):
-        self.schedule_service = NBAScheduleService()
-        self.nba_stats = NBAStatsService()
+        # Shared service singletons (and the process-wide stats cache behind them)
+        self.schedule_service = schedule_service
+        self.nba_stats = nba_stats_service
     
     async def get_popular_players_for_today(self) -> List[Dict]:
         """
@@ -135,168 +138,274 @@ class PopularPlayersService:
         - Injured players (no games in last 7 days)
         - Players without scheduled games
         - Players with no recent stats
+        
+        Players are returned in schedule order (home team first), including
+        the players found for games that hit the slate timeout.
+        """
+        game_results = [game_result async for game_result in self.iter_slate(day)]
+        game_results.sort(key=lambda game_result: game_result["index"])
+        
+        popular_players = []
+        for game_result in game_results:
+            popular_players.extend(game_result["players"])
+        return popular_players
+    
+    async def iter_slate(self, day: str, timeout: Optional[float] = None) -> AsyncIterator[Dict]:
+        """
+        Build the slate concurrently and yield one result per game as it completes
+        
+        Rosters, game logs and season averages for every team are fetched in
+        parallel (at most settings.slate_max_concurrency at a time, all under
+        the shared nba_api rate limiter). Each result has:
+        - index, game_id, matchup, home_team, away_team, game_date
+        - status: "complete", "partial" (roster unavailable or timed out) or "failed"
+        - players: popular players found so far
+        - skipped: [{player_name, team, reason}] for players left out
+        - elapsed_seconds
+        
+        Games still running after timeout seconds (default settings.slate_timeout)
+        are cancelled and yielded as "partial" with whatever players they have.
         """
         # Get games
         if day == "today":
-            games = self.schedule_service.get_todays_games()
+            games = await self.schedule_service.get_todays_games()
         else:
-            games = self.schedule_service.get_tomorrows_games()
+            games = await self.schedule_service.get_tomorrows_games()
         
         if not games:
-            return []
-        
-        popular_players = []
+            return
+        
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
+        deadline = start_time + (settings.slate_timeout if timeout is None else timeout)
+        semaphore = asyncio.Semaphore(settings.slate_max_concurrency)
+        
+        tasks = {}
+        for index, game in enumerate(games):
+            game_result = {
+                "index": index,
+                "game_id": game['game_id'],
+                "matchup": game.get('matchup', f"{game['away_team']} @ {game['home_team']}"),
+                "home_team": game['home_team'],
+                "away_team": game['away_team'],
+                "game_date": game['game_date'],
+                "status": "complete",
+                "players": [],
+                "skipped": [],
+                "elapsed_seconds": 0.0
+            }
+            task = asyncio.create_task(self._build_game(game, game_result, semaphore))
+            tasks[task] = (game, game_result)
         
-        # For each game, get popular players from both teams
-        for game in games:
-            # Get popular players from home team
-            home_players = await self._get_team_popular_players(
-                game['home_team_id'],
-                game['home_team'],
-                game['away_team'],
-                game['game_date']
-            )
-            popular_players.extend(home_players)
+        pending = set(tasks)
+        try:
+            while pending:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                
+                done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    _, game_result = tasks[task]
+                    if task.exception() is not None:
+                        print(f"❌ Error building {game_result['matchup']}: {task.exception()}")
+                        game_result["status"] = "failed"
+                    game_result["elapsed_seconds"] = round(loop.time() - start_time, 2)
+                    self._sort_game_players(game_result)
+                    yield game_result
             
-            # Get popular players from away team
-            away_players = await self._get_team_popular_players(
-                game['away_team_id'],
-                game['away_team'],
-                game['home_team'],
-                game['game_date']
+            # Slate timeout - report what the unfinished games have so far
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            for task in pending:
+                game, game_result = tasks[task]
+                print(f"⏱️  Slate timeout - {game_result['matchup']} has {len(game_result['players'])} players so far")
+                game_result["status"] = "partial"
+                accounted = {p["player_name"] for p in game_result["players"] + game_result["skipped"]}
+                for team_id, team_name in ((game['home_team_id'], game['home_team']), (game['away_team_id'], game['away_team'])):
+                    game_result["skipped"].extend(
+                        {"player_name": name, "team": team_name, "reason": "timed out"}
+                        for name in POPULAR_PLAYERS.get(team_id, []) if name not in accounted
+                    )
+                game_result["elapsed_seconds"] = round(loop.time() - start_time, 2)
+                self._sort_game_players(game_result)
+                yield game_result
+            pending = set()
+        finally:
+            # Consumer stopped early (e.g. client disconnected)
+            for task in pending:
+                task.cancel()
+    
+    async def _build_game(self, game: Dict, game_result: Dict, semaphore: asyncio.Semaphore):
+        """Fetch popular players from both teams of a game into game_result"""
+        await asyncio.gather(
+            self._add_team_players(
+                game_result, semaphore,
+                game['home_team_id'], game['home_team'], game['away_team'], game['game_date']
+            ),
+            self._add_team_players(
+                game_result, semaphore,
+                game['away_team_id'], game['away_team'], game['home_team'], game['game_date']
             )
-            popular_players.extend(away_players)
-        
-        return popular_players
+        )
     
-    async def _get_team_popular_players(
-        self, 
+    async def _add_team_players(
+        self,
+        game_result: Dict,
+        semaphore: asyncio.Semaphore,
         team_id: int, 
         team_name: str, 
         opponent: str,
         game_date: str
-    ) -> List[Dict]:
-        """Get popular players from a specific team (excludes injured players)
+    ):
+        """Add popular players from a specific team to game_result (excludes injured players)
         
         Note: If NBA API has issues (timeouts, rate limits), we allow players through
         rather than blocking everyone. This prevents empty results when API is slow.
         """
-        players = []
-        
         # Get list of popular players for this team
         popular_names = POPULAR_PLAYERS.get(team_id, [])
         
         if not popular_names:
-            return []
+            return
         
         print(f"🔍 Fetching roster for {team_name} (ID: {team_id})...")
         
-        # Get team roster with shorter timeout and delay
-        try:
-            import time
-            time.sleep(0.8)  # Add 800ms delay before each roster request
-            roster = commonteamroster.CommonTeamRoster(team_id=team_id, timeout=10)  # Reduced timeout to 10 seconds
-            roster_df = roster.get_data_frames()[0]
-            print(f"✅ Got roster for {team_name} - {len(roster_df)} players")
-        except Exception as e:
-            error_msg = str(e)
-            if 'timeout' in error_msg.lower() or 'timed out' in error_msg.lower():
-                print(f"⏱️  Timeout getting roster for {team_name} - NBA API is slow, skipping")
-            else:
-                print(f"❌ Error getting roster for team {team_id} ({team_name}): {e}")
-            print(f"⚠️  Skipping {team_name} - continuing with other teams")
+        # Get team roster (cached / stored, rate limited, off the event loop)
+        async with semaphore:
+            roster = await self.schedule_service.get_team_roster(team_id, season=Season.default)
+        
+        if not roster:
+            print(f"⚠️  Skipping {team_name} - roster unavailable, continuing with other teams")
             # NO FALLBACK - Skip this team if API fails
-            return []
+            game_result["status"] = "partial"
+            game_result["skipped"].extend(
+                {"player_name": name, "team": team_name, "reason": "roster unavailable"}
+                for name in popular_names
+            )
+            return
         
-        # Find each popular player and get their stats
-        for player_name in popular_names:
-            try:
-                # Find player in roster
-                player_row = roster_df[roster_df['PLAYER'].str.contains(player_name, case=False, na=False)]
-                
-                if player_row.empty:
-                    continue
-                
-                player_id = int(player_row.iloc[0]['PLAYER_ID'])
-                # Try to pull position from roster row if available (e.g., 'G', 'F-C', etc.)
-                try:
-                    position = str(player_row.iloc[0]['POSITION']) if 'POSITION' in player_row.columns else ''
-                except Exception:
-                    position = ''
-                
-                # Check if player is healthy (not injured/out)
-                # Check recent game activity - if they haven't played in last 7 days, likely injured
-                # BUT: If NBA API fails, allow player through (don't be too strict)
-                try:
-                    recent_games = await self.nba_stats.get_player_game_log(player_id, last_n_games=5)
-                    if not recent_games or len(recent_games) == 0:
-                        print(f"⚠️  Skipping {player_name} - No recent games (likely injured or inactive)")
-                        continue
-                    
-                    # Check if their last game was recent (within 7 days)
-                    from datetime import datetime, timedelta
-                    last_game_date = recent_games[0].game_date if recent_games else None
-                    if last_game_date:
-                        try:
-                            last_game_dt = datetime.strptime(last_game_date, "%Y-%m-%d")
-                            days_since_last_game = (datetime.now() - last_game_dt).days
-                            if days_since_last_game > 7:
-                                print(f"⚠️  Skipping {player_name} - Last game was {days_since_last_game} days ago (likely injured)")
-                                continue
-                        except:
-                            pass  # If date parsing fails, continue anyway
-                    
-                except Exception as e:
-                    print(f"⚠️  Could not verify injury status for {player_name}: {e}")
-                    # If we can't verify, ALLOW PLAYER THROUGH (NBA API might be down)
-                    # This is less strict than blocking them
-                    print(f"✅  Allowing {player_name} through despite verification failure")
-                    pass  # Continue to next step instead of skipping
+        print(f"✅ Got roster for {team_name} - {len(roster)} players")
+        
+        # Find each popular player and get their stats, all players in parallel
+        await asyncio.gather(*[
+            self._add_player(game_result, semaphore, roster, player_name, team_name, opponent, game_date)
+            for player_name in popular_names
+        ])
+    
+    async def _add_player(
+        self,
+        game_result: Dict,
+        semaphore: asyncio.Semaphore,
+        roster: List[Dict],
+        player_name: str,
+        team_name: str,
+        opponent: str,
+        game_date: str
+    ):
+        """Fetch one popular player's stats and add them to game_result (or record why not)"""
+        def skip(reason: str):
+            game_result["skipped"].append({"player_name": player_name, "team": team_name, "reason": reason})
+        
+        try:
+            # Find player in roster (accent-insensitive)
+            name_key = normalize_name(player_name)
+            roster_player = next(
+                (p for p in roster if name_key in normalize_name(str(p['player_name']))),
+                None
+            )
+            
+            if roster_player is None:
+                skip("not on roster")
+                return
+            
+            player_id = int(roster_player['player_id'])
+            # Position from the roster (e.g., 'G', 'F-C', etc.)
+            position = str(roster_player.get('position') or '')
+            
+            async with semaphore:
+                recent_games, season_avg = await asyncio.gather(
+                    self.nba_stats.get_player_game_log(player_id, last_n_games=5),
+                    self.nba_stats.get_player_season_averages(player_id),
+                    return_exceptions=True
+                )
+            
+            # Check if player is healthy (not injured/out)
+            # Check recent game activity - if they haven't played in last 7 days, likely injured
+            # BUT: If NBA API fails, allow player through (don't be too strict)
+            if isinstance(recent_games, Exception):
+                print(f"⚠️  Could not verify injury status for {player_name}: {recent_games}")
+                # If we can't verify, ALLOW PLAYER THROUGH (NBA API might be down)
+                print(f"✅  Allowing {player_name} through despite verification failure")
+            else:
+                if not recent_games:
+                    print(f"⚠️  Skipping {player_name} - No recent games (likely injured or inactive)")
+                    skip("no recent games")
+                    return
                 
-                # Get player stats
-                print(f"  📊 Fetching season averages for {player_name}...")
+                # Check if their last game was recent (within 7 days)
+                last_game_date = recent_games[0].game_date
                 try:
-                    season_avg = await self.nba_stats.get_player_season_averages(player_id)
-                    
-                    if not season_avg:
-                        print(f"  ⚠️  No season stats available for {player_name}")
-                        continue
-                    
-                    print(f"  ✅ Got stats for {player_name}: {round(season_avg.points_per_game, 1)} PPG")
-                except Exception as e:
-                    print(f"  ❌ Error getting stats for {player_name}: {e}")
-                    continue
-                
-                # Determine player tier and get appropriate lines
-                lines = self._get_prizepicks_lines(season_avg)
-                
-                player_data = {
-                    "player_id": player_id,
-                    "player_name": player_name,
-                    "team": team_name,
-                    "opponent": opponent,
-                    "game_date": game_date,
-                    "position": position,
-                    "season_averages": {
-                        "points": round(season_avg.points_per_game, 1),
-                        "rebounds": round(season_avg.rebounds_per_game, 1),
-                        "assists": round(season_avg.assists_per_game, 1),
-                        "steals": round(season_avg.steals_per_game, 1),
-                        "turnovers": round(season_avg.turnovers, 1) if hasattr(season_avg, 'turnovers') else 0,
-                        "threes_made": round(season_avg.three_pointers_made, 1) if hasattr(season_avg, 'three_pointers_made') else 0,
-                        "blocks": round(season_avg.blocks_per_game, 1),
-                        "games_played": season_avg.games_played
-                    },
-                    "prizepicks_lines": lines
-                }
-                
-                players.append(player_data)
-                
-            except Exception as e:
-                print(f"Error processing player {player_name}: {e}")
-                continue
+                    last_game_dt = datetime.strptime(last_game_date, "%Y-%m-%d")
+                    days_since_last_game = (datetime.now() - last_game_dt).days
+                    if days_since_last_game > 7:
+                        print(f"⚠️  Skipping {player_name} - Last game was {days_since_last_game} days ago (likely injured)")
+                        skip("no games in the last 7 days")
+                        return
+                except:
+                    pass  # If date parsing fails, continue anyway
+            
+            # Get player stats
+            if isinstance(season_avg, Exception):
+                print(f"  ❌ Error getting stats for {player_name}: {season_avg}")
+                skip("season stats unavailable")
+                return
+            
+            if not season_avg:
+                print(f"  ⚠️  No season stats available for {player_name}")
+                skip("no season stats")
+                return
+            
+            print(f"  ✅ Got stats for {player_name}: {round(season_avg.points_per_game, 1)} PPG")
+            
+            # Determine player tier and get appropriate lines
+            lines = self._get_prizepicks_lines(season_avg)
+            
+            game_result["players"].append({
+                "player_id": player_id,
+                "player_name": player_name,
+                "team": team_name,
+                "opponent": opponent,
+                "game_date": game_date,
+                "position": position,
+                "season_averages": {
+                    "points": round(season_avg.points_per_game, 1),
+                    "rebounds": round(season_avg.rebounds_per_game, 1),
+                    "assists": round(season_avg.assists_per_game, 1),
+                    "steals": round(season_avg.steals_per_game, 1),
+                    "turnovers": round(season_avg.turnovers, 1) if hasattr(season_avg, 'turnovers') else 0,
+                    "threes_made": round(season_avg.three_pointers_made, 1) if hasattr(season_avg, 'three_pointers_made') else 0,
+                    "blocks": round(season_avg.blocks_per_game, 1),
+                    "games_played": season_avg.games_played
+                },
+                "prizepicks_lines": lines
+            })
+            
+        except Exception as e:
+            print(f"Error processing player {player_name}: {e}")
+            skip("error")
+    
+    def _sort_game_players(self, game_result: Dict):
+        """Order a game's players like the serial slate did: home team first, then POPULAR_PLAYERS order"""
+        def rank(player: Dict):
+            team_names = next(
+                (names for names in POPULAR_PLAYERS.values() if player["player_name"] in names),
+                []
+            )
+            return (player["team"] != game_result["home_team"], team_names.index(player["player_name"]) if team_names else 0)
         
-        return players
+        game_result["players"].sort(key=rank)
     
     def _round_to_half(self, value: float) -> float:
         """
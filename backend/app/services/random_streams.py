@@ -0,0 +1,37 @@
+"""
+Random Streams - Seeded, reproducible NumPy generators for simulations
+"""
+import secrets
+from typing import Optional
+
+import numpy as np
+
+# Seeds are returned in JSON responses - keep them exact as JavaScript numbers
+MAX_SEED = 2 ** 53 - 1
+
+
+def new_seed() -> int:
+    """A fresh random seed"""
+    return secrets.randbits(53)
+
+
+def resolve_seed(seed: Optional[int]) -> int:
+    """The caller's seed, or a fresh one to report back"""
+    return new_seed() if seed is None else seed
+
+
+def make_rng(seed: int, *key: int) -> np.random.Generator:
+    """
+    Generator for stream key of a run seeded with seed
+
+    Streams with different keys (per player, leg, game or shard) are
+    statistically independent, and a stream depends only on (seed, key):
+    not on how many other streams exist or the order they are drawn in.
+    """
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=key))
+
+
+def derive_seed(seed: int, *key: int) -> int:
+    """A child seed for stream key - for work that takes a seed of its own (e.g. one game of a slate)"""
+    high, low = np.random.SeedSequence(seed, spawn_key=key).generate_state(2)
+    return ((int(high) << 32) | int(low)) & MAX_SEED
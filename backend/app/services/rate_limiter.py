@@ -0,0 +1,174 @@
+"""
+Rate Limiter - Async token-bucket limiter for stats.nba.com requests
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Optional, Tuple
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Per-endpoint budgets: (requests per second, burst size)
+# Every request also draws from the global bucket, which caps total throughput
+ENDPOINT_BUDGETS: Dict[str, Tuple[float, int]] = {
+    "playergamelog": (1.0, 3),
+    "playercareerstats": (1.0, 3),
+    "commonplayerinfo": (0.5, 2),
+    "commonteamroster": (0.5, 3),
+    "scoreboardv2": (0.5, 2),
+}
+
+
+class TokenBucket:
+    """Token bucket that refills at rate tokens/second up to capacity"""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def reserve(self) -> float:
+        """
+        Take one token and return how many seconds the caller must wait for it
+
+        The balance may go negative: each caller reserves its own slot in the
+        future, so concurrent callers are spaced out instead of racing. There
+        is no await in here, which makes the reservation atomic on the loop.
+        """
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+        self.tokens -= 1
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.rate
+
+
+class EndpointMetrics:
+    """Queue wait statistics for one endpoint"""
+
+    def __init__(self, window: int = 500):
+        self.requests = 0
+        self.throttled = 0
+        self.in_flight = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.recent_waits: Deque[float] = deque(maxlen=window)
+
+    def record(self, wait: float):
+        self.requests += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        self.recent_waits.append(wait)
+        if wait > 0.001:
+            self.throttled += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        waits = sorted(self.recent_waits)
+
+        def percentile(p: float) -> float:
+            if not waits:
+                return 0.0
+            return round(waits[min(len(waits) - 1, int(p * len(waits)))], 3)
+
+        return {
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "in_flight": self.in_flight,
+            "avg_wait_seconds": round(self.total_wait / self.requests, 3) if self.requests else 0.0,
+            "p50_wait_seconds": percentile(0.50),
+            "p95_wait_seconds": percentile(0.95),
+            "max_wait_seconds": round(self.max_wait, 3)
+        }
+
+
+class NBARateLimiter:
+    """
+    Shared limiter for every nba_api call
+
+    - A global token bucket caps overall requests/second while allowing bursts
+    - Each endpoint has its own budget on top of that (ENDPOINT_BUDGETS)
+    - At most max_in_flight requests run at the same time
+
+    Usage:
+        async with nba_rate_limiter.acquire("playergamelog"):
+            ...call upstream...
+    """
+
+    def __init__(
+        self,
+        rate: float = 1.5,
+        burst: int = 4,
+        max_in_flight: int = 4,
+        endpoint_budgets: Optional[Dict[str, Tuple[float, int]]] = None
+    ):
+        self.max_in_flight = max_in_flight
+        self._global = TokenBucket(rate, burst)
+        self._endpoint_budgets = endpoint_budgets if endpoint_budgets is not None else ENDPOINT_BUDGETS
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._metrics: Dict[str, EndpointMetrics] = {}
+        self._in_flight: Optional[asyncio.Semaphore] = None
+
+    def _bucket(self, endpoint: str) -> Optional[TokenBucket]:
+        if endpoint not in self._buckets and endpoint in self._endpoint_budgets:
+            rate, burst = self._endpoint_budgets[endpoint]
+            self._buckets[endpoint] = TokenBucket(rate, burst)
+        return self._buckets.get(endpoint)
+
+    def _endpoint_metrics(self, endpoint: str) -> EndpointMetrics:
+        if endpoint not in self._metrics:
+            self._metrics[endpoint] = EndpointMetrics()
+        return self._metrics[endpoint]
+
+    @asynccontextmanager
+    async def acquire(self, endpoint: str = "default") -> AsyncIterator[None]:
+        """Wait for an in-flight slot and a token, then hold the slot for the request"""
+        if self._in_flight is None:
+            self._in_flight = asyncio.Semaphore(self.max_in_flight)
+
+        metrics = self._endpoint_metrics(endpoint)
+        start_time = time.monotonic()
+
+        async with self._in_flight:
+            delay = self._global.reserve()
+            bucket = self._bucket(endpoint)
+            if bucket is not None:
+                delay = max(delay, bucket.reserve())
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            metrics.record(time.monotonic() - start_time)
+            metrics.in_flight += 1
+            try:
+                yield
+            finally:
+                metrics.in_flight -= 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Limiter configuration and queue wait metrics per endpoint"""
+        return {
+            "rate_per_second": self._global.rate,
+            "burst": self._global.capacity,
+            "max_in_flight": self.max_in_flight,
+            "endpoints": {
+                endpoint: {
+                    "budget": self._endpoint_budgets.get(endpoint),
+                    **metrics.to_dict()
+                }
+                for endpoint, metrics in self._metrics.items()
+            }
+        }
+
+
+# Shared by NBAStatsService, NBAScheduleService and PopularPlayersService
+nba_rate_limiter = NBARateLimiter(
+    rate=settings.nba_api_requests_per_second,
+    burst=settings.nba_api_burst,
+    max_in_flight=settings.nba_api_max_in_flight
+)
@@ -4,36 +4,30 @@ NBA Schedule Service - Get today's and upcoming games
 
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
-from nba_api.stats.endpoints import scoreboardv2
+from nba_api.stats.endpoints import scoreboardv2, commonteamroster
 import pandas as pd
+from app.services.nba_api_executor import nba_api_executor
+from app.services.stats_cache import stats_cache
+from app.services.stats_store import stats_store
+from app.services.player_directory import player_directory
+from app.services.nba_stats import nba_stats_service
+from app.services.single_flight import single_flight
 
 class NBAScheduleService:
-    """Service to get NBA game schedules"""
+    """Service to get NBA game schedules (cached in stats_cache, persisted in stats_store)"""
     
-    def __init__(self):
-        # Add simple in-memory cache with timestamps
-        self._cache = {}
-        self._cache_ttl = 600  # Cache for 10 minutes (600 seconds) - games don't change often
-        
-    def _get_from_cache(self, cache_key: str):
-        """Get value from cache if not expired"""
-        import time
-        if cache_key in self._cache:
-            value, timestamp = self._cache[cache_key]
-            if time.time() - timestamp < self._cache_ttl:
-                print(f"  ✅ Using cached games for {cache_key}")
-                return value
-            else:
-                # Expired, remove from cache
-                del self._cache[cache_key]
-        return None
+    def _get_from_cache(self, kind: str, cache_key: str):
+        """Get value from the shared stats cache if not expired"""
+        value = stats_cache.get(kind, cache_key)
+        if value is not None:
+            print(f"  ✅ Using cached data for {cache_key}")
+        return value
     
-    def _set_cache(self, cache_key: str, value):
-        """Store value in cache with timestamp"""
-        import time
-        self._cache[cache_key] = (value, time.time())
+    def _set_cache(self, kind: str, cache_key: str, value):
+        """Store value in the shared stats cache"""
+        stats_cache.set(kind, cache_key, value)
     
-    def get_games_for_date(self, date: datetime) -> List[Dict]:
+    async def get_games_for_date(self, date: datetime) -> List[Dict]:
         """
         Get all NBA games for a specific date (with caching)
         
@@ -46,24 +40,38 @@ class NBAScheduleService:
         - away_team_id
         - game_status
         """
+        # Concurrent callers for the same date share one fetch
+        return await single_flight.do(
+            ("games", date.strftime('%Y-%m-%d')),
+            lambda: self._get_games_for_date(date)
+        )
+    
+    async def _get_games_for_date(self, date: datetime) -> List[Dict]:
         try:
             # Format date for NBA API (YYYY-MM-DD format works)
             date_str = date.strftime('%Y-%m-%d')
             
             # Check cache first
             cache_key = f"games_{date_str}"
-            cached_result = self._get_from_cache(cache_key)
+            cached_result = self._get_from_cache("games", cache_key)
             if cached_result is not None:
                 return cached_result
             
+            # Then the persistent store, which survives restarts
+            stored_games = await stats_store.get_scoreboard(date_str)
+            if stored_games is not None:
+                for game in stored_games:
+                    game['game_date'] = datetime.fromisoformat(game['game_date'])
+                self._set_cache("games", cache_key, stored_games)
+                return stored_games
+            
             print(f"Fetching games for date: {date_str}")
             
-            # Get scoreboard for the date with reduced timeout
-            import time
-            time.sleep(0.5)  # Add delay before API call
-            scoreboard = scoreboardv2.ScoreboardV2(game_date=date_str, timeout=10)  # Reduced timeout to 10 seconds
-            games_df = scoreboard.get_data_frames()[0]  # GameHeader
-            line_score_df = scoreboard.get_data_frames()[1]  # LineScore
+            # Get scoreboard for the date with reduced timeout (rate limited, off the event loop)
+            games_df = await nba_api_executor.run(
+                lambda: scoreboardv2.ScoreboardV2(game_date=date_str, timeout=10).get_data_frames()[0],  # GameHeader
+                endpoint="scoreboardv2"
+            )
             
             print(f"Found {len(games_df)} games in API response")
             
@@ -112,25 +120,26 @@ class NBAScheduleService:
             
             print(f"Returning {len(games)} games")
             
-            # Cache the result
-            self._set_cache(cache_key, games)
+            # Cache and persist the result
+            self._set_cache("games", cache_key, games)
+            await stats_store.save_scoreboard(date_str, games)
             return games
             
         except Exception as e:
             print(f"Error fetching games for {date}: {e}")
             return []
     
-    def get_todays_games(self) -> List[Dict]:
+    async def get_todays_games(self) -> List[Dict]:
         """Get all games scheduled for today"""
         today = datetime.now()
-        return self.get_games_for_date(today)
+        return await self.get_games_for_date(today)
     
-    def get_tomorrows_games(self) -> List[Dict]:
+    async def get_tomorrows_games(self) -> List[Dict]:
         """Get all games scheduled for tomorrow"""
         tomorrow = datetime.now() + timedelta(days=1)
-        return self.get_games_for_date(tomorrow)
+        return await self.get_games_for_date(tomorrow)
     
-    def get_upcoming_games(self, days: int = 2) -> Dict[str, List[Dict]]:
+    async def get_upcoming_games(self, days: int = 2) -> Dict[str, List[Dict]]:
         """
         Get games for the next N days
         
@@ -141,27 +150,40 @@ class NBAScheduleService:
         for i in range(days):
             date = datetime.now() + timedelta(days=i)
             date_str = date.strftime('%Y-%m-%d')
-            games = self.get_games_for_date(date)
+            games = await self.get_games_for_date(date)
             
             if games:
                 games_by_date[date_str] = games
         
         return games_by_date
     
-    def get_team_roster(self, team_id: int, season: str = "2024-25") -> List[Dict]:
+    async def get_team_roster(self, team_id: int, season: str = "2024-25") -> List[Dict]:
         """
-        Get roster for a team
+        Get roster for a team (memory cache -> persistent store -> nba_api)
         Note: This is a simplified version - in production, use commonteamroster endpoint
         """
+        # Concurrent callers for the same team/season share one fetch
+        return await single_flight.do(
+            ("roster", team_id, season),
+            lambda: self._get_team_roster(team_id, season)
+        )
+    
+    async def _get_team_roster(self, team_id: int, season: str) -> List[Dict]:
         try:
-            from nba_api.stats.endpoints import commonteamroster
+            cache_key = f"roster_{team_id}_{season}"
+            cached_result = self._get_from_cache("roster", cache_key)
+            if cached_result is not None:
+                return cached_result
             
-            roster = commonteamroster.CommonTeamRoster(
-                team_id=team_id,
-                season=season
-            )
+            stored_players = await stats_store.get_roster(team_id, season)
+            if stored_players is not None:
+                self._set_cache("roster", cache_key, stored_players)
+                return stored_players
             
-            roster_df = roster.get_data_frames()[0]
+            roster_df = await nba_api_executor.run(
+                lambda: commonteamroster.CommonTeamRoster(team_id=team_id, season=season, timeout=10).get_data_frames()[0],
+                endpoint="commonteamroster"
+            )
             
             players = []
             for _, player in roster_df.iterrows():
@@ -175,13 +197,16 @@ class NBAScheduleService:
                     'weight': player.get('WEIGHT', '')
                 })
             
+            if players:
+                self._set_cache("roster", cache_key, players)
+                await stats_store.save_roster(team_id, season, players)
             return players
             
         except Exception as e:
             print(f"Error fetching roster for team {team_id}: {e}")
             return []
     
-    def find_game_by_team(self, team_abbrev: str, date: Optional[datetime] = None) -> Optional[Dict]:
+    async def find_game_by_team(self, team_abbrev: str, date: Optional[datetime] = None) -> Optional[Dict]:
         """
         Find a game for a specific team on a specific date
         If no date provided, search today and tomorrow
@@ -190,7 +215,7 @@ class NBAScheduleService:
             # Search today and tomorrow
             for i in range(2):
                 search_date = datetime.now() + timedelta(days=i)
-                games = self.get_games_for_date(search_date)
+                games = await self.get_games_for_date(search_date)
                 
                 for game in games:
                     if game['home_team'].upper() == team_abbrev.upper() or \
@@ -198,44 +223,39 @@ class NBAScheduleService:
                         return game
             return None
         else:
-            games = self.get_games_for_date(date)
+            games = await self.get_games_for_date(date)
             for game in games:
                 if game['home_team'].upper() == team_abbrev.upper() or \
                    game['away_team'].upper() == team_abbrev.upper():
                     return game
             return None
     
-    def find_player_game_today(self, player_name: str) -> Optional[Dict]:
+    async def find_player_game_today(self, player_name: str) -> Optional[Dict]:
         """
         Find if a player has a game today or tomorrow
         Returns game info with player's team marked
         """
-        from nba_api.stats.static import players as nba_players
+        # Find player (indexed lookup over active players)
+        player = player_directory.lookup(player_name, active_only=True)
         
-        # Find player
-        all_players = nba_players.get_active_players()
-        found_players = [p for p in all_players if player_name.lower() in p['full_name'].lower()]
-        
-        if not found_players:
+        if not player:
             return None
         
-        player = found_players[0]
-        
-        # Get player's current team (simplified - in production, use commonplayerinfo)
+        # Get player's current team (memoized commonplayerinfo lookup)
         try:
-            from nba_api.stats.endpoints import commonplayerinfo
-            player_info = commonplayerinfo.CommonPlayerInfo(player_id=player['id'])
-            player_data = player_info.get_data_frames()[0]
+            team_info = await nba_stats_service.get_player_team_info(player['id'])
             
-            if player_data.empty:
+            if not team_info:
                 return None
             
-            team_abbrev = str(player_data['TEAM_ABBREVIATION'].iloc[0])
+            team_abbrev = team_info['team_abbreviation']
             
             # Find game for this team
-            game = self.find_game_by_team(team_abbrev)
+            game = await self.find_game_by_team(team_abbrev)
             
             if game:
+                # Copy - the game dict is shared through the stats cache
+                game = dict(game)
                 game['player_name'] = player['full_name']
                 game['player_id'] = player['id']
                 game['player_team'] = team_abbrev
@@ -0,0 +1,171 @@
+"""
+Simulation Batch - Columnar (struct-of-arrays) result of a vectorized simulation
+"""
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.models import GameStats, PlayerInfo
+
+# Stat columns, in GameStats field order
+STAT_FIELDS = (
+    "minutes_played",
+    "points",
+    "rebounds",
+    "assists",
+    "steals",
+    "blocks",
+    "turnovers",
+    "field_goals_made",
+    "field_goals_attempted",
+    "three_pointers_made",
+    "three_pointers_attempted",
+    "free_throws_made",
+    "free_throws_attempted",
+    "plus_minus",
+)
+
+# Combo props (PrizePicks style) and the columns they add up
+COMBO_FIELDS = {
+    "pra": ("points", "rebounds", "assists"),
+    "pr": ("points", "rebounds"),
+    "pa": ("points", "assists"),
+    "ra": ("rebounds", "assists"),
+}
+
+# PrizePicks fantasy scoring: 1pt = 1, 1reb = 1.2, 1ast = 1.5, 1stl = 3, 1blk = 3, 1to = -1
+FANTASY_WEIGHTS = {
+    "points": 1.0,
+    "rebounds": 1.2,
+    "assists": 1.5,
+    "steals": 3.0,
+    "blocks": 3.0,
+    "turnovers": -1.0,
+}
+
+
+def wilson_interval(hits: int, n: int, z: float = 1.96) -> Tuple[float, float]:
+    """Wilson score interval for a hit rate of hits / n (95% for z = 1.96)"""
+    if n <= 0:
+        return 0.0, 1.0
+    p = hits / n
+    denominator = 1 + z * z / n
+    center = (p + z * z / (2 * n)) / denominator
+    half_width = z * np.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denominator
+    return float(max(center - half_width, 0.0)), float(min(center + half_width, 1.0))
+
+
+class SimulationBatch:
+    """
+    num_simulations simulated games stored as one NumPy array per stat
+
+    Replaces a list of GameStats for simulation output: no per-game
+    validation or objects, and derived values (fantasy score, PRA/PR/PA
+    combos, means) are computed over whole columns. Convert with
+    to_game_stats() / to_records() only at the response boundary.
+
+    Columns are read as attributes (batch.points) or by name
+    (batch["points"], batch["fantasy_score"], batch["pra"]).
+    """
+
+    __slots__ = STAT_FIELDS + ("_fantasy_score",)
+
+    def __init__(self, **columns: np.ndarray):
+        for field in STAT_FIELDS:
+            setattr(self, field, columns[field])
+        self._fantasy_score: Optional[np.ndarray] = None
+
+    @classmethod
+    def concatenate(cls, batches: List["SimulationBatch"]) -> "SimulationBatch":
+        """One batch holding the simulations of several (e.g. per-shard) batches, in order"""
+        if len(batches) == 1:
+            return batches[0]
+        return cls(**{
+            field: np.concatenate([getattr(batch, field) for batch in batches])
+            for field in STAT_FIELDS
+        })
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def __getitem__(self, key: str) -> np.ndarray:
+        if key == "fantasy_score":
+            return self.fantasy_score
+        if key in COMBO_FIELDS:
+            return self.combo(key)
+        if key in STAT_FIELDS:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in STAT_FIELDS or key in COMBO_FIELDS or key == "fantasy_score"
+
+    @property
+    def fantasy_score(self) -> np.ndarray:
+        """
+        Vectorized GameStats.calculate_fantasy_score
+
+        NaN where calculate_fantasy_score returns None (any of points,
+        rebounds, assists, steals or blocks is zero). Computed once.
+        """
+        if self._fantasy_score is None:
+            score = sum(getattr(self, field) * weight for field, weight in FANTASY_WEIGHTS.items())
+            has_all = (
+                (self.points != 0) & (self.rebounds != 0) & (self.assists != 0) &
+                (self.steals != 0) & (self.blocks != 0)
+            )
+            self._fantasy_score = np.where(has_all, np.round(score, 1), np.nan)
+        return self._fantasy_score
+
+    def combo(self, name: str) -> np.ndarray:
+        """Sum of a combo prop's columns, e.g. combo("pra") = points + rebounds + assists"""
+        return sum(getattr(self, field) for field in COMBO_FIELDS[name])
+
+    def means(self, fields: Optional[Iterable[str]] = None) -> Dict[str, float]:
+        """Average of each column (NaN-aware for fantasy_score)"""
+        fields = STAT_FIELDS if fields is None else fields
+        means = {}
+        for field in fields:
+            values = self[field]
+            if values.dtype.kind == 'f' and np.isnan(values).all():
+                means[field] = 0.0
+            else:
+                means[field] = float(np.nanmean(values))
+        return means
+
+    def to_records(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Plain-Python rows (fantasy_score None where undefined), one per simulation"""
+        size = len(self) if limit is None else min(limit, len(self))
+        columns = {field: getattr(self, field)[:size].tolist() for field in STAT_FIELDS}
+        fantasy_scores = self.fantasy_score[:size]
+        columns["fantasy_score"] = np.where(np.isnan(fantasy_scores), None, fantasy_scores).tolist()
+
+        return [
+            {field: values[i] for field, values in columns.items()}
+            for i in range(size)
+        ]
+
+    def to_game_stats(
+        self,
+        player_info: PlayerInfo,
+        opponent: Optional[str] = None,
+        is_home: bool = True,
+        limit: Optional[int] = None
+    ) -> List[GameStats]:
+        """Materialize GameStats objects (for callers that need individual games)"""
+        game_date = datetime.now() + timedelta(days=1)  # Future game
+        game_id = f"SIM_{player_info.player_id}_{game_date.strftime('%Y%m%d')}"
+
+        # Values come from our own typed arrays - skip per-game validation
+        return [
+            GameStats.model_construct(
+                game_id=game_id,
+                player_id=player_info.player_id,
+                game_date=game_date,
+                opponent=opponent or "TBD",
+                is_home=is_home,
+                **record
+            )
+            for record in self.to_records(limit)
+        ]
@@ -0,0 +1,238 @@
+"""
+Simulation Pool - Shard batch simulations across processes with deterministic seeding
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Literal, Optional, Tuple
+
+import numpy as np
+
+from app.config import settings
+from app.models import GameStats, SeasonAverages
+from app.services.game_simulator import game_simulator
+from app.services.random_streams import make_rng, resolve_seed
+from app.services.simulation_batch import SimulationBatch
+
+logger = logging.getLogger(__name__)
+
+SimulationBackend = Literal["auto", "inline", "process"]
+
+# Worker processes when none are configured - each one is a full copy of the app
+DEFAULT_MAX_WORKERS = 4
+
+
+def _chunk_sizes(total: int, size: int) -> List[int]:
+    """Split total into consecutive chunks of at most size"""
+    return [min(size, total - start) for start in range(0, total, size)]
+
+
+# Shard functions - module level so worker processes can unpickle them
+
+def _warm_up() -> int:
+    # Importing this module is the expensive part of a worker's first task
+    return os.getpid()
+
+
+def _simulate_players_shard(players, num_simulations: int, seed: int, shard: Tuple[int, ...]) -> List[SimulationBatch]:
+    return game_simulator.simulate_players_batch(players, num_simulations, rng=make_rng(seed, *shard))
+
+
+def _ticket_shard(legs, num_simulations: int, same_player_correlation: float, same_game_correlation: float,
+                  seed: int, shard: Tuple[int, ...]) -> Tuple[np.ndarray, np.ndarray]:
+    return game_simulator.ticket_hit_counts(
+        legs, num_simulations, same_player_correlation, same_game_correlation, rng=make_rng(seed, *shard)
+    )
+
+
+def _ml_shard(predictions: Dict[str, float], num_simulations: int, seed: int, shard: Tuple[int, ...]) -> Dict[str, np.ndarray]:
+    # Imported here: ml_simulator itself uses the pool
+    from app.services.ml_simulator import draw_ml_simulations
+    return draw_ml_simulations(predictions, num_simulations, make_rng(seed, *shard))
+
+
+class SimulationPool:
+    """
+    Runs batch simulations inline or sharded across a process pool
+
+    Work is cut into a fixed layout - chunks of shard_players players by
+    chunks of shard_simulations simulations - that does not depend on the
+    backend or the number of workers, and every shard draws from a
+    generator derived from the run seed and the shard's position
+    (random_streams.make_rng). The same seed gives the same results inline
+    or on any number of processes; shard results are concatenated
+    (batches) or summed (ticket counts). Callers resolve the seed first
+    (random_streams.resolve_seed) so they can report it.
+
+    Backends:
+    - "inline": shards run one after another on the calling thread
+    - "process": shards run in parallel on max_workers processes
+    - "auto": "process" once a call draws at least process_min_draws
+      player-simulations, "inline" below that (process start-up and
+      pickling cost more than small batches)
+    """
+
+    def __init__(
+        self,
+        backend: str = "auto",
+        max_workers: int = 0,
+        shard_players: int = 8,
+        shard_simulations: int = 25000,
+        process_min_draws: int = 500000
+    ):
+        self.backend = backend
+        self.max_workers = max_workers or min(os.cpu_count() or 1, DEFAULT_MAX_WORKERS)
+        self.shard_players = shard_players
+        self.shard_simulations = shard_simulations
+        self.process_min_draws = process_min_draws
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+        # Stats
+        self.runs: Dict[str, int] = {"inline": 0, "process": 0}
+        self.shards_run = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        # Created by the first call that runs on processes (or start() when the backend is "process")
+        if self._executor is None:
+            # spawn: workers never inherit the event loop or nba_api threads
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+            logger.info(f"Simulation process pool started ({self.max_workers} workers)")
+        return self._executor
+
+    def start(self):
+        """
+        Spawn and warm up the worker processes in the background - only
+        when every batch runs on them (backend "process"); with "auto" they
+        are spawned by the first batch large enough to need them
+        """
+        if self.backend != "process" or self.max_workers < 2:
+            return
+        executor = self._get_executor()
+        for _ in range(self.max_workers):
+            executor.submit(_warm_up)
+
+    def resolve_backend(self, backend: Optional[str], draws: int) -> str:
+        """The backend a call of draws player-simulations runs on"""
+        backend = backend or self.backend
+        if backend == "auto":
+            return "process" if draws >= self.process_min_draws and self.max_workers > 1 else "inline"
+        if backend not in ("inline", "process"):
+            raise ValueError(f"Unknown simulation backend: {backend}. Supported: auto, inline, process")
+        return backend
+
+    async def _run(self, backend: str, calls: List[Tuple[Callable, tuple]]) -> List[Any]:
+        """Run shard calls on the backend, results in call order"""
+        self.runs[backend] += 1
+        self.shards_run += len(calls)
+        if backend == "inline":
+            return [func(*args) for func, args in calls]
+
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        return await asyncio.gather(*(loop.run_in_executor(executor, func, *args) for func, args in calls))
+
+    async def simulate_players(
+        self,
+        players: List[Tuple[SeasonAverages, List[GameStats], bool]],
+        num_simulations: int,
+        seed: Optional[int] = None,
+        backend: Optional[str] = None
+    ) -> List[SimulationBatch]:
+        """game_simulator.simulate_players_batch, sharded by player and by simulation"""
+        if not players:
+            return []
+        seed = resolve_seed(seed)
+        player_chunks = _chunk_sizes(len(players), self.shard_players)
+        simulation_chunks = _chunk_sizes(int(num_simulations), self.shard_simulations)
+
+        calls = []
+        start = 0
+        for player_chunk, size in enumerate(player_chunks):
+            for simulation_chunk, simulations in enumerate(simulation_chunks):
+                calls.append((
+                    _simulate_players_shard,
+                    (players[start:start + size], simulations, seed, (player_chunk, simulation_chunk))
+                ))
+            start += size
+
+        results = await self._run(self.resolve_backend(backend, len(players) * int(num_simulations)), calls)
+
+        # Results are grouped by player chunk, then simulation chunk
+        batches = []
+        for player_chunk, size in enumerate(player_chunks):
+            shard_results = results[player_chunk * len(simulation_chunks):(player_chunk + 1) * len(simulation_chunks)]
+            for index in range(size):
+                batches.append(SimulationBatch.concatenate([shard[index] for shard in shard_results]))
+        return batches
+
+    async def simulate_ticket(
+        self,
+        legs: List[Dict[str, Any]],
+        num_simulations: int,
+        same_player_correlation: float = 0.0,
+        same_game_correlation: float = 0.0,
+        seed: Optional[int] = None,
+        backend: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """game_simulator.simulate_multi_leg_ticket, sharded by simulation"""
+        seed = resolve_seed(seed)
+        calls = [
+            (_ticket_shard, (legs, simulations, same_player_correlation, same_game_correlation, seed, (chunk,)))
+            for chunk, simulations in enumerate(_chunk_sizes(int(num_simulations), self.shard_simulations))
+        ]
+        results = await self._run(self.resolve_backend(backend, len(legs) * int(num_simulations)), calls)
+
+        leg_hits = sum(result[0] for result in results)
+        legs_hit_counts = sum(result[1] for result in results)
+        return game_simulator.ticket_result(legs, leg_hits, legs_hit_counts)
+
+    async def draw_ml(
+        self,
+        predictions: Dict[str, float],
+        num_simulations: int,
+        seed: Optional[int] = None,
+        backend: Optional[str] = None
+    ) -> Dict[str, np.ndarray]:
+        """ml_simulator.draw_ml_simulations, sharded by simulation"""
+        seed = resolve_seed(seed)
+        calls = [
+            (_ml_shard, (predictions, simulations, seed, (chunk,)))
+            for chunk, simulations in enumerate(_chunk_sizes(int(num_simulations), self.shard_simulations))
+        ]
+        results = await self._run(self.resolve_backend(backend, int(num_simulations)), calls)
+        return {
+            stat_type: np.concatenate([result[stat_type] for result in results])
+            for stat_type in predictions
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "backend": self.backend,
+            "max_workers": self.max_workers,
+            "process_pool_started": self._executor is not None,
+            "shard_players": self.shard_players,
+            "shard_simulations": self.shard_simulations,
+            "process_min_draws": self.process_min_draws,
+            "runs": dict(self.runs),
+            "shards_run": self.shards_run
+        }
+
+
+# Shared by the projection, ticket and ML simulation paths
+simulation_pool = SimulationPool(
+    backend=settings.simulation_backend,
+    max_workers=settings.simulation_workers,
+    shard_players=settings.simulation_shard_players,
+    shard_simulations=settings.simulation_shard_size,
+    process_min_draws=settings.simulation_process_min_draws
+)
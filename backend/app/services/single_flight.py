@@ -0,0 +1,73 @@
+"""
+Single Flight - Coalesce concurrent fetches of the same key into one upstream call
+"""
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    At most one in-flight fetch per key
+
+    Keys are tuples whose first element names the data type, e.g.
+    ("gamelog", player_id, season). The first caller for a key starts the
+    fetch as a task; callers arriving while it runs await the same task
+    instead of issuing their own upstream request.
+
+    The task is shielded from its callers: a caller that is cancelled (e.g.
+    client disconnected) does not cancel the fetch for everyone else, and
+    the result still lands in the cache for the next request.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Tuple[Hashable, ...], asyncio.Task] = {}
+        self._stats: Dict[Hashable, Dict[str, int]] = {}
+
+    def _kind_stats(self, kind: Hashable) -> Dict[str, int]:
+        if kind not in self._stats:
+            self._stats[kind] = {"fetches": 0, "coalesced": 0}
+        return self._stats[kind]
+
+    def start(self, key: Tuple[Hashable, ...], func: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        """Return the in-flight task for key, starting func() if there is none"""
+        stats = self._kind_stats(key[0])
+        task = self._calls.get(key)
+        if task is not None:
+            stats["coalesced"] += 1
+            return task
+
+        stats["fetches"] += 1
+        task = asyncio.ensure_future(func())
+        self._calls[key] = task
+
+        def _forget(done: asyncio.Task):
+            if self._calls.get(key) is done:
+                del self._calls[key]
+            # Mark the error as retrieved even if every caller went away
+            if not done.cancelled():
+                done.exception()
+
+        task.add_done_callback(_forget)
+        return task
+
+    async def do(self, key: Tuple[Hashable, ...], func: Callable[[], Awaitable[Any]]) -> Any:
+        """Await func() for key, sharing the call with concurrent callers"""
+        return await asyncio.shield(self.start(key, func))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Fetches started vs. callers coalesced onto an in-flight fetch, per data type"""
+        in_flight: Dict[Hashable, int] = {}
+        for key in self._calls:
+            in_flight[key[0]] = in_flight.get(key[0], 0) + 1
+
+        return {
+            str(kind): {**stats, "in_flight": in_flight.get(kind, 0)}
+            for kind, stats in self._stats.items()
+        }
+
+
+# Shared by NBAStatsService, NBAScheduleService and CacheWarmer
+single_flight = SingleFlight()
@@ -0,0 +1,142 @@
+"""
+Stats Cache - Process-wide LRU cache for NBA data shared by all services
+"""
+import logging
+import math
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Never expires (e.g. season averages of a completed season)
+NO_EXPIRY = math.inf
+
+# Default time-to-live per data type, in seconds
+DEFAULT_TTLS: Dict[str, float] = {
+    "gamelog": 600,        # Game logs change after every game
+    "season_avg": 600,     # Current-season averages (completed seasons use NO_EXPIRY)
+    "games": 600,          # Scoreboards / schedules
+    "roster": 3600,        # Team rosters
+    "player_info": 86400,  # Player team/position lookups
+}
+
+
+def is_completed_season(season: str, now: Optional[datetime] = None) -> bool:
+    """
+    True if an NBA season (e.g. "2023-24") is over, so its stats are final
+
+    Seasons end by July 1st of their second year (playoffs included).
+    """
+    try:
+        start_year = int(season[:4])
+    except (TypeError, ValueError):
+        return False
+
+    now = now or datetime.now()
+    return now >= datetime(start_year + 1, 7, 1)
+
+
+class CacheKindStats:
+    """Hit/miss counters for one data type"""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+        }
+
+
+class StatsCache:
+    """
+    Size-bounded LRU cache with a TTL per data type
+
+    Entries are keyed by (kind, key). Every NBAStatsService and
+    NBAScheduleService instance reads and writes the same cache, so a game
+    log fetched by one service is never fetched again by another.
+    """
+
+    def __init__(self, max_entries: int = 5000, ttls: Optional[Dict[str, float]] = None):
+        self.max_entries = max_entries
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[Any, float]]" = OrderedDict()
+        self._stats: Dict[str, CacheKindStats] = {}
+
+    def _kind_stats(self, kind: str) -> CacheKindStats:
+        if kind not in self._stats:
+            self._stats[kind] = CacheKindStats()
+        return self._stats[kind]
+
+    def get(self, kind: str, key: Hashable) -> Optional[Any]:
+        """Return a cached value, or None if it is missing or expired"""
+        stats = self._kind_stats(kind)
+        entry = self._entries.get((kind, key))
+
+        if entry is None:
+            stats.misses += 1
+            return None
+
+        value, expires_at = entry
+        if time.time() >= expires_at:
+            del self._entries[(kind, key)]
+            stats.expired += 1
+            stats.misses += 1
+            return None
+
+        self._entries.move_to_end((kind, key))
+        stats.hits += 1
+        return value
+
+    def set(self, kind: str, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Store a value; ttl defaults to the kind's TTL (NO_EXPIRY keeps it for the process lifetime)"""
+        if ttl is None:
+            ttl = self.ttls.get(kind, 600)
+
+        self._entries[(kind, key)] = (value, time.time() + ttl)
+        self._entries.move_to_end((kind, key))
+
+        while len(self._entries) > self.max_entries:
+            (evicted_kind, _), _ = self._entries.popitem(last=False)
+            self._kind_stats(evicted_kind).evictions += 1
+
+    def invalidate(self, kind: Optional[str] = None):
+        """Drop every entry, or only the entries of one kind"""
+        if kind is None:
+            self._entries.clear()
+            return
+
+        for entry_key in [k for k in self._entries if k[0] == kind]:
+            del self._entries[entry_key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache size and per-kind hit/miss counters"""
+        sizes: Dict[str, int] = {}
+        for kind, _ in self._entries:
+            sizes[kind] = sizes.get(kind, 0) + 1
+
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttls,
+            "kinds": {
+                kind: {"entries": sizes.get(kind, 0), **stats.to_dict()}
+                for kind, stats in self._stats.items()
+            }
+        }
+
+
+# Shared by every service instance in the process
+stats_cache = StatsCache(max_entries=settings.stats_cache_max_entries)
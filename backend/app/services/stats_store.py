@@ -0,0 +1,330 @@
+"""
+Stats Store - Persistent SQLite store for NBA data that survives restarts
+"""
+import asyncio
+import json
+import logging
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import aiosqlite
+
+from app.config import settings
+from app.services.stats_cache import DEFAULT_TTLS, is_completed_season
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS game_logs (
+    player_id INTEGER NOT NULL,
+    season TEXT NOT NULL,
+    game_id TEXT NOT NULL,
+    game_date TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (player_id, season, game_id)
+);
+CREATE INDEX IF NOT EXISTS idx_game_logs_date ON game_logs (player_id, season, game_date DESC);
+
+CREATE TABLE IF NOT EXISTS game_log_syncs (
+    player_id INTEGER NOT NULL,
+    season TEXT NOT NULL,
+    synced_at REAL NOT NULL,
+    PRIMARY KEY (player_id, season)
+);
+
+CREATE TABLE IF NOT EXISTS career_stats (
+    player_id INTEGER PRIMARY KEY,
+    rows TEXT NOT NULL,
+    synced_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS rosters (
+    team_id INTEGER NOT NULL,
+    season TEXT NOT NULL,
+    players TEXT NOT NULL,
+    synced_at REAL NOT NULL,
+    PRIMARY KEY (team_id, season)
+);
+
+CREATE TABLE IF NOT EXISTS scoreboards (
+    game_date TEXT PRIMARY KEY,
+    games TEXT NOT NULL,
+    synced_at REAL NOT NULL
+);
+"""
+
+
+def _synced_final(season: str, synced_at: float) -> bool:
+    """Was a season's data synced after the season ended (so it can no longer change)?"""
+    return is_completed_season(season, now=datetime.fromtimestamp(synced_at))
+
+
+def _to_json(value: Any) -> str:
+    """JSON-encode rows, turning datetimes (and anything else unusual) into strings"""
+    return json.dumps(value, default=lambda v: v.isoformat() if isinstance(v, datetime) else str(v))
+
+
+class StatsStore:
+    """
+    On-disk store for game logs, career stats, rosters and scoreboards
+
+    Sits between the in-memory stats_cache and nba_api: services read
+    cache -> store -> upstream and write fresh upstream data back to both,
+    so a restarted process serves warm data without calling stats.nba.com.
+
+    Rows carry the time they were synced. Data synced after its season or
+    date ended is final and always served; anything else is served while
+    it is younger than its data type's memory cache TTL (or max_age seconds
+    when set), so it is refetched as often as before - stale game logs
+    still seed the incremental sync. Store errors are logged and treated
+    as a miss - the store never fails a request.
+    """
+
+    def __init__(self, path: str = "data/stats.db", max_age: float = 0, enabled: bool = True):
+        self.path = path
+        self.max_age = max_age
+        self.enabled = enabled
+        self._db: Optional[aiosqlite.Connection] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+        # Stats
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.writes = 0
+        self.errors = 0
+
+    async def _connect(self) -> Optional[aiosqlite.Connection]:
+        """Open the database and create the tables on first use"""
+        if not self.enabled:
+            return None
+        if self._db is not None:
+            return self._db
+
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            if self._db is None:
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+                db = await aiosqlite.connect(self.path)
+                await db.execute("PRAGMA journal_mode=WAL")
+                await db.execute("PRAGMA synchronous=NORMAL")
+                await db.executescript(SCHEMA)
+                await db.commit()
+                self._db = db
+                logger.info(f"Stats store opened at {self.path}")
+        return self._db
+
+    def _max_age(self, kind: str) -> float:
+        """Seconds non-final rows of a data type (stats_cache kind) are served"""
+        return self.max_age or DEFAULT_TTLS[kind]
+
+    def _is_fresh(self, kind: str, synced_at: float, final: bool) -> bool:
+        if final or time.time() - synced_at <= self._max_age(kind):
+            return True
+        self.stale += 1
+        return False
+
+    async def _fetchone(self, query: str, params: tuple) -> Optional[tuple]:
+        try:
+            db = await self._connect()
+            if db is None:
+                return None
+            async with db.execute(query, params) as cursor:
+                return await cursor.fetchone()
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Stats store read failed: {e}")
+            return None
+
+    async def _write(self, statements: List[tuple]):
+        """Run (query, params) statements in one transaction"""
+        try:
+            db = await self._connect()
+            if db is None:
+                return
+            for query, params in statements:
+                if isinstance(params, list):
+                    await db.executemany(query, params)
+                else:
+                    await db.execute(query, params)
+            await db.commit()
+            self.writes += 1
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Stats store write failed: {e}")
+
+    def _record(self, found: bool):
+        if found:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    # Game logs
+
+    async def get_game_log(self, player_id: int, season: str) -> Optional[Tuple[List[Dict], bool]]:
+        """
+        All stored games for a player's season, most recent first, and
+        whether they are fresh (None if the season was never synced)
+
+        Stale games are still returned so the caller can sync incrementally
+        from the latest stored game instead of refetching the whole season.
+        """
+        sync = await self._fetchone(
+            "SELECT synced_at FROM game_log_syncs WHERE player_id = ? AND season = ?",
+            (player_id, season)
+        )
+        if sync is None:
+            self._record(False)
+            return None
+
+        try:
+            db = await self._connect()
+            async with db.execute(
+                "SELECT data FROM game_logs WHERE player_id = ? AND season = ? ORDER BY game_date DESC",
+                (player_id, season)
+            ) as cursor:
+                rows = await cursor.fetchall()
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Stats store read failed: {e}")
+            return None
+
+        fresh = self._is_fresh("gamelog", sync[0], _synced_final(season, sync[0]))
+        self._record(fresh)
+        return [json.loads(row[0]) for row in rows], fresh
+
+    async def save_game_log(self, player_id: int, season: str, games: List[Dict]):
+        """Upsert games (each needs game_id and game_date) and mark the season as synced"""
+        await self._write([
+            (
+                "INSERT INTO game_logs (player_id, season, game_id, game_date, data) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (player_id, season, game_id) DO UPDATE SET game_date = excluded.game_date, data = excluded.data "
+                "WHERE game_logs.data != excluded.data",
+                [
+                    (player_id, season, str(game["game_id"]), str(game["game_date"]), _to_json(game))
+                    for game in games
+                ]
+            ),
+            (
+                "INSERT OR REPLACE INTO game_log_syncs (player_id, season, synced_at) VALUES (?, ?, ?)",
+                (player_id, season, time.time())
+            )
+        ])
+
+    # Career stats (SeasonTotalsRegularSeason rows)
+
+    async def get_career_stats(self, player_id: int, season: Optional[str] = None) -> Optional[List[Dict]]:
+        """
+        Stored career rows for a player (None if missing or stale)
+
+        Rows past their max age are still served when season is given, was
+        synced after it ended and has a stored row - those totals can no
+        longer change.
+        """
+        row = await self._fetchone(
+            "SELECT rows, synced_at FROM career_stats WHERE player_id = ?",
+            (player_id,)
+        )
+        if row is None:
+            self._record(False)
+            return None
+
+        rows = json.loads(row[0])
+        final = (
+            season is not None
+            and _synced_final(season, row[1])
+            and any(r.get("SEASON_ID") == season for r in rows)
+        )
+        if not self._is_fresh("season_avg", row[1], final):
+            self._record(False)
+            return None
+
+        self._record(True)
+        return rows
+
+    async def save_career_stats(self, player_id: int, rows: List[Dict]):
+        await self._write([(
+            "INSERT OR REPLACE INTO career_stats (player_id, rows, synced_at) VALUES (?, ?, ?)",
+            (player_id, _to_json(rows), time.time())
+        )])
+
+    # Rosters
+
+    async def get_roster(self, team_id: int, season: str) -> Optional[List[Dict]]:
+        row = await self._fetchone(
+            "SELECT players, synced_at FROM rosters WHERE team_id = ? AND season = ?",
+            (team_id, season)
+        )
+        found = row is not None and self._is_fresh("roster", row[1], _synced_final(season, row[1]))
+        self._record(found)
+        return json.loads(row[0]) if found else None
+
+    async def save_roster(self, team_id: int, season: str, players: List[Dict]):
+        await self._write([(
+            "INSERT OR REPLACE INTO rosters (team_id, season, players, synced_at) VALUES (?, ?, ?, ?)",
+            (team_id, season, _to_json(players), time.time())
+        )])
+
+    # Scoreboards
+
+    async def get_scoreboard(self, date_str: str) -> Optional[List[Dict]]:
+        """Stored games for a date (YYYY-MM-DD); past dates never go stale"""
+        row = await self._fetchone(
+            "SELECT games, synced_at FROM scoreboards WHERE game_date = ?",
+            (date_str,)
+        )
+        is_past = date_str < datetime.now().strftime('%Y-%m-%d')
+        # A scoreboard synced before the date ended can still change
+        final = is_past and row is not None and datetime.fromtimestamp(row[1]).strftime('%Y-%m-%d') > date_str
+        found = row is not None and self._is_fresh("games", row[1], final)
+        self._record(found)
+        return json.loads(row[0]) if found else None
+
+    async def save_scoreboard(self, date_str: str, games: List[Dict]):
+        await self._write([(
+            "INSERT OR REPLACE INTO scoreboards (game_date, games, synced_at) VALUES (?, ?, ?)",
+            (date_str, _to_json(games), time.time())
+        )])
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """Store location, hit/miss counters and row counts per table"""
+        tables: Dict[str, int] = {}
+        try:
+            db = await self._connect()
+            if db is not None:
+                for table in ("game_logs", "career_stats", "rosters", "scoreboards"):
+                    async with db.execute(f"SELECT COUNT(*) FROM {table}") as cursor:
+                        tables[table] = (await cursor.fetchone())[0]
+        except Exception as e:
+            logger.warning(f"Stats store read failed: {e}")
+
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "path": self.path,
+            "max_age_seconds": {kind: self._max_age(kind) for kind in ("gamelog", "season_avg", "roster", "games")},
+            "rows": tables,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale,
+            "writes": self.writes,
+            "errors": self.errors,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+        }
+
+    async def close(self):
+        if self._db is not None:
+            await self._db.close()
+            self._db = None
+
+
+# Shared by NBAStatsService and NBAScheduleService
+stats_store = StatsStore(
+    path=settings.stats_store_path,
+    max_age=settings.stats_store_max_age,
+    enabled=settings.stats_store_enabled
+)
@@ -0,0 +1,303 @@
+"""
+Training Dataset - Collect ML training game logs concurrently and keep them on disk per season
+"""
+import asyncio
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from nba_api.stats.static import teams as nba_teams
+
+from app.config import settings
+from app.models import GameStats, SeasonAverages
+from app.services.nba_stats import nba_stats_service
+from app.services.player_directory import player_directory
+from app.services.schedule import schedule_service
+
+logger = logging.getLogger(__name__)
+
+# Bump when the file layout changes - older files are collected again
+DATASET_VERSION = 1
+
+# Numeric GameStats columns (None is stored as NaN)
+GAME_STAT_FIELDS = [
+    'minutes_played', 'points', 'rebounds', 'assists', 'steals', 'blocks', 'turnovers',
+    'field_goals_made', 'field_goals_attempted', 'three_pointers_made', 'three_pointers_attempted',
+    'free_throws_made', 'free_throws_attempted', 'plus_minus', 'fantasy_score'
+]
+GAME_FLOAT_FIELDS = {'minutes_played', 'fantasy_score'}
+
+# Numeric SeasonAverages columns
+AVERAGE_FIELDS = [
+    'games_played', 'minutes_per_game', 'points_per_game', 'rebounds_per_game', 'assists_per_game',
+    'steals_per_game', 'blocks_per_game', 'turnovers_per_game', 'field_goal_percentage',
+    'three_point_percentage', 'free_throw_percentage'
+]
+
+# A game log is at most a full regular season
+SEASON_GAMES = 82
+
+# Awaited with (event name, data) while players are collected
+ProgressCallback = Callable[[str, Dict], Awaitable[None]]
+
+
+class TrainingPlayer:
+    """One training player's season averages and game log (most recent game first)"""
+
+    def __init__(self, player_id: int, player_name: str, season_avg: SeasonAverages, games: List[GameStats]):
+        self.player_id = player_id
+        self.player_name = player_name
+        self.season_avg = season_avg
+        self.games = games
+
+
+class TrainingDataset:
+    """
+    Raw training data for one season: every collected player's season
+    averages and full game log, plus what it was collected from (teams and
+    extra players), so a changed configuration is collected again.
+
+    Stored as one NPZ file of plain arrays (no pickles): a players table
+    and a games table that points into it.
+    """
+
+    def __init__(
+        self,
+        season: str,
+        teams: List[str],
+        extra_players: List[str],
+        players: List[TrainingPlayer],
+        collected_at: Optional[datetime] = None
+    ):
+        self.season = season
+        self.teams = list(teams)
+        self.extra_players = list(extra_players)
+        self.players = players
+        self.collected_at = collected_at or datetime.now()
+
+    @property
+    def num_games(self) -> int:
+        return sum(len(player.games) for player in self.players)
+
+    def matches(self, season: str, teams: List[str], extra_players: List[str]) -> bool:
+        """Was this dataset collected for the same season, teams and extra players?"""
+        return (
+            self.season == season and
+            sorted(self.teams) == sorted(teams) and
+            sorted(self.extra_players) == sorted(extra_players)
+        )
+
+    def eligible_players(self, min_games: int) -> List[TrainingPlayer]:
+        """Players with at least min_games games"""
+        return [player for player in self.players if len(player.games) >= min_games]
+
+    def save(self, path: Path):
+        """Write the dataset (atomically - readers never see a partial file)"""
+        games = [(index, game) for index, player in enumerate(self.players) for game in player.games]
+
+        def column(field: str) -> np.ndarray:
+            return np.array(
+                [np.nan if getattr(game, field) is None else getattr(game, field) for _, game in games],
+                dtype=np.float64
+            )
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.stem}.tmp.npz")
+        np.savez_compressed(
+            tmp_path,
+            version=np.array(DATASET_VERSION),
+            season=np.array(self.season),
+            teams=np.array(self.teams, dtype=str),
+            extra_players=np.array(self.extra_players, dtype=str),
+            collected_at=np.array(self.collected_at.isoformat()),
+            player_ids=np.array([player.player_id for player in self.players], dtype=np.int64),
+            player_names=np.array([player.player_name for player in self.players], dtype=str),
+            averages=np.array(
+                [[getattr(player.season_avg, field) for field in AVERAGE_FIELDS] for player in self.players],
+                dtype=np.float64
+            ).reshape(len(self.players), len(AVERAGE_FIELDS)),
+            game_players=np.array([index for index, _ in games], dtype=np.int64),
+            game_ids=np.array([game.game_id for _, game in games], dtype=str),
+            game_dates=np.array([game.game_date for _, game in games], dtype="datetime64[s]"),
+            opponents=np.array([game.opponent for _, game in games], dtype=str),
+            is_home=np.array([game.is_home for _, game in games], dtype=bool),
+            **{f"stat_{field}": column(field) for field in GAME_STAT_FIELDS}
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["TrainingDataset"]:
+        """Read a saved dataset (None if it was written by an older layout)"""
+        with np.load(path, allow_pickle=False) as data:
+            if int(data["version"]) != DATASET_VERSION:
+                return None
+
+            season = str(data["season"])
+            players = [
+                TrainingPlayer(
+                    player_id=int(player_id),
+                    player_name=str(player_name),
+                    season_avg=SeasonAverages(
+                        player_id=int(player_id),
+                        season=season,
+                        **{field: value for field, value in zip(AVERAGE_FIELDS, averages.tolist())}
+                    ),
+                    games=[]
+                )
+                for player_id, player_name, averages in zip(data["player_ids"], data["player_names"], data["averages"])
+            ]
+
+            stats = {field: data[f"stat_{field}"].tolist() for field in GAME_STAT_FIELDS}
+            for row, (player_index, game_id, game_date, opponent, is_home) in enumerate(zip(
+                data["game_players"].tolist(), data["game_ids"].tolist(), data["game_dates"].tolist(),
+                data["opponents"].tolist(), data["is_home"].tolist()
+            )):
+                player = players[player_index]
+                values = {}
+                for field in GAME_STAT_FIELDS:
+                    value = stats[field][row]
+                    if value != value:  # NaN
+                        value = None
+                    elif field not in GAME_FLOAT_FIELDS:
+                        value = int(value)
+                    values[field] = value
+                player.games.append(GameStats(
+                    game_id=game_id,
+                    player_id=player.player_id,
+                    game_date=game_date,
+                    opponent=opponent,
+                    is_home=is_home,
+                    **values
+                ))
+
+            return cls(
+                season=season,
+                teams=data["teams"].tolist(),
+                extra_players=data["extra_players"].tolist(),
+                players=players,
+                collected_at=datetime.fromisoformat(str(data["collected_at"]))
+            )
+
+
+class TrainingDataService:
+    """
+    Training datasets per season: read from disk, or collected and saved
+
+    Collection fetches the rosters of every configured team and the game
+    log and season averages of every roster player (plus a list of extra
+    players) concurrently; the nba_api executor, rate limiter and
+    single-flight layers keep upstream load bounded, and the stats cache /
+    store are reused. Retraining the same season reads the saved file
+    instead of calling stats.nba.com again.
+    """
+
+    def __init__(self, data_dir: str):
+        self.data_dir = Path(data_dir)
+
+    def _path(self, season: str) -> Path:
+        return self.data_dir / f"training_{season}.npz"
+
+    async def get_dataset(
+        self,
+        season: str,
+        teams: List[str],
+        extra_players: List[str],
+        refresh: bool = False,
+        progress: Optional[ProgressCallback] = None
+    ) -> Tuple[TrainingDataset, str]:
+        """The season's dataset and where it came from ("disk" or "collected")"""
+        path = self._path(season)
+        if not refresh and path.exists():
+            try:
+                dataset = await asyncio.to_thread(TrainingDataset.load, path)
+            except Exception as e:
+                logger.warning(f"Could not read training dataset {path}: {e}")
+                dataset = None
+            if dataset is not None and dataset.matches(season, teams, extra_players):
+                logger.info(f"📂 Training data for {season} read from {path} "
+                           f"({len(dataset.players)} players, {dataset.num_games} games)")
+                return dataset, "disk"
+
+        dataset = await self.collect(season, teams, extra_players, progress)
+        if dataset.players:
+            await asyncio.to_thread(dataset.save, path)
+            logger.info(f"💾 Training data for {season} saved to {path}")
+        return dataset, "collected"
+
+    async def collect(
+        self,
+        season: str,
+        teams: List[str],
+        extra_players: List[str],
+        progress: Optional[ProgressCallback] = None
+    ) -> TrainingDataset:
+        """Fetch every team's roster, then every player's season data, concurrently"""
+        team_ids = []
+        for team_abbr in teams:
+            team = nba_teams.find_team_by_abbreviation(team_abbr)
+            if team:
+                team_ids.append(team['id'])
+            else:
+                logger.warning(f"Unknown team abbreviation: {team_abbr}")
+
+        rosters = await asyncio.gather(
+            *(schedule_service.get_team_roster(team_id, season) for team_id in team_ids)
+        )
+
+        # Distinct players: roster players first, then the extra players
+        player_names: Dict[int, str] = {}
+        for roster in rosters:
+            for player in roster:
+                player_names.setdefault(player['player_id'], player['player_name'])
+        for player_name in extra_players:
+            player = player_directory.lookup(player_name)
+            if player:
+                player_names.setdefault(player['id'], player['full_name'])
+            else:
+                logger.warning(f"Training player not found: {player_name}")
+
+        logger.info(f"Collecting {season} training data for {len(player_names)} players from {len(team_ids)} teams")
+
+        async def fetch(player_id: int, player_name: str) -> Optional[TrainingPlayer]:
+            try:
+                games, season_avg = await asyncio.gather(
+                    nba_stats_service.get_player_game_log(player_id, season=season, last_n_games=SEASON_GAMES),
+                    nba_stats_service.get_player_season_averages(player_id, season=season)
+                )
+            except Exception as e:
+                logger.error(f"Error collecting data for {player_name}: {e}")
+                return None
+            if not season_avg or not games:
+                return None
+            return TrainingPlayer(player_id, player_name, season_avg, games)
+
+        tasks = [asyncio.create_task(fetch(player_id, name)) for player_id, name in player_names.items()]
+        try:
+            completed = 0
+            for next_done in asyncio.as_completed(tasks):
+                player = await next_done
+                completed += 1
+                if player:
+                    logger.info(f"Collected {len(player.games)} games from {player.player_name}")
+                if progress:
+                    await progress("player", {
+                        "player_name": player.player_name if player else None,
+                        "games": len(player.games) if player else 0,
+                        "completed_players": completed,
+                        "total_players": len(tasks)
+                    })
+        finally:
+            # Stopped early (e.g. training cancelled)
+            for task in tasks:
+                task.cancel()
+
+        # Keep roster order, independent of completion order
+        players = [task.result() for task in tasks if task.result() is not None]
+        return TrainingDataset(season, teams, extra_players, players)
+
+
+# Global instance
+training_data_service = TrainingDataService(settings.training_data_dir)
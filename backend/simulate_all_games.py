@@ -106,8 +106,8 @@ async def simulate_game(game: dict, num_sims: int = 30):
     
     # Get rosters
     print(f"\n📋 Getting rosters...")
-    home_roster = schedule_service.get_team_roster(game['home_team_id'])
-    away_roster = schedule_service.get_team_roster(game['away_team_id'])
+    home_roster = await schedule_service.get_team_roster(game['home_team_id'])
+    away_roster = await schedule_service.get_team_roster(game['away_team_id'])
     
     print(f"   Home ({game['home_team']}): {len(home_roster)} players")
     print(f"   Away ({game['away_team']}): {len(away_roster)} players")
@@ -224,8 +224,8 @@ async def main():
     
     # Get games
     print("\n📅 Fetching games...")
-    today_games = schedule_service.get_todays_games()
-    tomorrow_games = schedule_service.get_tomorrows_games()
+    today_games = await schedule_service.get_todays_games()
+    tomorrow_games = await schedule_service.get_tomorrows_games()
     
     print(f"\n   Today ({datetime.now().strftime('%Y-%m-%d')}): {len(today_games)} games")
     print(f"   Tomorrow: {len(tomorrow_games)} games")
@@ -37,6 +37,8 @@ export interface BackendPlayer {
 
 export interface DailyPropsResponse {
   date: string;
+  status: 'ready' | 'stale' | 'building' | 'error';
+  error: string | null;
   count: number;
   players: BackendPlayer[];
 }
@@ -111,7 +113,11 @@ export async function getTodaysPlayers(): Promise<DailyPropsResponse> {
     if (!response.ok) {
       throw new Error(`HTTP error! status: ${response.status}`);
     }
-    return await response.json();
+    const data: DailyPropsResponse = await response.json();
+    if (data.status === 'error') {
+      throw new Error(`Slate build failed: ${data.error}`);
+    }
+    return data;
   } catch (error) {
     console.error('Error fetching today\'s players:', error);
     throw error;
@@ -127,7 +133,11 @@ export async function getTomorrowsPlayers(): Promise<DailyPropsResponse> {
     if (!response.ok) {
       throw new Error(`HTTP error! status: ${response.status}`);
     }
-    return await response.json();
+    const data: DailyPropsResponse = await response.json();
+    if (data.status === 'error') {
+      throw new Error(`Slate build failed: ${data.error}`);
+    }
+    return data;
   } catch (error) {
     console.error('Error fetching tomorrow\'s players:', error);
     throw error;